@@ -8,12 +8,30 @@ AK Pricing Rules:
   - AK provides a SINGLE net price (box + freight + accessories combined)
   - Net Price x 1.25, round to nearest $50 = Customer Quote
   - No separate Walk-In/Freight/Options breakdown
+
+Batch mode (--input) re-prices a whole file in one process: a CSV or NDJSON
+file with a net price column, or the stored quotes CSV itself (its
+"Net Price" column). Rows are priced in batches and written out as CSV or
+NDJSON, each with the input fields plus net_price, raw_markup and
+customer_quote, computed exactly as calculate_pricing() does.
 """
 
 import argparse
+import csv
 import json
+import math
+import os
 import sys
 
+# Net price column names tried in order when --column is not given
+NET_PRICE_COLUMNS = ("net_price", "Net Price", "Net_Price", "net-price")
+
+# Output columns added to every batch row
+PRICING_FIELDS = ("net_price", "raw_markup", "customer_quote")
+
+# Rows priced per pass in batch mode
+BATCH_SIZE = 1000
+
 
 def round_to_nearest_50(amount):
     """Round amount to nearest $50."""
@@ -42,6 +60,176 @@ def calculate_pricing(net_price):
     }
 
 
+def calculate_pricing_batch(net_prices):
+    """
+    calculate_pricing() over a sequence of net prices in one pass.
+
+    Args:
+        net_prices: Sequence of net prices (None for rows without one)
+
+    Returns:
+        list of pricing dicts (None where the net price is None)
+    """
+    raw_markups = [None if p is None else p * 1.25 for p in net_prices]
+    customer_quotes = [None if m is None else round_to_nearest_50(m) for m in raw_markups]
+    return [
+        None if p is None else {"net_price": p, "raw_markup": m, "customer_quote": q}
+        for p, m, q in zip(net_prices, raw_markups, customer_quotes)
+    ]
+
+
+def parse_net_price(value):
+    """
+    Net price from a CSV/NDJSON value ("$12,345.00", "12345", 12345.0), or None.
+    Non-finite values (nan, inf, 1e400) are None, so the row is reported unpriced.
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        try:
+            price = float(value)
+        except OverflowError:  # int too large for a float
+            return None
+    else:
+        text = str(value).strip().replace("$", "").replace(",", "")
+        try:
+            price = float(text) if text else None
+        except ValueError:
+            return None
+    return price if price is not None and math.isfinite(price) else None
+
+
+def input_format(path, requested=None):
+    """Input format: `requested`, else ndjson for .ndjson/.jsonl files, else csv."""
+    if requested:
+        return requested
+    return "ndjson" if os.path.splitext(path)[1].lower() in (".ndjson", ".jsonl") else "csv"
+
+
+def iter_input_rows(f, fmt):
+    """Yield input rows as dicts from a CSV (header row required) or NDJSON file."""
+    if fmt == "csv":
+        yield from csv.DictReader(f)
+        return
+    for line_number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            row = None
+        if not isinstance(row, dict):
+            print(f"Warning: line {line_number} is not a JSON object, skipped", file=sys.stderr)
+            continue
+        yield row
+
+
+def price_rows(rows, column=None, batch_size=BATCH_SIZE):
+    """
+    Price input rows in batches.
+
+    Args:
+        rows: Iterable of row dicts
+        column: Net price column name (default: first of NET_PRICE_COLUMNS present)
+        batch_size: Rows priced per pass
+
+    Yields:
+        (row, pricing) pairs; pricing is None if the row has no usable net price
+    """
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            yield from _price_batch(batch, column)
+            batch = []
+    if batch:
+        yield from _price_batch(batch, column)
+
+
+def _price_batch(batch, column):
+    columns = (column,) if column else NET_PRICE_COLUMNS
+    net_prices = []
+    for row in batch:
+        key = next((c for c in columns if c in row), None)
+        net_prices.append(parse_net_price(row[key]) if key else None)
+    return zip(batch, calculate_pricing_batch(net_prices))
+
+
+def write_priced_rows(priced, out, fmt, fieldnames=None):
+    """
+    Write (row, pricing) pairs to `out` as CSV or NDJSON.
+    Rows without a price are written with empty pricing fields.
+
+    NDJSON is streamed, and so is CSV when `fieldnames` (the input CSV's
+    header) is given: the output header is those columns plus
+    PRICING_FIELDS. Without it (NDJSON input) CSV output is buffered,
+    because its header is the union of every row's keys (first-seen order)
+    and NDJSON rows may not all have the same keys.
+
+    Returns:
+        tuple (priced: int, unpriced: int)
+    """
+    priced_count = unpriced_count = 0
+    rows = []
+    columns = dict.fromkeys(fieldnames or ())  # Insertion-ordered set of input keys
+    writer = None
+    if fmt == "csv" and fieldnames is not None:
+        writer = csv.DictWriter(
+            out,
+            fieldnames=[k for k in columns if k not in PRICING_FIELDS] + list(PRICING_FIELDS),
+            extrasaction="ignore",
+        )
+        writer.writeheader()
+    for row, pricing in priced:
+        if pricing is None:
+            unpriced_count += 1
+        else:
+            priced_count += 1
+        fields = pricing or dict.fromkeys(PRICING_FIELDS)
+        if fmt == "ndjson":
+            out.write(json.dumps({**row, **fields}) + "\n")
+            continue
+        row = {**row, **{k: "" if v is None else v for k, v in fields.items()}}
+        if writer:
+            writer.writerow(row)
+            continue
+        columns.update(dict.fromkeys(k for k in row if k not in PRICING_FIELDS))
+        rows.append(row)
+    if fmt == "csv" and rows:
+        writer = csv.DictWriter(out, fieldnames=list(columns) + list(PRICING_FIELDS))
+        writer.writeheader()
+        writer.writerows(rows)
+    return priced_count, unpriced_count
+
+
+def run_batch(args):
+    """Batch mode: price every row of --input and stream the results."""
+    in_fmt = input_format(args.input, args.input_format)
+    out_fmt = args.output_format or in_fmt
+    source = sys.stdin if args.input == "-" else open(
+        args.input, "r", newline="", encoding="utf-8-sig"
+    )
+    sink = sys.stdout if args.output == "-" else open(
+        args.output, "w", newline="", encoding="utf-8"
+    )
+    try:
+        if in_fmt == "csv":
+            rows = csv.DictReader(source)
+            fieldnames = rows.fieldnames  # Reads the header row; None for an empty file
+        else:
+            rows, fieldnames = iter_input_rows(source, in_fmt), None
+        priced, unpriced = write_priced_rows(
+            price_rows(rows, args.column), sink, out_fmt, fieldnames
+        )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+    print(f"Priced {priced} row(s); {unpriced} without a net price", file=sys.stderr)
+
+
 def format_currency(amount):
     """Format amount as currency string."""
     return f"${amount:,.2f}"
@@ -78,12 +266,36 @@ def main():
     parser = argparse.ArgumentParser(
         description="Calculate AmeriKooler customer pricing with 1.25x markup"
     )
-    parser.add_argument(
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
         "--net-price",
         type=float,
-        required=True,
         help="Net price from AK quote (single combined price)",
     )
+    source.add_argument(
+        "--input",
+        help="Batch mode: CSV or NDJSON file of net prices, or the stored quotes CSV "
+        "('-' for stdin)",
+    )
+    parser.add_argument(
+        "--input-format",
+        choices=["csv", "ndjson"],
+        help="Batch input format (default: from the file extension, else csv)",
+    )
+    parser.add_argument(
+        "--column",
+        help="Batch net price column (default: first of " + ", ".join(NET_PRICE_COLUMNS) + ")",
+    )
+    parser.add_argument(
+        "--output",
+        default="-",
+        help="Batch output file (default: stdout)",
+    )
+    parser.add_argument(
+        "--output-format",
+        choices=["csv", "ndjson"],
+        help="Batch output format (default: same as the input)",
+    )
     parser.add_argument(
         "--json",
         action="store_true",
@@ -92,6 +304,17 @@ def main():
 
     args = parser.parse_args()
 
+    if args.input:
+        try:
+            run_batch(args)
+        except OSError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        return
+
+    if not math.isfinite(args.net_price):
+        parser.error(f"--net-price must be a finite number, got {args.net_price}")
+
     # Calculate pricing
     pricing = calculate_pricing(args.net_price)
 
@@ -3,19 +3,82 @@
 AmeriKooler (AK) Quote CSV Handler
 
 Manages CSV data storage for AmeriKooler quote records.
-Supports append, read, and count operations.
-Checks for duplicates using Quote # + Quote Date as composite key.
+Supports append, bulk append, read, and count operations.
+Checks for duplicates using Quote # + Quote Date as composite key,
+through a key index kept next to the CSV (see csv_index.py). The same
+index answers count and read --last-n without scanning the CSV.
+
+Writes hold an advisory lock on <csv>.lock (see file_lock.py), so
+concurrent sessions never interleave a duplicate check with another append.
+
+With --backend sqlite the same actions run against a shared SQLite database
+(see quote_store.py) instead of the CSV; --action export writes it back out
+as a CSV for spreadsheet use.
+
+--action query filters and sorts stored quotes (state, type, location, quote
+date, price) through a typed column cache (see quote_columns.py), and
+--action expiring lists quotes whose Good Thru falls in the next N days.
+With --typed, read/query/expiring return prices as integer cents, dates as
+ISO dates and Y/N flags as booleans, straight from the cache or database
+(see iter_typed_records() for the same rows in Python).
+
+This file holds the AK column layout; the storage code is shared with the
+CCI skill in quote-pipeline/shared/ (quote_csv.py and the modules above).
 
 Default CSV path: C:/Users/bnmsu/ak_quotes_data.csv
+Default database path: C:/Users/bnmsu/quotes_data.db
 """
 
-import argparse
-import csv
-import json
 import os
 import sys
 
+# Storage helpers shared with cci-leer-quote-agent (skills/quote-pipeline/shared/)
+SHARED_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "quote-pipeline",
+    "shared",
+)
+if SHARED_DIR not in sys.path:
+    sys.path.append(SHARED_DIR)
+
+from quote_csv import (  # Module-level helpers are re-exported for existing callers
+    QuoteCsvHandler,
+    add_days_left,
+    csv_lock,
+    expiry_window,
+    iter_ndjson,
+    run_cli,
+)
+
 DEFAULT_CSV_PATH = r"C:\Users\bnmsu\ak_quotes_data.csv"
+DEFAULT_DB_PATH = r"C:\Users\bnmsu\quotes_data.db"
+DB_TABLE = "ak_quotes"
+
+# Composite duplicate key, and how the CSV is read when the key index is rebuilt
+KEY_COLUMNS = ("Quote #", "Quote Date")
+CSV_ENCODING = "utf-8"
+CSV_ERRORS = "strict"
+
+# Parsed column types kept by the query cache and the SQLite store
+# (money -> integer cents, date -> day ordinal / ISO date, bool -> Y/N flag)
+TYPED_COLUMNS = {
+    "Net Price": "money",
+    "Quote Date": "date",
+    "Good Thru": "date",
+    "Combo": "bool",
+}
+
+# Typed columns that also keep a sorted range index in the column cache
+SORTED_COLUMNS = ("Good Thru",)
+
+# --sort choices -> CSV header
+SORT_COLUMNS = {
+    "date": "Quote Date",
+    "good-thru": "Good Thru",
+    "price": "Net Price",
+    "state": "State",
+    "quote": "Quote #",
+}
 
 CSV_HEADERS = [
     "PDF_Filename",
@@ -67,186 +130,63 @@ FIELD_MAP = {
 }
 
 
-def ensure_csv_exists(csv_path):
-    """Create CSV file with headers if it doesn't exist."""
-    if not os.path.exists(csv_path):
-        with open(csv_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(CSV_HEADERS)
-        print(f"Created new CSV file: {csv_path}", file=sys.stderr)
-
-
-def check_duplicate(csv_path, quote_number, quote_date):
-    """Check if a record with same Quote # + Quote Date already exists."""
-    if not os.path.exists(csv_path):
-        return False
-
-    with open(csv_path, "r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row.get("Quote #") == quote_number and row.get("Quote Date") == quote_date:
-                return True
-    return False
-
-
-def map_data_to_csv_row(data):
-    """Map JSON data keys to CSV header format."""
-    row = {}
-    for json_key, csv_header in FIELD_MAP.items():
-        value = data.get(json_key, "")
-        if value is None:
-            value = ""
-        # Format currency field
-        if csv_header == "Net Price":
-            if value and not str(value).startswith("$"):
-                try:
-                    value = f"${float(value):,.2f}"
-                except (ValueError, TypeError):
-                    pass
-        row[csv_header] = str(value)
-    return row
-
-
-def append_record(csv_path, data):
-    """
-    Append a quote record to the CSV file.
-
-    Args:
-        csv_path: Path to CSV file
-        data: Dict with quote data (JSON keys from extract_quote_data.py)
-
-    Returns:
-        tuple (success: bool, message: str)
-    """
-    ensure_csv_exists(csv_path)
-
-    quote_num = data.get("Quote_Number") or data.get("Quote #", "")
-    date = data.get("Quote_Date") or data.get("Quote Date", "")
-
-    # Check for duplicates
-    if quote_num and date and check_duplicate(csv_path, quote_num, date):
-        return False, f"Duplicate record: Quote #{quote_num} / Date {date} already exists"
-
-    row = map_data_to_csv_row(data)
-
-    with open(csv_path, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=CSV_HEADERS)
-        writer.writerow(row)
-
-    count = count_records(csv_path)
-    return True, f"Record appended. Total records: {count}"
-
-
-def read_records(csv_path, last_n=10):
-    """
-    Read recent records from CSV.
-
-    Args:
-        csv_path: Path to CSV file
-        last_n: Number of most recent records to return
-
-    Returns:
-        list of dicts
-    """
-    if not os.path.exists(csv_path):
-        return []
-
-    records = []
-    with open(csv_path, "r", newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            records.append(dict(row))
-
-    return records[-last_n:] if last_n else records
-
-
-def count_records(csv_path):
-    """Count total records in CSV (excluding header)."""
-    if not os.path.exists(csv_path):
-        return 0
-
-    with open(csv_path, "r", newline="", encoding="utf-8") as f:
-        reader = csv.reader(f)
-        next(reader, None)  # Skip header
-        return sum(1 for _ in reader)
+HANDLER = QuoteCsvHandler(
+    CSV_HEADERS,
+    FIELD_MAP,
+    KEY_COLUMNS,
+    TYPED_COLUMNS,
+    SORT_COLUMNS,
+    DB_TABLE,
+    DEFAULT_CSV_PATH,
+    DEFAULT_DB_PATH,
+    encoding=CSV_ENCODING,
+    errors=CSV_ERRORS,
+    sorted_columns=SORTED_COLUMNS,
+)
+
+# The module-level functions this script has always offered, now bound to HANDLER
+# CSV backend
+ensure_csv_exists = HANDLER.ensure_csv_exists
+map_data_to_csv_row = HANDLER.map_data_to_csv_row
+plan_appends = HANDLER.plan_appends
+append_record = HANDLER.append_record
+append_records = HANDLER.append_records
+check_duplicate = HANDLER.check_duplicate
+open_index = HANDLER.open_index
+scan_keys = HANDLER.scan_keys
+read_records = HANDLER.read_records
+read_from_offset = HANDLER.read_from_offset
+count_records = HANDLER.count_records
+open_column_cache = HANDLER.open_column_cache
+query_records = HANDLER.query_records
+iter_typed_records = HANDLER.iter_typed_records
+expiring_records = HANDLER.expiring_records
+compact_csv = HANDLER.compact_csv
+
+# SQLite backend
+open_store = HANDLER.open_store
+db_append_record = HANDLER.db_append_record
+db_append_records = HANDLER.db_append_records
+db_read_records = HANDLER.db_read_records
+db_count_records = HANDLER.db_count_records
+db_query_records = HANDLER.db_query_records
+db_expiring_records = HANDLER.db_expiring_records
+db_iter_typed_records = HANDLER.db_iter_typed_records
+db_import_csv = HANDLER.db_import_csv
+db_export_csv = HANDLER.db_export_csv
+
+# Command line
+query_filters = HANDLER.query_filters
+print_records = HANDLER.print_records
+
+
+def scan_duplicate(csv_path, quote_number, quote_date):
+    """Full-scan duplicate check (fallback when the key index is unavailable)."""
+    return (quote_number, quote_date) in HANDLER.scan_keys(csv_path)
 
 
 def main():
-    parser = argparse.ArgumentParser(description="AmeriKooler Quote CSV Handler")
-    parser.add_argument(
-        "--action",
-        type=str,
-        required=True,
-        choices=["append", "read", "count"],
-        help="Action to perform: append, read, or count",
-    )
-    parser.add_argument(
-        "--data",
-        type=str,
-        default="{}",
-        help="JSON data for append action",
-    )
-    parser.add_argument(
-        "--csv-path",
-        type=str,
-        default=DEFAULT_CSV_PATH,
-        help=f"Path to CSV file (default: {DEFAULT_CSV_PATH})",
-    )
-    parser.add_argument(
-        "--last-n",
-        type=int,
-        default=10,
-        help="Number of recent records to read (default: 10)",
-    )
-    parser.add_argument(
-        "--json",
-        action="store_true",
-        help="Output as JSON",
-    )
-
-    args = parser.parse_args()
-
-    if args.action == "append":
-        try:
-            data = json.loads(args.data)
-        except json.JSONDecodeError:
-            print(f"Error: Invalid JSON for --data: {args.data}", file=sys.stderr)
-            sys.exit(1)
-
-        success, message = append_record(args.csv_path, data)
-        if args.json:
-            print(json.dumps({"success": success, "message": message}))
-        else:
-            status = "OK" if success else "SKIPPED"
-            print(f"[{status}] {message}")
-
-        if not success:
-            sys.exit(1)
-
-    elif args.action == "read":
-        records = read_records(args.csv_path, args.last_n)
-        if args.json:
-            print(json.dumps(records, indent=2))
-        else:
-            if not records:
-                print("No records found.")
-            else:
-                print(f"Last {len(records)} record(s):")
-                print("-" * 80)
-                for i, rec in enumerate(records, 1):
-                    quote = rec.get("Quote #", "N/A")
-                    date = rec.get("Quote Date", "N/A")
-                    desc = rec.get("Dimensions and Basic Description", "N/A")
-                    price = rec.get("Net Price", "N/A")
-                    print(f"  {i}. Quote #{quote} | {date} | {desc} | {price}")
-                print("-" * 80)
-
-    elif args.action == "count":
-        count = count_records(args.csv_path)
-        if args.json:
-            print(json.dumps({"count": count}))
-        else:
-            print(f"Total records: {count}")
+    run_cli(HANDLER, "AmeriKooler Quote CSV Handler")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Drawing Page Layout Index
+
+Positional text layer for the AK engineering drawing page (page 3). Text
+fragments are collected with their page coordinates through pypdf's
+extract_text(visitor_text=...) callback and stored in a uniform grid, so
+annotation lookups only read the fragments near their label instead of the
+flattened page text, where annotations from different panels run together.
+
+Coordinates are PDF points (origin bottom-left, y grows upward). Fragment
+widths are estimated from the character count and font size, which is close
+enough for neighbourhood queries.
+"""
+
+import re
+from collections import namedtuple
+
+# Average glyph width as a fraction of the font size (Helvetica-like fonts)
+CHAR_WIDTH = 0.5
+# Line height as a multiple of the font size, for multi-line fragments
+LINE_HEIGHT = 1.2
+
+Fragment = namedtuple("Fragment", ["text", "x", "y", "width", "size"])
+
+
+def collect_fragments(page):
+    """
+    Extract positioned text fragments from a pypdf page.
+    Returns list of Fragment, one per non-blank line of each text chunk.
+    """
+    fragments = []
+
+    def visit(text, cm, tm, font_dict, font_size):
+        if not text or not text.strip():
+            return
+        # Text space -> page space
+        x = tm[4] * cm[0] + tm[5] * cm[2] + cm[4]
+        y = tm[4] * cm[1] + tm[5] * cm[3] + cm[5]
+        size = abs(font_size * tm[3] * cm[3]) or font_size or 10.0
+        for offset, line in enumerate(text.split("\n")):
+            line = line.strip()
+            if line:
+                fragments.append(
+                    Fragment(
+                        line,
+                        x,
+                        y - offset * size * LINE_HEIGHT,
+                        len(line) * size * CHAR_WIDTH,
+                        size,
+                    )
+                )
+
+    page.extract_text(visitor_text=visit)
+    return fragments
+
+
+class DrawingLayout:
+    """
+    Grid index over positioned text fragments.
+
+    Args:
+        fragments: List of Fragment
+        cell_size: Grid cell edge in points
+    """
+
+    def __init__(self, fragments, cell_size=72.0):
+        self.fragments = list(fragments)
+        self.cell_size = cell_size
+        self._grid = {}
+        for index, frag in enumerate(self.fragments):
+            for cell in self._cells(frag.x, frag.x + frag.width, frag.y, frag.y):
+                self._grid.setdefault(cell, []).append(index)
+
+    @classmethod
+    def from_page(cls, page, cell_size=72.0):
+        return cls(collect_fragments(page), cell_size)
+
+    def _cells(self, x0, x1, y0, y1):
+        size = self.cell_size
+        for cx in range(int(x0 // size), int(x1 // size) + 1):
+            for cy in range(int(y0 // size), int(y1 // size) + 1):
+                yield cx, cy
+
+    def _distance(self, a, b):
+        """Gap between two fragments' boxes (0 when they overlap horizontally)."""
+        dx = max(0.0, a.x - (b.x + b.width), b.x - (a.x + a.width))
+        dy = abs(a.y - b.y)
+        return max(dx, dy)
+
+    def near(self, index, radius):
+        """Indices of fragments within `radius` points of fragment `index`."""
+        frag = self.fragments[index]
+        found = set()
+        for cell in self._cells(
+            frag.x - radius, frag.x + frag.width + radius, frag.y - radius, frag.y + radius
+        ):
+            for other in self._grid.get(cell, ()):
+                if other not in found and self._distance(frag, self.fragments[other]) <= radius:
+                    found.add(other)
+        return found
+
+    def local_text(self, indices):
+        """
+        Join fragments in reading order (top to bottom, left to right).
+        Returns (text, spans) where spans maps fragment index -> (start, end).
+        """
+        ordered = sorted(indices, key=lambda i: (-self.fragments[i].y, self.fragments[i].x))
+        parts = []
+        spans = {}
+        position = 0
+        previous_y = None
+        for index in ordered:
+            frag = self.fragments[index]
+            if parts:
+                same_line = abs(frag.y - previous_y) <= frag.size * 0.5
+                parts.append(" " if same_line else "\n")
+                position += 1
+            spans[index] = (position, position + len(frag.text))
+            parts.append(frag.text)
+            position += len(frag.text)
+            previous_y = frag.y
+        return "".join(parts), spans
+
+    def labeled_matches(self, label_pattern, pattern, radius, flags=re.IGNORECASE):
+        """
+        Search the neighbourhood of every fragment containing a label.
+
+        `pattern` must define a named group "label". A match only counts for
+        the fragment whose label it contains, so one annotation is never
+        reported twice from two nearby labels.
+
+        Yields re.Match objects over each label's local text.
+        """
+        label_re = re.compile(label_pattern, flags)
+        value_re = re.compile(pattern, flags)
+        for index, frag in enumerate(self.fragments):
+            if not label_re.search(frag.text):
+                continue
+            neighbours = self.near(index, radius)
+            neighbours.add(index)
+            text, spans = self.local_text(neighbours)
+            start, end = spans[index]
+            for match in value_re.finditer(text):
+                if start <= match.start("label") and match.end("label") <= end:
+                    yield match
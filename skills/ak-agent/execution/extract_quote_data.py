@@ -10,18 +10,48 @@ AK PDF Structure:
   Page 2: Equipment, accessories, freight, price, "Glass Doors By Others"
   Page 3: Engineering drawings with panel layout and net openings
 
+Each field extractor declares the page(s) it reads with @on_pages, and
+pages are decoded lazily on first access, so a run limited to header or
+price fields (--fields) only extracts text from the drawing page when a
+field is missing from its own page. A field its page(s) lack is searched
+for in the whole document, the scope every field had before page routing.
+Within a page, extractors tagged with @in_section search the slice between
+their heading and the next one first (see build_section_index), and the
+whole page only when no slice yields a value.
+
+With --layout, net openings and door cutouts are first looked up on a
+positional text layer of the drawing page, reading only the fragments near
+each label (see drawing_layout.py), and fall back to the page text.
+
+With --revisions, a PDF whose quote number is already in the revision
+store is treated as a new revision: pages whose content and resources are
+unchanged reuse the stored text, and the output is a field-level diff
+against the stored revision (see extract_incremental).
+
+Bundle PDFs (several quotes in one file, one per box on a multi-box job)
+are split on each new "Quote #:" header and extracted one quote at a time
+(--bundle, see split_bundle).
+
 NOTE: Regex patterns will need refinement as real PDFs are processed.
 Update patterns here and document changes in UPDATES.md.
 """
 
 import argparse
+import atexit
+import glob
+import hashlib
 import json
+import os
 import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timedelta
+from functools import cached_property
 
 try:
     from pypdf import PdfReader
+    from pypdf.generic import ArrayObject, DictionaryObject, IndirectObject, StreamObject
 except ImportError:
     print(
         "Error: pypdf is required. Install with: pip install pypdf",
@@ -29,39 +59,309 @@ except ImportError:
     )
     sys.exit(1)
 
+# Cache, corpus and pattern-stats helpers shared with cci-leer-quote-agent (skills/quote-pipeline/shared/)
+SHARED_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "quote-pipeline",
+    "shared",
+)
+if SHARED_DIR not in sys.path:
+    sys.path.append(SHARED_DIR)
+
+from drawing_layout import DrawingLayout
+from extract_cache import DEFAULT_MAX_BYTES, ExtractCache, file_sha256, source_version
+from pattern_stats import PatternStats, print_report
+from revision_store import RevisionStore
+from text_corpus import TextCorpus
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".ak_extract_cache")
+DEFAULT_CORPUS_DIR = os.path.join(os.path.expanduser("~"), ".ak_text_corpus")
+DEFAULT_PATTERN_STATS = os.path.join(os.path.expanduser("~"), ".ak_pattern_stats.json")
+DEFAULT_REVISION_DIR = os.path.join(os.path.expanduser("~"), ".ak_revisions")
+
+# Hit/miss/time counters for the fallback pattern lists (see pattern_stats.py).
+# main() points this at the stats file; library callers get in-memory counters.
+PATTERN_STATS = PatternStats()
+
+# Version stamp of this extractor's pattern set and the helpers that shape its
+# output (drawing layout lookups, pattern ordering): any edit invalidates the cache
+EXTRACTOR_VERSION = source_version(
+    __file__,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "drawing_layout.py"),
+    os.path.join(SHARED_DIR, "pattern_stats.py"),
+)
+
+
+class PdfReadError(Exception):
+    """Raised when a PDF cannot be opened or its text cannot be extracted."""
+
+
+class TextPages:
+    """
+    Page texts for one quote, joined on demand. Page numbers are 1-based.
+
+    Each page's text is stored with its trailing newline (empty pages as ""),
+    so joining every page reproduces the full-document text.
+    """
+
+    def __init__(self, texts):
+        self._texts = list(texts)
+        self._joined = {}
+
+    def __len__(self):
+        return len(self._texts)
+
+    def page_text(self, number):
+        return self._texts[number - 1]
+
+    def decoded_texts(self):
+        """All page texts if every page has been decoded, else None."""
+        if any(t is None for t in self._texts):
+            return None
+        return list(self._texts)
+
+    def text(self, numbers=None):
+        """
+        Text of the given pages in page order, or the whole document.
+        Pages past the end are ignored; if none of them exist the whole
+        document is used, so short PDFs still find their fields.
+        """
+        if numbers is not None:
+            numbers = tuple(n for n in numbers if 1 <= n <= len(self))
+        if not numbers:
+            numbers = tuple(range(1, len(self) + 1))
+        if numbers not in self._joined:
+            self._joined[numbers] = "".join(self.page_text(n) for n in numbers)
+        return self._joined[numbers]
+
+    def layout(self, number):
+        """Positional layout of a page; plain text has none."""
+        return None
+
+    def prefix(self, length):
+        """First `length` characters of the document, decoding only as needed."""
+        parts = []
+        size = 0
+        for number in range(1, len(self) + 1):
+            if size >= length:
+                break
+            page = self.page_text(number)
+            parts.append(page)
+            size += len(page)
+        return "".join(parts)[:length]
+
+
+class PdfPages(TextPages):
+    """Page texts decoded lazily from a PDF, each page on first access."""
+
+    def __init__(self, pdf_path):
+        try:
+            self._reader = PdfReader(pdf_path)
+            count = len(self._reader.pages)
+        except Exception as e:
+            raise PdfReadError(f"Error reading PDF: {e}") from e
+        super().__init__([None] * count)
+        self.decoded = set()  # Pages actually decoded by pypdf
+        self._object_hashes = {}  # (idnum, generation) -> digest, for shared resources
+
+    def page_text(self, number):
+        if self._texts[number - 1] is None:
+            try:
+                page_text = self._reader.pages[number - 1].extract_text()
+            except Exception as e:
+                raise PdfReadError(f"Error reading PDF: {e}") from e
+            self._texts[number - 1] = page_text + "\n" if page_text else ""
+            self.decoded.add(number)
+        return self._texts[number - 1]
+
+    def fingerprint(self, number):
+        """
+        SHA-256 of a page's content stream and everything its /Resources
+        reach (form XObjects, fonts, images). A page can draw different text
+        from the same content stream when an XObject or font changes, so
+        both are hashed. Cheap compared to text extraction; resources shared
+        between pages are hashed once per document.
+        """
+        try:
+            page = self._reader.pages[number - 1]
+            contents = page.get_contents()
+            digest = hashlib.sha256(contents.get_data() if contents is not None else b"")
+            digest.update(self._object_hash(page.get("/Resources")))
+        except Exception as e:
+            raise PdfReadError(f"Error reading PDF: {e}") from e
+        return digest.hexdigest()
+
+    def _object_hash(self, obj, path=()):
+        """SHA-256 digest of a PDF object, following indirect references."""
+        if isinstance(obj, IndirectObject):
+            ref = (obj.idnum, obj.generation)
+            if ref in path:  # Reference cycle: the reference stands for itself
+                return repr(ref).encode()
+            if ref not in self._object_hashes:
+                self._object_hashes[ref] = self._object_hash(obj.get_object(), path + (ref,))
+            return self._object_hashes[ref]
+
+        digest = hashlib.sha256(type(obj).__name__.encode())
+        if isinstance(obj, DictionaryObject):
+            for key in sorted(obj):
+                digest.update(key.encode() + self._object_hash(obj.raw_get(key), path))
+            if isinstance(obj, StreamObject):
+                digest.update(obj.get_data())
+        elif isinstance(obj, ArrayObject):
+            for item in obj:
+                digest.update(self._object_hash(item, path))
+        else:
+            digest.update(repr(obj).encode())
+        return digest.digest()
+
+    def preload(self, number, text):
+        """Use already-known text for a page instead of decoding it."""
+        if self._texts[number - 1] is None:
+            self._texts[number - 1] = text
+
+    def layout(self, number):
+        """DrawingLayout of a page (built once), or None past the last page."""
+        if not 1 <= number <= len(self):
+            return None
+        if not hasattr(self, "_layouts"):
+            self._layouts = {}
+        if number not in self._layouts:
+            try:
+                self._layouts[number] = DrawingLayout.from_page(
+                    self._reader.pages[number - 1]
+                )
+            except Exception as e:
+                raise PdfReadError(f"Error reading PDF: {e}") from e
+        return self._layouts[number]
+
 
 def extract_text_from_pdf(pdf_path):
-    """Extract all text from a PDF file."""
+    """
+    Extract all text from a PDF file.
+    Raises PdfReadError so a bad file can be handled by the caller.
+    """
+    return PdfPages(pdf_path).text()
+
+
+def iter_page_texts(pdf_path):
+    """
+    Yield each page's text in order, decoding one page at a time.
+    Earlier pages are not kept, so memory does not grow with page count.
+    Raises PdfReadError so a bad file can be handled by the caller.
+    """
     try:
         reader = PdfReader(pdf_path)
-        text = ""
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-        return text
+        count = len(reader.pages)
     except Exception as e:
-        print(f"Error reading PDF: {e}", file=sys.stderr)
-        sys.exit(1)
+        raise PdfReadError(f"Error reading PDF: {e}") from e
+    for index in range(count):
+        try:
+            page_text = reader.pages[index].extract_text()
+        except Exception as e:
+            raise PdfReadError(f"Error reading PDF: {e}") from e
+        yield page_text + "\n" if page_text else ""
+
+
+def on_pages(*pages):
+    """
+    Declare which AK page(s) a field extractor reads first (1-based).
+    When they yield no value the whole document is searched. Extractors
+    without a declaration read the whole document.
+    """
+    def decorate(func):
+        func.pages = pages
+        return func
+    return decorate
 
 
+def in_section(heading):
+    """
+    Declare the indexed section a field extractor searches first.
+
+    The extractor runs on each slice for `heading` in order (lists from
+    every slice are combined). When no slice yields a value, e.g. the
+    label sits mid-line ("Total Price:", "Quote #: ... Description:") and
+    is not indexed, the full page text is searched as before the index.
+    """
+    def decorate(func):
+        func.section = heading
+        return func
+    return decorate
+
+
+# Headings recorded by the section indexer (lowercase match -> name)
+SECTION_HEADINGS = {
+    "description": "Description",
+    "door": "Door",
+    "floor": "Floor",
+    "accessories": "Accessories",
+    "equipment": "Equipment",
+    "freight": "Freight",
+    "price": "Price",
+    "net opening": "Net Opening",
+}
+
+# Same heading forms the field patterns anchor on ("Door:", "Net Opening").
+# "Door:" style headings start a line, so a label inside a line ("Trap Door:")
+# does not end a section. Net Opening is a drawing annotation and may sit
+# anywhere on its line.
+SECTION_PATTERN = re.compile(
+    r"^[ \t]*(Description|Door|Floor|Accessories|Equipment|Freight|Price)\s*:"
+    r"|(Net\s+Opening)",
+    re.IGNORECASE | re.MULTILINE,
+)
+
+
+def build_section_index(text):
+    """
+    Record the offsets of every known heading in one pass over the text.
+
+    Returns dict heading -> list of (start, end) spans in document order.
+    A span starts at its heading and ends after the next heading's label,
+    so terminators the field patterns look for (a newline before the next
+    heading, or the next heading's name) stay inside the slice. An empty
+    section (nothing but whitespace before the next heading) runs on to the
+    end of the following non-empty section, as a search of the whole page
+    would: an empty "Accessories:" still reads the Freight line after it.
+    """
+    marks = []
+    for match in SECTION_PATTERN.finditer(text):
+        label = match.group(1) or re.sub(r"\s+", " ", match.group(2))
+        marks.append((SECTION_HEADINGS[label.lower()], match.start(), match.end()))
+
+    index = {}
+    for i, (heading, start, _) in enumerate(marks):
+        following = i + 1
+        while following < len(marks) and not text[
+            marks[following - 1][2]:marks[following][1]
+        ].strip():
+            following += 1
+        end = marks[following][2] if following < len(marks) else len(text)
+        index.setdefault(heading, []).append((start, end))
+    return index
+
+
+@on_pages(1)
 def extract_quote_number(text):
     """
     Extract AK quote number (e.g., 26-02170, 25-36839).
     Format: XX-XXXXX (2 digits, dash, 5 digits)
     """
+    # Labeled forms first; the bare number is a last-resort fallback
     patterns = [
-        r"Quote\s*#\s*:\s*(\d{2}-\d{5})",
-        r"Quote\s*Number\s*:\s*(\d{2}-\d{5})",
-        r"\b(\d{2}-\d{5})\b",
+        [
+            r"Quote\s*#\s*:\s*(\d{2}-\d{5})",
+            r"Quote\s*Number\s*:\s*(\d{2}-\d{5})",
+        ],
+        [r"\b(\d{2}-\d{5})\b"],
     ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return match.group(1)
+    match = PATTERN_STATS.search("quote_number", patterns, text, re.IGNORECASE)
+    if match:
+        return match.group(1)
     return None
 
 
+@on_pages(1)
 def extract_quote_date(text):
     """Extract quote date from header."""
     patterns = [
@@ -98,6 +398,7 @@ def calculate_good_thru(quote_date_str):
         return None
 
 
+@on_pages(1)
 def extract_project_name(text):
     """Extract project name from quote."""
     pattern = r"Project\s*Name\s*:\s*(.+?)(?:\n|Quoted)"
@@ -107,6 +408,7 @@ def extract_project_name(text):
     return None
 
 
+@on_pages(1)
 def extract_revision(text):
     """Extract revision number if present."""
     pattern = r"Revision\s*:\s*(\d+)"
@@ -116,6 +418,7 @@ def extract_revision(text):
     return None
 
 
+@on_pages(1)
 def extract_lead_time(text):
     """Extract lead time."""
     pattern = r"Lead\s*Time\s*:\s*(\d+\s*weeks?)"
@@ -125,6 +428,7 @@ def extract_lead_time(text):
     return None
 
 
+@on_pages(1)
 def extract_overall_dimensions(text):
     """
     Extract overall (outside) dimensions from AK quote.
@@ -139,6 +443,7 @@ def extract_overall_dimensions(text):
     return None
 
 
+@on_pages(1)
 def extract_dimensions_parsed(text):
     """
     Extract W, D, H as separate values from overall dimensions.
@@ -151,6 +456,7 @@ def extract_dimensions_parsed(text):
     return None, None, None
 
 
+@on_pages(1)
 def extract_interior_dimensions(text):
     """Extract interior dimensions."""
     pattern = r"Interior\s*Dim\s*:\s*([\d'\"x\s\-\.]+)"
@@ -160,6 +466,8 @@ def extract_interior_dimensions(text):
     return None
 
 
+@on_pages(1)
+@in_section("Description")
 def extract_description(text):
     """Extract description (Indoor/Outdoor Cooler/Freezer, Floorless, etc.)."""
     pattern = r"Description\s*:\s*(.+?)(?:\n|Interior)"
@@ -171,8 +479,12 @@ def extract_description(text):
 
 def extract_type(text):
     """Determine if cooler or freezer."""
-    desc = extract_description(text) or ""
-    full_text = desc + " " + text[:2000]
+    return _type_from_description(extract_description(text), text)
+
+
+def _type_from_description(description, text):
+    """Classify cooler/freezer from an already-extracted description."""
+    full_text = (description or "") + " " + text[:2000]
 
     if re.search(r"\bfreezer\b", full_text, re.IGNORECASE):
         return "Freezer"
@@ -183,8 +495,12 @@ def extract_type(text):
 
 def extract_location(text):
     """Determine indoor or outdoor installation."""
-    desc = extract_description(text) or ""
-    full_text = desc + " " + text[:2000]
+    return _location_from_description(extract_description(text), text)
+
+
+def _location_from_description(description, text):
+    """Classify indoor/outdoor from an already-extracted description."""
+    full_text = (description or "") + " " + text[:2000]
 
     if re.search(r"\boutdoor\b", full_text, re.IGNORECASE):
         return "Outdoor"
@@ -193,6 +509,8 @@ def extract_location(text):
     return None
 
 
+@on_pages(1)
+@in_section("Door")
 def extract_door(text):
     """
     Extract door specification from AK quote.
@@ -210,7 +528,11 @@ def extract_door(text):
 
 def extract_door_count(text):
     """Extract number of doors from door specification."""
-    door = extract_door(text)
+    return _door_count_from_door(extract_door(text))
+
+
+def _door_count_from_door(door):
+    """Read the leading (qty) from an already-extracted door specification."""
     if door:
         match = re.match(r"\((\d+)\)", door)
         if match:
@@ -218,6 +540,8 @@ def extract_door_count(text):
     return 0
 
 
+@on_pages(1)
+@in_section("Floor")
 def extract_floor(text):
     """Extract floor specification."""
     pattern = r"Floor\s*:\s*(.+?)(?:\n|Door)"
@@ -230,43 +554,54 @@ def extract_floor(text):
     return None
 
 
+@on_pages(2)
+@in_section("Price")
 def extract_net_price(text):
     """
     Extract the single net price from AK quote.
     Format: Price: $XX,XXX.00 Net
     """
-    pattern = r"Price\s*:\s*\$?([\d,]+\.?\d*)\s*Net"
-    match = re.search(pattern, text, re.IGNORECASE)
-    if match:
-        return match.group(1).replace(",", "")
-    # Fallback: just look for Price: $amount
-    pattern = r"Price\s*:\s*\$?([\d,]+\.\d{2})"
-    match = re.search(pattern, text, re.IGNORECASE)
+    patterns = [
+        [r"Price\s*:\s*\$?([\d,]+\.?\d*)\s*Net"],
+        # Fallback: just look for Price: $amount
+        [r"Price\s*:\s*\$?([\d,]+\.\d{2})"],
+    ]
+    match = PATTERN_STATS.search("net_price", patterns, text, re.IGNORECASE)
     if match:
         return match.group(1).replace(",", "")
     return None
 
 
+@on_pages(2)
+@in_section("Freight")
 def extract_freight_destination(text):
     """
     Extract freight destination info.
     Examples: "Delivered to GA-30339", "Freight included to AL-36067"
     """
+    # ST-ZIP and ST. ZIP forms first; the free-text destination is the fallback
     patterns = [
-        r"(?:Delivered\s+to|Freight\s+included\s+to|freight\s+includes?\s+to)\s+([A-Z]{2}[\-\s]*\d{5})",
-        r"(?:Delivered\s+to|Freight\s+included\s+to|freight\s+includes?\s+to)\s+([A-Z]{2}\.\s*\d{5})",
-        r"(?:Delivered\s+to|Freight\s+included\s+to|freight\s+includes?\s+to)\s+(.+?)(?:\n|#)",
+        [
+            r"(?:Delivered\s+to|Freight\s+included\s+to|freight\s+includes?\s+to)\s+([A-Z]{2}[\-\s]*\d{5})",
+            r"(?:Delivered\s+to|Freight\s+included\s+to|freight\s+includes?\s+to)\s+([A-Z]{2}\.\s*\d{5})",
+        ],
+        [
+            r"(?:Delivered\s+to|Freight\s+included\s+to|freight\s+includes?\s+to)\s+(.+?)(?:\n|#)",
+        ],
     ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return match.group(1).strip()
+    match = PATTERN_STATS.search("freight_destination", patterns, text, re.IGNORECASE)
+    if match:
+        return match.group(1).strip()
     return None
 
 
 def extract_ship_to_zip(text):
     """Extract shipping zip code from freight destination."""
-    dest = extract_freight_destination(text)
+    return _zip_from_destination(extract_freight_destination(text))
+
+
+def _zip_from_destination(dest):
+    """Read the 5-digit zip from an already-extracted freight destination."""
     if dest:
         zip_match = re.search(r"(\d{5})", dest)
         if zip_match:
@@ -276,7 +611,11 @@ def extract_ship_to_zip(text):
 
 def extract_state(text):
     """Extract state from freight destination."""
-    dest = extract_freight_destination(text)
+    return _state_from_destination(extract_freight_destination(text))
+
+
+def _state_from_destination(dest):
+    """Read the 2-letter state from an already-extracted freight destination."""
     if dest:
         state_match = re.search(r"\b([A-Z]{2})\b", dest)
         if state_match:
@@ -284,6 +623,8 @@ def extract_state(text):
     return None
 
 
+@on_pages(2)
+@in_section("Accessories")
 def extract_accessories(text):
     """
     Extract accessories list from AK quote.
@@ -306,6 +647,7 @@ def extract_accessories(text):
     return accessories
 
 
+@on_pages(2)
 def detect_glass_doors_by_others(text):
     """
     Detect if 'Glass Doors By Others' is present in the quote.
@@ -314,50 +656,101 @@ def detect_glass_doors_by_others(text):
     return bool(re.search(r"Glass\s+Doors?\s+By\s+Others", text, re.IGNORECASE))
 
 
+# Drawing annotations. The "label" group anchors layout lookups
+# (DrawingLayout.labeled_matches) to the fragment holding the label.
+NET_OPENING_PATTERN = (
+    r"(?P<label>Net\s+Opening)\s+(?P<width>[\d\.]+)\s*\"?\s*x\s*(?P<height>[\d\.]+)\s*\"?"
+)
+CUTOUT_PATTERN = (
+    r"\((?P<quantity>\d+)\)\s*(?P<width>\d+)\s*x\s*(?P<height>\d+)\s*"
+    r"(?P<label>display\s+doors?|glass\s+doors?)"
+)
+# How far (points) from a label its annotation values may sit
+LAYOUT_RADIUS = 72.0
+
+
+def _net_opening(match):
+    return {
+        "width": match.group("width"),
+        "height": match.group("height"),
+        "description": f'{match.group("width")}" x {match.group("height")}"',
+    }
+
+
+def _cutout(match):
+    quantity, width, height, label = match.group("quantity", "width", "height", "label")
+    return {
+        "quantity": int(quantity),
+        "width": width,
+        "height": height,
+        "description": f"({quantity}) {width}x{height} {label}",
+    }
+
+
+@on_pages(3)
+@in_section("Net Opening")
 def extract_net_opening(text):
     """
     Extract net opening dimensions from drawing annotations.
     Example: Net Opening 123.125" x 75"
     """
-    pattern = r"Net\s+Opening\s+([\d\.]+)\s*\"?\s*x\s*([\d\.]+)\s*\"?"
-    match = re.search(pattern, text, re.IGNORECASE)
+    match = re.search(NET_OPENING_PATTERN, text, re.IGNORECASE)
     if match:
-        return {
-            "width": match.group(1),
-            "height": match.group(2),
-            "description": f'{match.group(1)}" x {match.group(2)}"',
-        }
+        return _net_opening(match)
     return None
 
 
+@on_pages(3)
 def extract_display_door_cutouts(text):
     """
     Extract display door cutout annotations from drawings.
     Example: (5) 30x79 display doors
     """
-    cutouts = []
-    pattern = r"\((\d+)\)\s*(\d+)\s*x\s*(\d+)\s*(display\s+doors?|glass\s+doors?)"
-    matches = re.findall(pattern, text, re.IGNORECASE)
-    for m in matches:
-        cutouts.append(
-            {
-                "quantity": int(m[0]),
-                "width": m[1],
-                "height": m[2],
-                "description": f"({m[0]}) {m[1]}x{m[2]} {m[3]}",
-            }
+    return [_cutout(m) for m in re.finditer(CUTOUT_PATTERN, text, re.IGNORECASE)]
+
+
+def layout_net_opening(layout, radius=LAYOUT_RADIUS):
+    """Net opening read from the fragments around a "Net Opening" label."""
+    for match in layout.labeled_matches(r"Net\s+Opening", NET_OPENING_PATTERN, radius):
+        return _net_opening(match)
+    return None
+
+
+def layout_door_cutouts(layout, radius=LAYOUT_RADIUS):
+    """Cutouts read from the fragments around each display/glass door label."""
+    return [
+        _cutout(match)
+        for match in layout.labeled_matches(
+            r"display\s+doors?|glass\s+doors?", CUTOUT_PATTERN, radius
         )
-    return cutouts
+    ]
 
 
 def determine_shape(text):
     """Determine box shape from overall dimensions or explicit label."""
+    # Try to determine from dimensions when no explicit label is present
+    return _shape_label(text) or _shape_from_dimensions(
+        *extract_dimensions_parsed(text)
+    )
+
+
+@on_pages(1)
+def extract_shape_label(text):
+    """Explicit (Rectangular)/(Square) label, usually on the page 1 dimension line."""
+    return _shape_label(text)
+
+
+def _shape_label(text):
+    """Return an explicit Square/Rectangular label if the quote states one."""
     if re.search(r"\bSquare\b", text):
         return "Square"
     if re.search(r"\bRectangular\b", text):
         return "Rectangular"
-    # Try to determine from dimensions
-    w, d, h = extract_dimensions_parsed(text)
+    return None
+
+
+def _shape_from_dimensions(w, d, h):
+    """Compare parsed width/depth (feet portion) to classify the shape."""
     if w and d:
         try:
             # Compare just the feet portion
@@ -369,111 +762,855 @@ def determine_shape(text):
     return None
 
 
-def extract_all(pdf_path):
+class QuoteContext:
     """
-    Extract all quote data from AK PDF.
-    Returns dict with all fields matching CSV schema.
+    Per-document extraction context for one AK quote.
+
+    Built once per PDF. Every field is computed on first access and cached,
+    so dependent fields share one result instead of re-running the regex:
+    Ship To Zip and State reuse the freight destination, Type and Location
+    reuse the description, Door Count reuses the door spec, and Shape reuses
+    the parsed dimensions. Each extractor sees the page(s) it declares with
+    @on_pages first, and the whole document only when they yield nothing,
+    so the other pages are decoded only for a missing field. Sectioned
+    extractors (@in_section) see their heading's slices of that text first,
+    and the whole text only when the slices yield nothing.
+
+    With layout=True, net openings and cutouts are first read from the
+    drawing page's positional layout, falling back to the page text.
     """
-    import os
-
-    text = extract_text_from_pdf(pdf_path)
-    filename = os.path.basename(pdf_path)
 
-    quote_date = extract_quote_date(text)
-    box_type = extract_type(text)
-    overall_dims = extract_overall_dimensions(text)
-    description = extract_description(text)
-    location = extract_location(text)
-
-    # Build dimension description
-    dim_desc = None
-    if overall_dims:
-        type_str = f" {box_type}" if box_type else ""
-        loc_str = f" {location}" if location else ""
-        dim_desc = f"{overall_dims}{loc_str}{type_str}"
-
-    # Detect DDS items
-    glass_doors_by_others = detect_glass_doors_by_others(text)
-    net_opening = extract_net_opening(text)
-    door_cutouts = extract_display_door_cutouts(text)
-
-    # Format display doors for CSV
-    dd_str = "None"
-    if glass_doors_by_others:
+    def __init__(self, pages, layout=False):
+        self.pages = pages
+        self.use_layout = layout
+        self._section_indexes = {}
+
+    def _run(self, extractor):
+        page_numbers = getattr(extractor, "pages", None)
+        value = self._search(extractor, page_numbers)
+        if value or page_numbers is None:
+            return value
+        routed = {n for n in page_numbers if 1 <= n <= len(self.pages)}
+        if not routed or len(routed) == len(self.pages):
+            return value  # The routed text already was the whole document
+        # Not on its page(s), e.g. the price of a one-page quote: search everything
+        return self._search(extractor, None)
+
+    def _search(self, extractor, page_numbers):
+        text = self.pages.text(page_numbers)
+        heading = getattr(extractor, "section", None)
+        if heading is None:
+            return extractor(text)
+
+        if page_numbers not in self._section_indexes:
+            self._section_indexes[page_numbers] = build_section_index(text)
+        combined = []
+        for start, end in self._section_indexes[page_numbers].get(heading, []):
+            value = extractor(text[start:end])
+            if isinstance(value, list):
+                combined.extend(value)
+            elif value:
+                return value
+        if combined:
+            return combined
+        # Nothing in any slice (or no indexed heading): search the full page
+        return extractor(text)
+
+    @cached_property
+    def text(self):
+        return self.pages.text()
+
+    @cached_property
+    def head(self):
+        # Type/Location keywords live in the header block at the document start
+        return self.pages.prefix(2000)
+
+    @cached_property
+    def quote_number(self):
+        return self._run(extract_quote_number)
+
+    @cached_property
+    def quote_date(self):
+        return self._run(extract_quote_date)
+
+    @cached_property
+    def good_thru(self):
+        return calculate_good_thru(self.quote_date)
+
+    @cached_property
+    def project_name(self):
+        return self._run(extract_project_name)
+
+    @cached_property
+    def revision(self):
+        return self._run(extract_revision)
+
+    @cached_property
+    def lead_time(self):
+        return self._run(extract_lead_time)
+
+    @cached_property
+    def overall_dimensions(self):
+        return self._run(extract_overall_dimensions)
+
+    @cached_property
+    def dimensions_parsed(self):
+        return self._run(extract_dimensions_parsed)
+
+    @cached_property
+    def interior_dimensions(self):
+        return self._run(extract_interior_dimensions)
+
+    @cached_property
+    def description(self):
+        return self._run(extract_description)
+
+    @cached_property
+    def box_type(self):
+        return _type_from_description(self.description, self.head)
+
+    @cached_property
+    def location(self):
+        return _location_from_description(self.description, self.head)
+
+    @cached_property
+    def dimensions_description(self):
+        if not self.overall_dimensions:
+            return None
+        type_str = f" {self.box_type}" if self.box_type else ""
+        loc_str = f" {self.location}" if self.location else ""
+        return f"{self.overall_dimensions}{loc_str}{type_str}"
+
+    @cached_property
+    def floor(self):
+        return self._run(extract_floor)
+
+    @cached_property
+    def door(self):
+        return self._run(extract_door)
+
+    @cached_property
+    def door_count(self):
+        return _door_count_from_door(self.door)
+
+    @cached_property
+    def net_price(self):
+        return self._run(extract_net_price)
+
+    @cached_property
+    def freight_destination(self):
+        return self._run(extract_freight_destination)
+
+    @cached_property
+    def ship_to_zip(self):
+        return _zip_from_destination(self.freight_destination)
+
+    @cached_property
+    def state(self):
+        return _state_from_destination(self.freight_destination)
+
+    @cached_property
+    def glass_doors_by_others(self):
+        return self._run(detect_glass_doors_by_others)
+
+    @cached_property
+    def drawing_layout(self):
+        return self.pages.layout(DRAWING_PAGE) if self.use_layout else None
+
+    @cached_property
+    def net_opening(self):
+        if self.drawing_layout is not None:
+            found = layout_net_opening(self.drawing_layout)
+            if found:
+                return found
+        return self._run(extract_net_opening)
+
+    @cached_property
+    def door_cutouts(self):
+        if self.drawing_layout is not None:
+            found = layout_door_cutouts(self.drawing_layout)
+            if found:
+                return found
+        return self._run(extract_display_door_cutouts)
+
+    @cached_property
+    def display_doors(self):
+        """Format display doors for CSV."""
+        if not self.glass_doors_by_others:
+            return "None"
         dd_parts = ["Glass Doors By Others"]
-        if net_opening:
-            dd_parts.append(f"Net Opening: {net_opening['description']}")
-        if door_cutouts:
-            for cutout in door_cutouts:
-                door_temp = "HH" if box_type == "Cooler" else "LT" if box_type == "Freezer" else "?"
+        if self.net_opening:
+            dd_parts.append(f"Net Opening: {self.net_opening['description']}")
+        if self.door_cutouts:
+            door_temp = (
+                "HH" if self.box_type == "Cooler"
+                else "LT" if self.box_type == "Freezer"
+                else "?"
+            )
+            for cutout in self.door_cutouts:
                 dd_parts.append(f"{cutout['description']} ({door_temp})")
-        dd_str = " - ".join(dd_parts)
+        return " - ".join(dd_parts)
+
+    @cached_property
+    def pass_thru_doors(self):
+        return str(len(re.findall(r"\bpass[\s-]*thru\b", self.text, re.IGNORECASE)))
 
-    # Count pass-thru doors
-    pass_thru = len(re.findall(r"\bpass[\s-]*thru\b", text, re.IGNORECASE))
+    @cached_property
+    def shape(self):
+        return self._run(extract_shape_label) or _shape_from_dimensions(
+            *self.dimensions_parsed
+        )
 
-    # Accessories
-    accessories = extract_accessories(text)
+    @cached_property
+    def combo(self):
+        return "Y" if re.search(r"\bcombo\b", self.text, re.IGNORECASE) else "N"
+
+    @cached_property
+    def accessories(self):
+        accessories = self._run(extract_accessories)
+        return "; ".join(accessories) if accessories else "None"
+
+    @cached_property
+    def raw_text(self):
+        return self.pages.prefix(3000)  # First 3000 chars for debugging
+
+
+# Engineering drawing page read by the --layout lookups
+DRAWING_PAGE = 3
+
+# Output key -> QuoteContext attribute, in CSV/JSON output order
+RECORD_FIELDS = [
+    ("Quote_Number", "quote_number"),
+    ("Ship_To_Zip", "ship_to_zip"),
+    ("State", "state"),
+    ("Customer_Job", "project_name"),
+    ("Dimensions_Description", "dimensions_description"),
+    ("Overall_Dimensions", "overall_dimensions"),
+    ("Interior_Dimensions", "interior_dimensions"),
+    ("Description", "description"),
+    ("Floors", "floor"),
+    ("Doors", "door"),
+    ("Door_Count", "door_count"),
+    ("Net_Price", "net_price"),
+    ("Quote_Date", "quote_date"),
+    ("Good_Thru", "good_thru"),
+    ("Type", "box_type"),
+    ("Location", "location"),
+    ("Display_Doors", "display_doors"),
+    ("Display_Doors_By_Others", "glass_doors_by_others"),
+    ("Net_Opening", "net_opening"),
+    ("Door_Cutouts", "door_cutouts"),
+    ("Pass_Thru_Doors", "pass_thru_doors"),
+    ("Shape", "shape"),
+    ("Combo", "combo"),
+    ("Accessories", "accessories"),
+    ("Revision", "revision"),
+    ("Lead_Time", "lead_time"),
+    ("Freight_Destination", "freight_destination"),
+    ("Raw_Text", "raw_text"),
+]
+
+
+def extract_from_pages(pages, filename, fields=None, layout=False):
+    """
+    Build the quote record from a page source (PdfPages or TextPages).
 
+    Args:
+        pages: Page source for one quote
+        filename: PDF filename for the record
+        fields: Optional list of output keys to extract (default: all).
+            Only the pages those fields declare are decoded.
+        layout: Read drawing annotations from the positional layout
+            (PdfPages only; plain text falls back to the regexes)
+
+    Returns dict with all (or the requested) fields matching CSV schema.
+    """
+    ctx = QuoteContext(pages, layout)
     result = {
         "PDF_Filename": filename,
         "AK_Vendor_Extract": "AmeriKooler",
-        "Quote_Number": extract_quote_number(text),
-        "Ship_To_Zip": extract_ship_to_zip(text),
-        "State": extract_state(text),
-        "Customer_Job": extract_project_name(text),
-        "Dimensions_Description": dim_desc,
-        "Overall_Dimensions": overall_dims,
-        "Interior_Dimensions": extract_interior_dimensions(text),
-        "Description": description,
-        "Floors": extract_floor(text),
-        "Doors": extract_door(text),
-        "Door_Count": extract_door_count(text),
-        "Net_Price": extract_net_price(text),
-        "Quote_Date": quote_date,
-        "Good_Thru": calculate_good_thru(quote_date),
-        "Type": box_type,
-        "Location": location,
-        "Display_Doors": dd_str,
-        "Display_Doors_By_Others": glass_doors_by_others,
-        "Net_Opening": net_opening,
-        "Door_Cutouts": door_cutouts,
-        "Pass_Thru_Doors": str(pass_thru),
-        "Shape": determine_shape(text),
-        "Combo": "N",
-        "Accessories": "; ".join(accessories) if accessories else "None",
-        "Revision": extract_revision(text),
-        "Lead_Time": extract_lead_time(text),
-        "Freight_Destination": extract_freight_destination(text),
-        "Raw_Text": text[:3000],  # First 3000 chars for debugging
     }
+    for key, attr in RECORD_FIELDS:
+        if fields is None or key in fields:
+            result[key] = getattr(ctx, attr)
+    return result
 
-    # Check for combo box
-    if re.search(r"\bcombo\b", text, re.IGNORECASE):
-        result["Combo"] = "Y"
 
-    return result
+def extract_from_text(text, filename, fields=None):
+    """
+    Build the quote record from already-extracted PDF text.
+    Text without page boundaries is treated as a single page.
+    """
+    return extract_from_pages(TextPages([text]), filename, fields)
+
+
+def extract_all(pdf_path, fields=None, layout=False):
+    """
+    Extract all quote data from AK PDF.
+    Returns dict with all (or the requested) fields matching CSV schema.
+    """
+    return extract_from_pages(
+        PdfPages(pdf_path), os.path.basename(pdf_path), fields, layout
+    )
+
+
+def extract_cached(pdf_path, cache=None, fields=None, corpus=None, layout=False):
+    """
+    Extract a PDF through the result cache and the text corpus.
+
+    A cache hit returns the stored record (trimmed to `fields`) without
+    parsing the PDF. On a miss the PDF is parsed: full extractions are
+    cached, and when every page was decoded the page texts are added to the
+    corpus for --replay-corpus. Partial --fields runs skip the cache store
+    so they keep decoding only the pages they need. Layout runs should use
+    a cache built with a layout-specific version (see main).
+    """
+    if cache is None and corpus is None:
+        return extract_all(pdf_path, fields, layout)
+    try:
+        pdf_sha = file_sha256(pdf_path)
+    except OSError as e:
+        raise PdfReadError(f"Error reading PDF: {e}") from e
+    filename = os.path.basename(pdf_path)
+
+    record = cache.get(pdf_sha) if cache is not None else None
+    if record is None:
+        wanted = set(fields or [key for key, _ in RECORD_FIELDS])
+        full = {key for key, _ in RECORD_FIELDS if key != "Raw_Text"} <= wanted
+        pages = PdfPages(pdf_path)
+        record = extract_from_pages(pages, filename, None if full else fields, layout)
+        texts = pages.decoded_texts()
+        if corpus is not None and texts is not None and not corpus.has(pdf_sha):
+            corpus.put(pdf_sha, filename, texts)
+        if cache is not None and full:
+            cache.put(pdf_sha, record)
+
+    # Same PDF may come back under a new name (re-sends)
+    record["PDF_Filename"] = filename
+    if fields is not None:
+        record = {
+            key: value
+            for key, value in record.items()
+            if key in ("PDF_Filename", "AK_Vendor_Extract") or key in fields
+        }
+    return record
+
+
+def diff_records(old, new):
+    """
+    Field-level differences between two records.
+    Returns dict of key -> {"old": value, "new": value}; filename and raw
+    text are ignored.
+    """
+    changes = {}
+    for key in list(old) + [k for k in new if k not in old]:
+        if key in ("PDF_Filename", "Raw_Text"):
+            continue
+        if old.get(key) != new.get(key):
+            changes[key] = {"old": old.get(key), "new": new.get(key)}
+    return changes
+
+
+def _revision_number(revision):
+    try:
+        return int(revision)
+    except (TypeError, ValueError):
+        return 0
+
+
+def extract_incremental(pdf_path, store, layout=False):
+    """
+    Extract a PDF against the revision store.
+
+    Page 1 is always decoded to read the quote number. If that quote is
+    already stored, every other page whose fingerprint (content stream plus
+    resources, see PdfPages.fingerprint) matches a stored page reuses the
+    stored text, so only changed pages are decoded. The store is then
+    updated unless the stored revision is newer.
+
+    Returns:
+        tuple (record: dict, diff: dict or None). diff is None when the quote
+        number has not been seen before; otherwise it holds Quote_Number,
+        Revision, Previous_Revision, PDF_Filename, Previous_PDF_Filename,
+        Changed_Pages, Decoded_Pages and Changes (see diff_records).
+    """
+    filename = os.path.basename(pdf_path)
+    pages = PdfPages(pdf_path)
+    quote_number = QuoteContext(pages).quote_number
+    previous = store.get(quote_number) if quote_number else None
+
+    fingerprints = [pages.fingerprint(n) for n in range(1, len(pages) + 1)]
+    known = {}
+    if previous:
+        known = {p["fingerprint"]: p["text"] for p in previous["pages"]}
+        for number, fingerprint in enumerate(fingerprints, 1):
+            if fingerprint in known:
+                pages.preload(number, known[fingerprint])
+
+    record = extract_from_pages(pages, filename, layout=layout)
+    texts = [pages.page_text(n) for n in range(1, len(pages) + 1)]
+
+    if quote_number and (
+        previous is None
+        or _revision_number(record["Revision"]) >= _revision_number(previous["revision"])
+    ):
+        store.put(
+            quote_number,
+            record["Revision"],
+            filename,
+            [{"fingerprint": f, "text": t} for f, t in zip(fingerprints, texts)],
+            record,
+        )
+
+    if previous is None:
+        return record, None
+    diff = {
+        "Quote_Number": quote_number,
+        "Revision": record["Revision"],
+        "Previous_Revision": previous["revision"],
+        "PDF_Filename": filename,
+        "Previous_PDF_Filename": previous["filename"],
+        "Changed_Pages": [
+            n for n, f in enumerate(fingerprints, 1) if f not in known
+        ],
+        "Decoded_Pages": sorted(pages.decoded),
+        "Changes": diff_records(previous["record"], record),
+    }
+    return record, diff
+
+
+def replay_corpus(corpus, raw_text=False, out=None, fields=None):
+    """
+    Re-run the current extract_* functions over every PDF in the text corpus.
+
+    No PDF is opened: each stored page list is fed straight to the
+    extractors, so a pattern change can be checked across the whole archive.
+    Streams one NDJSON record per stored PDF to `out`.
+
+    Returns:
+        tuple (replayed: int, elapsed_seconds: float)
+    """
+    out = out or sys.stdout
+    started = time.perf_counter()
+    replayed = 0
+    for _, filename, texts in corpus:
+        record = extract_from_pages(TextPages(texts), filename, fields)
+        if not raw_text:
+            record.pop("Raw_Text", None)
+        out.write(json.dumps(record) + "\n")
+        replayed += 1
+    out.flush()
+    return replayed, time.perf_counter() - started
+
+
+# Labeled quote-number headers that open a quote inside a bundle PDF.
+# The bare XX-XXXXX fallback of extract_quote_number is too loose here.
+BUNDLE_HEADER_PATTERNS = [
+    re.compile(r"Quote\s*#\s*:\s*(\d{2}-\d{5})", re.IGNORECASE),
+    re.compile(r"Quote\s*Number\s*:\s*(\d{2}-\d{5})", re.IGNORECASE),
+]
+
+
+def _bundle_quote_number(page_text):
+    """Quote number from a page's header, or None for continuation pages."""
+    for pattern in BUNDLE_HEADER_PATTERNS:
+        match = pattern.search(page_text)
+        if match:
+            return match.group(1)
+    return None
+
+
+def split_bundle(page_texts):
+    """
+    Group a stream of page texts into quotes.
+
+    A page whose header carries a quote number different from the current
+    quote's starts a new quote. Pages without a header (equipment, drawings)
+    and repeated headers of the same quote stay with the current quote.
+    Pages before the first header (cover letters) are dropped so every
+    quote starts on its header page, unless no page has a header at all,
+    in which case the whole file is one quote. Only one quote's pages are
+    held at a time.
+
+    Yields:
+        tuple (first_page: int, texts: list) per quote, first_page 1-based
+    """
+    texts = []
+    first_page = 1
+    current_number = None
+    for page_number, page_text in enumerate(page_texts, 1):
+        quote_number = _bundle_quote_number(page_text)
+        if quote_number and quote_number != current_number:
+            if current_number:
+                yield first_page, texts
+            texts = []
+            first_page = page_number
+            current_number = quote_number
+        texts.append(page_text)
+    if texts:
+        yield first_page, texts
+
+
+def iter_bundle_records(pdf_path, fields=None):
+    """
+    Extract every quote in a multi-quote bundle PDF, one record at a time.
+    Each record gets a "Bundle_Pages" key ("first-last", 1-based) naming
+    the pages it came from.
+    """
+    filename = os.path.basename(pdf_path)
+    for first_page, texts in split_bundle(iter_page_texts(pdf_path)):
+        record = extract_from_pages(TextPages(texts), filename, fields)
+        record["Bundle_Pages"] = f"{first_page}-{first_page + len(texts) - 1}"
+        yield record
+
+
+def find_pdfs(pdf_dir, pattern="*.pdf"):
+    """List PDFs under pdf_dir matching a glob pattern (supports **)."""
+    return sorted(glob.glob(os.path.join(pdf_dir, pattern), recursive=True))
+
+
+def _extract_for_batch(pdf_path, fields=None, cache=None, corpus=None, layout=False):
+    """
+    Process-pool worker for batch mode.
+    A failure becomes an error record instead of stopping the whole run.
+    """
+    try:
+        return extract_cached(pdf_path, cache, fields, corpus, layout)
+    except Exception as e:
+        return {
+            "PDF_Filename": os.path.basename(pdf_path),
+            "PDF_Path": pdf_path,
+            "Error": str(e),
+        }
+
+
+def _init_worker(pattern_stats):
+    """Process-pool initializer: share the parent's pattern counters."""
+    global PATTERN_STATS
+    PATTERN_STATS = pattern_stats
+
+
+def _extract_in_worker(*args):
+    """
+    Pool task: the batch record plus the pattern counters it recorded,
+    which the parent merges into its own PATTERN_STATS.
+    """
+    return _extract_for_batch(*args), PATTERN_STATS.take_delta()
+
+
+def run_batch(
+    pdf_paths,
+    workers=None,
+    raw_text=False,
+    out=None,
+    fields=None,
+    cache=None,
+    corpus=None,
+    layout=False,
+):
+    """
+    Extract many PDFs across a process pool.
+
+    Streams one NDJSON record per quote to `out` as each file finishes
+    (completion order, not input order). Files that fail produce a record
+    with an "Error" key.
+
+    Returns:
+        tuple (processed: int, errors: int, elapsed_seconds: float)
+    """
+    out = out or sys.stdout
+    started = time.perf_counter()
+    processed = errors = 0
+
+    def emit(record):
+        nonlocal processed, errors
+        processed += 1
+        if "Error" in record:
+            errors += 1
+        if not raw_text:
+            record.pop("Raw_Text", None)
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+    if workers == 1 or len(pdf_paths) <= 1:
+        for pdf_path in pdf_paths:
+            emit(_extract_for_batch(pdf_path, fields, cache, corpus, layout))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(PATTERN_STATS,),
+        ) as pool:
+            futures = [
+                pool.submit(_extract_in_worker, p, fields, cache, corpus, layout)
+                for p in pdf_paths
+            ]
+            for future in as_completed(futures):
+                record, pattern_counts = future.result()
+                PATTERN_STATS.merge(pattern_counts)
+                emit(record)
+
+    return processed, errors, time.perf_counter() - started
 
 
 def main():
     parser = argparse.ArgumentParser(
         description="Extract data from AmeriKooler quote PDFs"
     )
-    parser.add_argument(
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
         "--pdf-path",
         type=str,
-        required=True,
         help="Path to the AmeriKooler quote PDF file",
     )
+    source.add_argument(
+        "--pdf-dir",
+        type=str,
+        help="Directory of AmeriKooler quote PDFs (batch mode, NDJSON output)",
+    )
+    source.add_argument(
+        "--bundle",
+        type=str,
+        help="Multi-quote bundle PDF, split into one NDJSON record per quote",
+    )
+    source.add_argument(
+        "--replay-corpus",
+        action="store_true",
+        help="Re-run the current patterns over the stored text corpus (NDJSON output; "
+        "--corpus DIR picks the corpus)",
+    )
+    source.add_argument(
+        "--pattern-report",
+        action="store_true",
+        help="Print hit/miss/time statistics for the fallback patterns and exit",
+    )
+    parser.add_argument(
+        "--glob",
+        type=str,
+        default="*.pdf",
+        help="File pattern inside --pdf-dir, ** allowed (default: *.pdf)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Batch worker processes (default: CPU count)",
+    )
     parser.add_argument(
         "--raw-text",
         action="store_true",
         help="Also output raw extracted text for debugging",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the extraction cache and re-parse the PDF",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=DEFAULT_CACHE_DIR,
+        help=f"Extraction cache directory (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_BYTES / (1024 * 1024),
+        help="Cache size limit in MB before least recently used entries are evicted",
+    )
+    parser.add_argument(
+        "--fields",
+        type=str,
+        default=None,
+        help="Comma-separated output keys to extract, e.g. Quote_Number,Net_Price "
+        "(default: all). Pages no requested field needs are never decoded.",
+    )
+    parser.add_argument(
+        "--corpus",
+        type=str,
+        nargs="?",
+        const=DEFAULT_CORPUS_DIR,
+        default=None,
+        metavar="DIR",
+        help="Add the text of newly parsed PDFs to the text corpus for --replay-corpus "
+        f"(off by default; DIR defaults to {DEFAULT_CORPUS_DIR})",
+    )
+    parser.add_argument(
+        "--layout",
+        action="store_true",
+        help="Read net openings and door cutouts from the drawing page's text "
+        "positions (PDF input only)",
+    )
+    parser.add_argument(
+        "--revisions",
+        action="store_true",
+        help="Compare against the stored revision of the same quote number and "
+        "output a field-level diff (--pdf-path / --pdf-dir)",
+    )
+    parser.add_argument(
+        "--revision-dir",
+        type=str,
+        default=DEFAULT_REVISION_DIR,
+        help=f"Revision store directory (default: {DEFAULT_REVISION_DIR})",
+    )
+    parser.add_argument(
+        "--pattern-stats",
+        type=str,
+        default=None,
+        help="Pattern statistics file; giving it records this run's counters there "
+        f"(default: {DEFAULT_PATTERN_STATS})",
+    )
+    parser.add_argument(
+        "--no-pattern-stats",
+        action="store_true",
+        help="Do not add this run's pattern counters to the statistics file, "
+        "even with --adaptive-patterns or --pattern-stats",
+    )
+    parser.add_argument(
+        "--adaptive-patterns",
+        action="store_true",
+        help="Try interchangeable patterns in order of observed hit rate "
+        "(broad fallbacks always stay last) and record this run's counters",
+    )
 
     args = parser.parse_args()
 
-    result = extract_all(args.pdf_path)
+    PATTERN_STATS.path = args.pattern_stats or DEFAULT_PATTERN_STATS
+    PATTERN_STATS.adaptive = args.adaptive_patterns
+    PATTERN_STATS.load()
+    if args.pattern_report:
+        print_report(PATTERN_STATS.report())
+        return
+    # Counters are only written when someone uses them: adaptive ordering
+    # reads them back, and an explicit --pattern-stats asks for them
+    record_stats = args.adaptive_patterns or args.pattern_stats is not None
+    if record_stats and not args.no_pattern_stats:
+        atexit.register(PATTERN_STATS.save)
+
+    known_fields = [key for key, _ in RECORD_FIELDS]
+    if args.fields:
+        fields = [f.strip() for f in args.fields.split(",") if f.strip()]
+        unknown = [f for f in fields if f not in known_fields]
+        if unknown:
+            print(
+                f"Error: Unknown field(s): {', '.join(unknown)}. "
+                f"Valid fields: {', '.join(known_fields)}",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+    else:
+        fields = list(known_fields)
+    if args.raw_text and "Raw_Text" not in fields:
+        fields.append("Raw_Text")
+    elif not args.raw_text and "Raw_Text" in fields:
+        fields.remove("Raw_Text")
+
+    cache = None
+    if not args.no_cache:
+        # Layout and adaptive-order results may differ from the default ones,
+        # so keep them apart
+        version = EXTRACTOR_VERSION
+        if args.layout:
+            version += "-layout"
+        if args.adaptive_patterns:
+            version += "-adaptive"
+        cache = ExtractCache(
+            args.cache_dir,
+            version,
+            max_bytes=int(args.cache_max_mb * 1024 * 1024),
+        )
+
+    # The corpus keeps the full text of every PDF, so it is only written on request
+    corpus = TextCorpus(args.corpus) if args.corpus else None
+
+    if args.replay_corpus:
+        replayed, elapsed = replay_corpus(
+            TextCorpus(args.corpus or DEFAULT_CORPUS_DIR), raw_text=args.raw_text, fields=fields
+        )
+        print(
+            f"\nReplay complete: {replayed} stored PDF(s) in {elapsed:.2f}s",
+            file=sys.stderr,
+        )
+        return
+
+    if args.revisions and (args.pdf_path or args.pdf_dir):
+        store = RevisionStore(args.revision_dir)
+        if args.pdf_dir:
+            pdf_paths = find_pdfs(args.pdf_dir, args.glob)
+        else:
+            pdf_paths = [args.pdf_path]
+        for pdf_path in pdf_paths:
+            try:
+                record, diff = extract_incremental(pdf_path, store, args.layout)
+            except PdfReadError as e:
+                print(f"{os.path.basename(pdf_path)}: {e}", file=sys.stderr)
+                if args.pdf_path:
+                    sys.exit(1)
+                continue
+            output = diff if diff is not None else record
+            if not args.raw_text:
+                output.pop("Raw_Text", None)
+            if args.pdf_dir:
+                print(json.dumps(output), flush=True)
+            else:
+                print(json.dumps(output, indent=2))
+            if diff is None:
+                print(
+                    f"{record['PDF_Filename']}: new quote {record['Quote_Number']} stored",
+                    file=sys.stderr,
+                )
+            else:
+                print(
+                    f"{diff['PDF_Filename']}: {diff['Quote_Number']} revision "
+                    f"{diff['Previous_Revision']} -> {diff['Revision']}, "
+                    f"{len(diff['Changes'])} field(s) changed, "
+                    f"page(s) decoded: {diff['Decoded_Pages']}",
+                    file=sys.stderr,
+                )
+        return
+
+    if args.bundle:
+        quotes = 0
+        try:
+            for record in iter_bundle_records(args.bundle, fields):
+                print(json.dumps(record), flush=True)
+                quotes += 1
+        except PdfReadError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+        print(f"\nBundle complete: {quotes} quote(s)", file=sys.stderr)
+        return
+
+    if args.pdf_dir:
+        pdf_paths = find_pdfs(args.pdf_dir, args.glob)
+        if not pdf_paths:
+            print(
+                f"Error: No files matching {args.glob} in {args.pdf_dir}",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        processed, errors, elapsed = run_batch(
+            pdf_paths,
+            workers=args.workers,
+            raw_text=args.raw_text,
+            fields=fields,
+            cache=cache,
+            corpus=corpus,
+            layout=args.layout,
+        )
+        rate = processed / elapsed if elapsed else 0.0
+        print(
+            f"\nBatch complete: {processed} PDF(s), {errors} error(s) "
+            f"in {elapsed:.2f}s ({rate:.1f} PDFs/sec)",
+            file=sys.stderr,
+        )
+        return
+
+    try:
+        result = extract_cached(args.pdf_path, cache, fields, corpus, args.layout)
+    except PdfReadError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
 
     if not args.raw_text:
         result.pop("Raw_Text", None)
@@ -489,7 +1626,7 @@ def main():
         "Location",
         "Dimensions_Description",
     ]
-    missing = [k for k in critical_fields if not result.get(k)]
+    missing = [k for k in critical_fields if k in fields and not result.get(k)]
     if missing:
         print(f"\nWARNING: Missing critical fields: {', '.join(missing)}", file=sys.stderr)
 
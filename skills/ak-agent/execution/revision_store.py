@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Quote Revision Store
+
+Latest known revision of each AK quote, keyed by quote number: the
+extracted record plus, per page, a fingerprint of the page's content stream
+and resources and its decoded text. When a new revision of the quote arrives, pages whose
+fingerprint is unchanged reuse the stored text instead of being decoded
+again with pypdf, and the new record is reported as a field-level diff.
+
+One gzip-compressed JSON entry per quote number.
+"""
+
+import gzip
+import json
+import os
+import re
+import tempfile
+
+
+class RevisionStore:
+    """
+    Directory-backed store of the latest revision per quote number.
+
+    Args:
+        store_dir: Directory holding one <quote_number>.json.gz file per quote
+    """
+
+    def __init__(self, store_dir):
+        self.store_dir = store_dir
+
+    def _entry_path(self, quote_number):
+        safe = re.sub(r"[^\w\-]", "_", quote_number)
+        return os.path.join(self.store_dir, f"{safe}.json.gz")
+
+    def get(self, quote_number):
+        """
+        Return the stored entry for a quote number, or None.
+        Entry keys: quote_number, revision, filename, pages, record.
+        pages is a list of {"fingerprint", "text"} dicts.
+        """
+        try:
+            with gzip.open(self._entry_path(quote_number), "rt", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def put(self, quote_number, revision, filename, pages, record):
+        """Store the latest revision of a quote (atomic replace)."""
+        os.makedirs(self.store_dir, exist_ok=True)
+        entry = {
+            "quote_number": quote_number,
+            "revision": revision,
+            "filename": filename,
+            "pages": pages,
+            "record": record,
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=self.store_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                    f.write(json.dumps(entry).encode("utf-8"))
+            os.replace(tmp_path, self._entry_path(quote_number))
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Tests for execution/calculate_pricing.py batch output.
+
+Run from skills/ak-agent: python -m pytest -q tests
+"""
+
+import csv
+import io
+import os
+import sys
+import unittest
+
+EXECUTION_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "execution"
+)
+if EXECUTION_DIR not in sys.path:
+    sys.path.append(EXECUTION_DIR)
+
+from calculate_pricing import price_rows, write_priced_rows
+
+INPUT_CSV = 'Quote #,Net Price,customer_quote\r\n26-1,"$12,345.00",old\r\n26-2,,old\r\n'
+
+
+class WritePricedRowsTest(unittest.TestCase):
+    def test_csv_input_is_streamed(self):
+        reader = csv.DictReader(io.StringIO(INPUT_CSV))
+        out = io.StringIO()
+        written = []
+
+        def pairs():
+            for pair in price_rows(reader):
+                yield pair
+                written.append(out.getvalue())  # Output when the next pair is asked for
+
+        counts = write_priced_rows(pairs(), out, "csv", reader.fieldnames)
+        self.assertEqual(counts, (1, 1))
+        self.assertIn("26-1", written[0])  # Written before the second row was read
+        self.assertEqual(
+            out.getvalue().splitlines(),
+            [
+                "Quote #,Net Price,net_price,raw_markup,customer_quote",
+                '26-1,"$12,345.00",12345.0,15431.25,15450',
+                "26-2,,,,",
+            ],
+        )
+
+    def test_ndjson_input_uses_union_header(self):
+        rows = [{"net_price": 1000, "a": 1}, {"b": 2}]
+        out = io.StringIO()
+        self.assertEqual(write_priced_rows(price_rows(rows), out, "csv"), (1, 1))
+        self.assertEqual(
+            out.getvalue().splitlines(),
+            ["a,b,net_price,raw_markup,customer_quote", "1,,1000.0,1250.0,1250", ",2,,,"],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
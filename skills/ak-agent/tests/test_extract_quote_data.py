@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Tests for execution/extract_quote_data.py field extraction on page text.
+
+Run from skills/ak-agent: python -m pytest -q tests
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+import unittest
+
+if importlib.util.find_spec("pypdf") is None:
+    raise unittest.SkipTest("pypdf is not installed")
+
+EXECUTION_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "execution"
+)
+if EXECUTION_DIR not in sys.path:
+    sys.path.append(EXECUTION_DIR)
+
+from extract_quote_data import PdfPages, TextPages, extract_from_pages
+from pypdf import PdfWriter
+from pypdf.generic import (
+    ArrayObject,
+    DecodedStreamObject,
+    DictionaryObject,
+    NameObject,
+    NumberObject,
+)
+
+PAGE1 = (
+    "Quote #: 26-02170\n"
+    "Date: 01/23/2026\n"
+    "Description: Indoor Cooler, with floor\n"
+    "Floor: NSF vinyl screed\n"
+    'Door: (1) Standard 36" x 76" door\n'
+    "Lead Time: 3 weeks\n"
+)
+PAGE2 = (
+    "Equipment: None\n"
+    "Accessories:\n"
+    "(2) Heated vent\n"
+    "Freight: Delivered to GA-30339\n"
+    "Price: $12,345.00 Net\n"
+)
+
+
+def extract(page1=PAGE1, page2=PAGE2, page3=""):
+    return extract_from_pages(TextPages([page1, page2, page3]), "quote.pdf")
+
+
+class SectionIndexTest(unittest.TestCase):
+    """Labels the section index does not see still match, as they did before it."""
+
+    def test_headings_at_line_start(self):
+        record = extract()
+        self.assertEqual(record["Net_Price"], "12345.00")
+        self.assertEqual(record["Doors"], '(1) Standard 36" x 76" door')
+        self.assertEqual(record["Door_Count"], 1)
+        self.assertEqual(record["Description"], "Indoor Cooler, with floor")
+        self.assertEqual(record["Accessories"], "(2) Heated vent")
+        self.assertEqual(record["Freight_Destination"], "GA-30339")
+
+    def test_prefixed_price_label(self):
+        page2 = PAGE2.replace("Price: $12,345.00 Net", "Total Price: $12,345.00 Net")
+        self.assertEqual(extract(page2=page2)["Net_Price"], "12345.00")
+
+    def test_net_price_label(self):
+        page2 = PAGE2.replace("Price: $12,345.00 Net", "Net Price: $9,999.00")
+        self.assertEqual(extract(page2=page2)["Net_Price"], "9999.00")
+
+    def test_price_on_freight_line(self):
+        page2 = PAGE2.replace("GA-30339\nPrice", "GA-30339 Price")
+        self.assertEqual(extract(page2=page2)["Net_Price"], "12345.00")
+
+    def test_prefixed_door_label(self):
+        page1 = PAGE1.replace("Door: (1)", "Box Door: (2)")
+        record = extract(page1=page1)
+        self.assertEqual(record["Doors"], '(2) Standard 36" x 76" door')
+        self.assertEqual(record["Door_Count"], 2)
+
+    def test_description_mid_line(self):
+        page1 = PAGE1.replace(
+            "Quote #: 26-02170\nDate: 01/23/2026\nDescription",
+            "Date: 01/23/2026\nQuote #: 26-02170 Description",
+        )
+        record = extract(page1=page1)
+        self.assertEqual(record["Description"], "Indoor Cooler, with floor")
+        self.assertEqual(record["Quote_Number"], "26-02170")
+
+    def test_prefixed_accessories_label(self):
+        page2 = PAGE2.replace("Accessories:\n(2) Heated vent", "Item Accessories: (2) Heated vent")
+        self.assertEqual(extract(page2=page2)["Accessories"], "(2) Heated vent")
+
+    def test_embedded_label_does_not_end_section(self):
+        page1 = PAGE1.replace('door\n', 'door with Trap Door: kit\n')
+        page2 = PAGE2.replace("(2) Heated vent", "(2) Heated vent, Trap Door: included\n(1) Kick plate")
+        record = extract(page1=page1, page2=page2)
+        self.assertEqual(record["Doors"], '(1) Standard 36" x 76" door with Trap Door: kit')
+        self.assertEqual(record["Accessories"], "(2) Heated vent, Trap Door: included; (1) Kick plate")
+
+    def test_empty_accessories_keeps_pre_index_value(self):
+        page2 = PAGE2.replace("(2) Heated vent\n", "")
+        self.assertEqual(extract(page2=page2)["Accessories"], "Freight: Delivered to GA-30339")
+
+
+class PageRoutingTest(unittest.TestCase):
+    """A field missing from its routed page is read from the whole document."""
+
+    def test_one_page_quote(self):
+        record = extract(page1=PAGE1 + PAGE2, page2="")
+        self.assertEqual(record["Net_Price"], "12345.00")
+        self.assertEqual(record["Accessories"], "(2) Heated vent")
+        self.assertEqual(record["Freight_Destination"], "GA-30339")
+
+    def test_price_on_page_three(self):
+        page2 = PAGE2.replace("Price: $12,345.00 Net\n", "")
+        record = extract(page2=page2, page3="Price: $12,345.00 Net\n")
+        self.assertEqual(record["Net_Price"], "12345.00")
+
+    def test_shape_label_after_page_one(self):
+        record = extract(page2=PAGE2 + "Box shape: Square\n")
+        self.assertEqual(record["Shape"], "Square")
+
+    def test_type_keyword_past_short_page_one(self):
+        page1 = PAGE1.replace("Indoor Cooler, with floor", "Walk-in, with floor")
+        record = extract(page1=page1, page2="Outdoor Freezer\n" + PAGE2)
+        self.assertEqual(record["Type"], "Freezer")
+        self.assertEqual(record["Location"], "Outdoor")
+
+
+class FingerprintTest(unittest.TestCase):
+    """A page's fingerprint changes with anything that changes its text."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def pages(self, name, form_text):
+        path = os.path.join(self.tmp.name, name)
+        write_form_pdf(path, form_text)
+        return PdfPages(path)
+
+    def test_same_content_stream_different_xobject(self):
+        old = self.pages("old.pdf", "Price: $12,345.00")
+        new = self.pages("new.pdf", "Price: $9,999.00")
+        self.assertIn("12,345.00", old.page_text(1))
+        self.assertIn("9,999.00", new.page_text(1))
+        self.assertNotEqual(old.fingerprint(1), new.fingerprint(1))
+
+    def test_unchanged_page_keeps_fingerprint(self):
+        first = self.pages("first.pdf", "Price: $12,345.00")
+        again = self.pages("again.pdf", "Price: $12,345.00")
+        self.assertEqual(first.fingerprint(1), again.fingerprint(1))
+
+
+def write_form_pdf(path, form_text):
+    """One-page PDF whose content stream only draws form XObject /X0."""
+    writer = PdfWriter()
+    page = writer.add_blank_page(612, 792)
+    font = DictionaryObject({
+        NameObject("/Type"): NameObject("/Font"),
+        NameObject("/Subtype"): NameObject("/Type1"),
+        NameObject("/BaseFont"): NameObject("/Helvetica"),
+    })
+    form = DecodedStreamObject()
+    form.set_data(f"BT /F1 12 Tf 72 720 Td ({form_text}) Tj ET".encode())
+    form.update({
+        NameObject("/Type"): NameObject("/XObject"),
+        NameObject("/Subtype"): NameObject("/Form"),
+        NameObject("/BBox"): ArrayObject([NumberObject(n) for n in (0, 0, 612, 792)]),
+        NameObject("/Resources"): DictionaryObject({
+            NameObject("/Font"): DictionaryObject({NameObject("/F1"): writer._add_object(font)}),
+        }),
+    })
+    contents = DecodedStreamObject()
+    contents.set_data(b"/X0 Do")
+    page[NameObject("/Contents")] = writer._add_object(contents)
+    page[NameObject("/Resources")] = DictionaryObject({
+        NameObject("/XObject"): DictionaryObject({NameObject("/X0"): writer._add_object(form)}),
+    })
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+if __name__ == "__main__":
+    unittest.main()
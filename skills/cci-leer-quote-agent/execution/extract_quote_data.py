@@ -5,14 +5,23 @@ CCI/LEER Quote PDF Data Extractor
 Extracts structured data from CCI/Carroll Coolers/LEER quote PDFs.
 Outputs JSON matching the CSV schema for downstream storage.
 
+Bundle PDFs (several quotes in one file, one per box on a multi-box job)
+are split on each new tag header and extracted one quote at a time
+(--bundle, see split_bundle).
+
 NOTE: Regex patterns will need refinement as real PDFs are processed.
 Update patterns here and document changes in the directive/UPDATES.md.
 """
 
 import argparse
+import atexit
+import glob
 import json
+import os
 import re
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 
 try:
@@ -24,33 +33,93 @@ except ImportError:
     )
     sys.exit(1)
 
-
-def extract_text_from_pdf(pdf_path):
-    """Extract all text from a PDF file."""
+# Cache, corpus and pattern-stats helpers shared with ak-agent (skills/quote-pipeline/shared/)
+SHARED_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))),
+    "quote-pipeline",
+    "shared",
+)
+if SHARED_DIR not in sys.path:
+    sys.path.append(SHARED_DIR)
+
+from extract_cache import DEFAULT_MAX_BYTES, ExtractCache, file_sha256, source_version
+from pattern_stats import PatternStats, print_report
+from text_corpus import TextCorpus
+from zip_lookup import DEFAULT_TABLE_PATH as ZIP_TABLE_PATH
+from zip_lookup import state_for_zip
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cci_extract_cache")
+DEFAULT_CORPUS_DIR = os.path.join(os.path.expanduser("~"), ".cci_text_corpus")
+DEFAULT_PATTERN_STATS = os.path.join(os.path.expanduser("~"), ".cci_pattern_stats.json")
+
+# Hit/miss/time counters for the fallback pattern lists (see pattern_stats.py).
+# main() points this at the stats file; library callers get in-memory counters.
+PATTERN_STATS = PatternStats()
+
+# Version stamp of this extractor's pattern set and the helpers that shape its
+# output (ZIP-to-State lookup and table, pattern ordering): any edit invalidates
+# the cache
+EXTRACTOR_VERSION = source_version(
+    __file__,
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "zip_lookup.py"),
+    ZIP_TABLE_PATH,
+    os.path.join(SHARED_DIR, "pattern_stats.py"),
+)
+
+
+class PdfReadError(Exception):
+    """Raised when a PDF cannot be opened or its text cannot be extracted."""
+
+
+def iter_page_texts(pdf_path):
+    """
+    Yield each page's text in order, decoding one page at a time.
+    Each page keeps its trailing newline (empty pages are ""), so joining
+    the pages gives the full-document text. Earlier pages are not kept.
+    Raises PdfReadError so a bad file can be handled by the caller.
+    """
     try:
         reader = PdfReader(pdf_path)
-        text = ""
-        for page in reader.pages:
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-        return text
+        count = len(reader.pages)
     except Exception as e:
-        print(f"Error reading PDF: {e}", file=sys.stderr)
-        sys.exit(1)
+        raise PdfReadError(f"Error reading PDF: {e}") from e
+    for index in range(count):
+        try:
+            page_text = reader.pages[index].extract_text()
+        except Exception as e:
+            raise PdfReadError(f"Error reading PDF: {e}") from e
+        yield page_text + "\n" if page_text else ""
+
+
+def extract_pages_from_pdf(pdf_path):
+    """
+    Extract the text of each page of a PDF file as a list.
+    Raises PdfReadError so a bad file can be handled by the caller.
+    """
+    return list(iter_page_texts(pdf_path))
+
+
+def extract_text_from_pdf(pdf_path):
+    """
+    Extract all text from a PDF file.
+    Raises PdfReadError so a bad file can be handled by the caller.
+    """
+    return "".join(extract_pages_from_pdf(pdf_path))
 
 
 def extract_tag_number(text):
     """Extract CCI tag/quote number (e.g., CC359210)."""
+    # Tag-shaped numbers first; any token after a number label is the fallback
     patterns = [
-        r"(?:Tag|Quote|Ref)[\s#:]*([A-Z]{2}\d{5,7})",
-        r"\b(CC\d{5,7})\b",
-        r"(?:Quote\s*Number|Tag\s*Number)[\s:]*(\S+)",
+        [
+            r"(?:Tag|Quote|Ref)[\s#:]*([A-Z]{2}\d{5,7})",
+            r"\b(CC\d{5,7})\b",
+        ],
+        [r"(?:Quote\s*Number|Tag\s*Number)[\s:]*(\S+)"],
     ]
-    for pattern in patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
-        if match:
-            return match.group(1)
+    match = PATTERN_STATS.search("tag_number", patterns, text, re.IGNORECASE)
+    if match:
+        return match.group(1)
     return None
 
 
@@ -70,27 +139,61 @@ def extract_dimensions(text):
     return None, None, None
 
 
-def extract_type(text):
-    """Determine if cooler or freezer."""
-    freezer_indicators = [
-        r"\bfreezer\b",
-        r"\blow\s*temp\b",
-        r"\bLT\b",
-        r"-\d+\s*[°]?\s*[fF]",
-    ]
-    cooler_indicators = [
-        r"\bcooler\b",
-        r"\bhigh\s*humid\b",
-        r"\bHH\b",
-        r"\b35\s*[°]?\s*[fF]\b",
-    ]
-
-    freezer_count = sum(
-        1 for p in freezer_indicators if re.search(p, text, re.IGNORECASE)
-    )
-    cooler_count = sum(
-        1 for p in cooler_indicators if re.search(p, text, re.IGNORECASE)
-    )
+# Keyword indicators, matched against lower-cased text in a single sweep.
+# Every alternative starts with a literal character so the regex engine can
+# skip ahead between candidates; the leading word boundary the original
+# per-indicator patterns carried is checked in scan_keywords() instead.
+# "-" consumes only the minus sign, so "-35F" still counts toward "35F".
+KEYWORD_PATTERN = re.compile(
+    r"freezer\b|low\s*temp\b|lt\b|-(?=\d+\s*°?\s*f)"
+    r"|cooler\b|high\s*humid\b|hh\b|35\s*°?\s*f\b"
+    r"|outdoor\b|indoor\b|combo\b|reach[\s-]*in\b|pass[\s-]*thru\b"
+)
+
+# Indicator name by the first two characters of a keyword match
+KEYWORD_KINDS = {
+    "fr": "freezer",
+    "lo": "low_temp",
+    "lt": "lt",
+    "-": "minus_temp",
+    "hi": "high_humid",
+    "hh": "hh",
+    "35": "cooler_temp",
+    "ou": "outdoor",
+    "in": "indoor",
+    "re": "reach_in",
+    "pa": "pass_thru",
+}
+
+FREEZER_INDICATORS = ("freezer", "low_temp", "lt", "minus_temp")
+COOLER_INDICATORS = ("cooler", "high_humid", "hh", "cooler_temp")
+
+WORD_CHAR = re.compile(r"\w")
+
+
+def scan_keywords(text):
+    """
+    Count every keyword indicator in one pass over the text.
+    Returns dict of indicator name -> number of matches.
+    """
+    lowered = text.lower()
+    counts = {}
+    for match in KEYWORD_PATTERN.finditer(lowered):
+        start = match.start()
+        keyword = match.group()
+        if keyword != "-" and start and WORD_CHAR.match(lowered, start - 1):
+            continue  # No word boundary before the keyword
+        kind = KEYWORD_KINDS.get(keyword[:2])
+        if kind is None:  # "co": cooler or combo
+            kind = "cooler" if keyword[2] == "o" else "combo"
+        counts[kind] = counts.get(kind, 0) + 1
+    return counts
+
+
+def type_from_keywords(counts):
+    """Determine cooler or freezer from scan_keywords() counts."""
+    freezer_count = sum(1 for name in FREEZER_INDICATORS if counts.get(name))
+    cooler_count = sum(1 for name in COOLER_INDICATORS if counts.get(name))
 
     if freezer_count > cooler_count:
         return "Freezer"
@@ -99,15 +202,25 @@ def extract_type(text):
     return None
 
 
-def extract_location(text):
-    """Determine indoor or outdoor installation."""
-    if re.search(r"\boutdoor\b", text, re.IGNORECASE):
+def location_from_keywords(counts):
+    """Determine indoor or outdoor installation from scan_keywords() counts."""
+    if counts.get("outdoor"):
         return "Outdoor"
-    if re.search(r"\bindoor\b", text, re.IGNORECASE):
+    if counts.get("indoor"):
         return "Indoor"
     return None
 
 
+def extract_type(text):
+    """Determine if cooler or freezer."""
+    return type_from_keywords(scan_keywords(text))
+
+
+def extract_location(text):
+    """Determine indoor or outdoor installation."""
+    return location_from_keywords(scan_keywords(text))
+
+
 def extract_doors(text):
     """
     Extract door specifications.
@@ -256,18 +369,14 @@ def determine_shape(width, depth):
     return None
 
 
-def extract_all(pdf_path):
+def extract_from_text(text, filename):
     """
-    Extract all quote data from PDF.
+    Build the quote record from already-extracted PDF text.
     Returns dict with all fields matching CSV schema.
     """
-    import os
-
-    text = extract_text_from_pdf(pdf_path)
-    filename = os.path.basename(pdf_path)
-
     width, depth, height = extract_dimensions(text)
-    box_type = extract_type(text)
+    keywords = scan_keywords(text)
+    box_type = type_from_keywords(keywords)
     prices = extract_prices(text)
     dates = extract_dates(text)
     doors = extract_doors(text)
@@ -291,14 +400,16 @@ def extract_all(pdf_path):
         dd_str = "; ".join(dd_parts)
 
     # Count pass-thru doors
-    pass_thru = len(re.findall(r"\bpass[\s-]*thru\b", text, re.IGNORECASE))
+    pass_thru = keywords.get("pass_thru", 0)
+
+    ship_to_zip = extract_ship_to_zip(text)
 
     result = {
         "PDF_Filename": filename,
         "CCI_Vendor_Extract": "LEER",
         "Tag_Number": extract_tag_number(text),
-        "Ship_To_Zip": extract_ship_to_zip(text),
-        "State": None,  # Derived from context or zip lookup
+        "Ship_To_Zip": ship_to_zip,
+        "State": state_for_zip(ship_to_zip),  # Offline ZIP3 table
         "Customer_Job": None,  # Derived from context
         "Dimensions_Description": dim_desc,
         "Width": width,
@@ -319,43 +430,384 @@ def extract_all(pdf_path):
         "Display_Doors_Detail": display_doors,
         "Pass_Thru_Doors": str(pass_thru),
         "Shape": determine_shape(width, depth),
-        "Location": extract_location(text),
-        "Combo": "N",  # Default, update if combo detected
-        "Reach_In": "N",  # Default, update if reach-in detected
+        "Location": location_from_keywords(keywords),
+        "Combo": "Y" if keywords.get("combo") else "N",
+        "Reach_In": "Y" if keywords.get("reach_in") else "N",
         "Options": options,
         "Raw_Text": text[:2000],  # First 2000 chars for debugging
     }
 
-    # Check for combo box
-    if re.search(r"\bcombo\b", text, re.IGNORECASE):
-        result["Combo"] = "Y"
+    return result
 
-    # Check for reach-in
-    if re.search(r"\breach[\s-]*in\b", text, re.IGNORECASE):
-        result["Reach_In"] = "Y"
 
-    return result
+def extract_all(pdf_path):
+    """
+    Extract all quote data from PDF.
+    Returns dict with all fields matching CSV schema.
+    """
+    text = extract_text_from_pdf(pdf_path)
+    return extract_from_text(text, os.path.basename(pdf_path))
+
+
+def extract_cached(pdf_path, cache=None, corpus=None):
+    """
+    Extract a PDF through the result cache and the text corpus.
+    A cache hit returns the stored record without parsing the PDF. On a
+    miss the PDF is parsed, the record is cached and the page texts are
+    added to the corpus for --replay-corpus.
+    """
+    if cache is None and corpus is None:
+        return extract_all(pdf_path)
+    try:
+        pdf_sha = file_sha256(pdf_path)
+    except OSError as e:
+        raise PdfReadError(f"Error reading PDF: {e}") from e
+    filename = os.path.basename(pdf_path)
+
+    record = cache.get(pdf_sha) if cache is not None else None
+    if record is None:
+        pages = extract_pages_from_pdf(pdf_path)
+        record = extract_from_text("".join(pages), filename)
+        if corpus is not None and not corpus.has(pdf_sha):
+            corpus.put(pdf_sha, filename, pages)
+        if cache is not None:
+            cache.put(pdf_sha, record)
+
+    # Same PDF may come back under a new name (re-sends)
+    record["PDF_Filename"] = filename
+    return record
+
+
+def replay_corpus(corpus, raw_text=False, out=None):
+    """
+    Re-run the current extract_* functions over every PDF in the text corpus.
+
+    No PDF is opened: each stored page list is fed straight to the
+    extractors, so a pattern change can be checked across the whole archive.
+    Streams one NDJSON record per stored PDF to `out`.
+
+    Returns:
+        tuple (replayed: int, elapsed_seconds: float)
+    """
+    out = out or sys.stdout
+    started = time.perf_counter()
+    replayed = 0
+    for _, filename, pages in corpus:
+        record = extract_from_text("".join(pages), filename)
+        if not raw_text:
+            record.pop("Raw_Text", None)
+        out.write(json.dumps(record) + "\n")
+        replayed += 1
+    out.flush()
+    return replayed, time.perf_counter() - started
+
+
+# Labeled tag header that opens a quote inside a bundle PDF.
+# The bare CC###### fallback of extract_tag_number also matches references
+# to other quotes, so only the labeled form starts a new quote.
+BUNDLE_HEADER_PATTERN = re.compile(
+    r"(?:Tag|Quote|Ref)[\s#:]*([A-Z]{2}\d{5,7})", re.IGNORECASE
+)
+
+
+def split_bundle(page_texts):
+    """
+    Group a stream of page texts into quotes.
+
+    A page whose header carries a tag different from the current quote's
+    starts a new quote. Pages without a header and repeated headers of the
+    same quote stay with the current quote. Pages before the first header
+    (cover letters) are dropped, unless no page has a header at all, in
+    which case the whole file is one quote. Only one quote's pages are held
+    at a time.
+
+    Yields:
+        tuple (first_page: int, texts: list) per quote, first_page 1-based
+    """
+    texts = []
+    first_page = 1
+    current_tag = None
+    for page_number, page_text in enumerate(page_texts, 1):
+        match = BUNDLE_HEADER_PATTERN.search(page_text)
+        tag = match.group(1).upper() if match else None
+        if tag and tag != current_tag:
+            if current_tag:
+                yield first_page, texts
+            texts = []
+            first_page = page_number
+            current_tag = tag
+        texts.append(page_text)
+    if texts:
+        yield first_page, texts
+
+
+def iter_bundle_records(pdf_path):
+    """
+    Extract every quote in a multi-quote bundle PDF, one record at a time.
+    Each record gets a "Bundle_Pages" key ("first-last", 1-based) naming
+    the pages it came from.
+    """
+    filename = os.path.basename(pdf_path)
+    for first_page, texts in split_bundle(iter_page_texts(pdf_path)):
+        record = extract_from_text("".join(texts), filename)
+        record["Bundle_Pages"] = f"{first_page}-{first_page + len(texts) - 1}"
+        yield record
+
+
+def find_pdfs(pdf_dir, pattern="*.pdf"):
+    """List PDFs under pdf_dir matching a glob pattern (supports **)."""
+    return sorted(glob.glob(os.path.join(pdf_dir, pattern), recursive=True))
+
+
+def _extract_for_batch(pdf_path, cache=None, corpus=None):
+    """
+    Process-pool worker for batch mode.
+    A failure becomes an error record instead of stopping the whole run.
+    """
+    try:
+        return extract_cached(pdf_path, cache, corpus)
+    except Exception as e:
+        return {
+            "PDF_Filename": os.path.basename(pdf_path),
+            "PDF_Path": pdf_path,
+            "Error": str(e),
+        }
+
+
+def _init_worker(pattern_stats):
+    """Process-pool initializer: share the parent's pattern counters."""
+    global PATTERN_STATS
+    PATTERN_STATS = pattern_stats
+
+
+def _extract_in_worker(*args):
+    """
+    Pool task: the batch record plus the pattern counters it recorded,
+    which the parent merges into its own PATTERN_STATS.
+    """
+    return _extract_for_batch(*args), PATTERN_STATS.take_delta()
+
+
+def run_batch(
+    pdf_paths, workers=None, raw_text=False, out=None, cache=None, corpus=None
+):
+    """
+    Extract many PDFs across a process pool.
+
+    Streams one NDJSON record per quote to `out` as each file finishes
+    (completion order, not input order). Files that fail produce a record
+    with an "Error" key.
+
+    Returns:
+        tuple (processed: int, errors: int, elapsed_seconds: float)
+    """
+    out = out or sys.stdout
+    started = time.perf_counter()
+    processed = errors = 0
+
+    def emit(record):
+        nonlocal processed, errors
+        processed += 1
+        if "Error" in record:
+            errors += 1
+        if not raw_text:
+            record.pop("Raw_Text", None)
+        out.write(json.dumps(record) + "\n")
+        out.flush()
+
+    if workers == 1 or len(pdf_paths) <= 1:
+        for pdf_path in pdf_paths:
+            emit(_extract_for_batch(pdf_path, cache, corpus))
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_worker,
+            initargs=(PATTERN_STATS,),
+        ) as pool:
+            futures = [
+                pool.submit(_extract_in_worker, p, cache, corpus) for p in pdf_paths
+            ]
+            for future in as_completed(futures):
+                record, pattern_counts = future.result()
+                PATTERN_STATS.merge(pattern_counts)
+                emit(record)
+
+    return processed, errors, time.perf_counter() - started
 
 
 def main():
     parser = argparse.ArgumentParser(
         description="Extract data from CCI/LEER quote PDFs"
     )
-    parser.add_argument(
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
         "--pdf-path",
         type=str,
-        required=True,
         help="Path to the CCI/LEER quote PDF file",
     )
+    source.add_argument(
+        "--pdf-dir",
+        type=str,
+        help="Directory of CCI/LEER quote PDFs (batch mode, NDJSON output)",
+    )
+    source.add_argument(
+        "--bundle",
+        type=str,
+        help="Multi-quote bundle PDF, split into one NDJSON record per quote",
+    )
+    source.add_argument(
+        "--replay-corpus",
+        action="store_true",
+        help="Re-run the current patterns over the stored text corpus (NDJSON output; "
+        "--corpus DIR picks the corpus)",
+    )
+    source.add_argument(
+        "--pattern-report",
+        action="store_true",
+        help="Print hit/miss/time statistics for the fallback patterns and exit",
+    )
+    parser.add_argument(
+        "--glob",
+        type=str,
+        default="*.pdf",
+        help="File pattern inside --pdf-dir, ** allowed (default: *.pdf)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Batch worker processes (default: CPU count)",
+    )
     parser.add_argument(
         "--raw-text",
         action="store_true",
         help="Also output raw extracted text for debugging",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore the extraction cache and re-parse the PDF",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        default=DEFAULT_CACHE_DIR,
+        help=f"Extraction cache directory (default: {DEFAULT_CACHE_DIR})",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=DEFAULT_MAX_BYTES / (1024 * 1024),
+        help="Cache size limit in MB before least recently used entries are evicted",
+    )
+    parser.add_argument(
+        "--corpus",
+        type=str,
+        nargs="?",
+        const=DEFAULT_CORPUS_DIR,
+        default=None,
+        metavar="DIR",
+        help="Add the text of newly parsed PDFs to the text corpus for --replay-corpus "
+        f"(off by default; DIR defaults to {DEFAULT_CORPUS_DIR})",
+    )
+    parser.add_argument(
+        "--pattern-stats",
+        type=str,
+        default=None,
+        help="Pattern statistics file; giving it records this run's counters there "
+        f"(default: {DEFAULT_PATTERN_STATS})",
+    )
+    parser.add_argument(
+        "--no-pattern-stats",
+        action="store_true",
+        help="Do not add this run's pattern counters to the statistics file, "
+        "even with --adaptive-patterns or --pattern-stats",
+    )
+    parser.add_argument(
+        "--adaptive-patterns",
+        action="store_true",
+        help="Try interchangeable patterns in order of observed hit rate "
+        "(broad fallbacks always stay last) and record this run's counters",
+    )
 
     args = parser.parse_args()
 
-    result = extract_all(args.pdf_path)
+    PATTERN_STATS.path = args.pattern_stats or DEFAULT_PATTERN_STATS
+    PATTERN_STATS.adaptive = args.adaptive_patterns
+    PATTERN_STATS.load()
+    if args.pattern_report:
+        print_report(PATTERN_STATS.report())
+        return
+    # Counters are only written when someone uses them: adaptive ordering
+    # reads them back, and an explicit --pattern-stats asks for them
+    record_stats = args.adaptive_patterns or args.pattern_stats is not None
+    if record_stats and not args.no_pattern_stats:
+        atexit.register(PATTERN_STATS.save)
+
+    cache = None
+    if not args.no_cache:
+        # Adaptive-order results may differ from the default ones, so keep them apart
+        cache = ExtractCache(
+            args.cache_dir,
+            f"{EXTRACTOR_VERSION}-adaptive" if args.adaptive_patterns else EXTRACTOR_VERSION,
+            max_bytes=int(args.cache_max_mb * 1024 * 1024),
+        )
+
+    # The corpus keeps the full text of every PDF, so it is only written on request
+    corpus = TextCorpus(args.corpus) if args.corpus else None
+
+    if args.replay_corpus:
+        replayed, elapsed = replay_corpus(
+            TextCorpus(args.corpus or DEFAULT_CORPUS_DIR), raw_text=args.raw_text
+        )
+        print(
+            f"\nReplay complete: {replayed} stored PDF(s) in {elapsed:.2f}s",
+            file=sys.stderr,
+        )
+        return
+
+    if args.bundle:
+        quotes = 0
+        try:
+            for record in iter_bundle_records(args.bundle):
+                if not args.raw_text:
+                    record.pop("Raw_Text", None)
+                print(json.dumps(record), flush=True)
+                quotes += 1
+        except PdfReadError as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+        print(f"\nBundle complete: {quotes} quote(s)", file=sys.stderr)
+        return
+
+    if args.pdf_dir:
+        pdf_paths = find_pdfs(args.pdf_dir, args.glob)
+        if not pdf_paths:
+            print(
+                f"Error: No files matching {args.glob} in {args.pdf_dir}",
+                file=sys.stderr,
+            )
+            sys.exit(1)
+        processed, errors, elapsed = run_batch(
+            pdf_paths,
+            workers=args.workers,
+            raw_text=args.raw_text,
+            cache=cache,
+            corpus=corpus,
+        )
+        rate = processed / elapsed if elapsed else 0.0
+        print(
+            f"\nBatch complete: {processed} PDF(s), {errors} error(s) "
+            f"in {elapsed:.2f}s ({rate:.1f} PDFs/sec)",
+            file=sys.stderr,
+        )
+        return
+
+    try:
+        result = extract_cached(args.pdf_path, cache, corpus)
+    except PdfReadError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
 
     if not args.raw_text:
         result.pop("Raw_Text", None)
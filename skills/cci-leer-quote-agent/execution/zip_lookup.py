@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+ZIP Prefix to State Lookup
+
+Offline table of USPS 3-digit ZIP prefixes (ZIP3) to state codes, used to
+fill State from Ship To Zip (CCI quotes print the ZIP but no state).
+
+The table lives in references/zip3_states.csv and is loaded once per process
+into a 1000-entry list indexed by the prefix, so each lookup is a single
+list index. Military (AA/AE/AP) and territory (PR, VI, GU) prefixes map to
+their USPS codes; unassigned prefixes map to None.
+"""
+
+import csv
+import os
+import sys
+
+DEFAULT_TABLE_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "references", "zip3_states.csv"
+)
+
+_table = None
+
+
+def load_table(path=DEFAULT_TABLE_PATH):
+    """Read the ZIP3 table into a 1000-entry list (index = prefix)."""
+    table = [None] * 1000
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            table[int(row["zip3"])] = row["state"]
+    return table
+
+
+def _get_table():
+    global _table
+    if _table is None:
+        try:
+            _table = load_table()
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Warning: ZIP3 state table unavailable ({e})", file=sys.stderr)
+            _table = [None] * 1000
+    return _table
+
+
+def state_for_zip(zip_code):
+    """
+    State code for a ZIP or ZIP+4 string, or None if it can't be resolved.
+    Accepts ZIPs that lost their leading zeros in a spreadsheet ("7030" -> 07030).
+    """
+    if not zip_code:
+        return None
+    digits = str(zip_code).strip().split("-")[0]
+    if not digits.isdigit() or not 3 <= len(digits) <= 5:
+        return None
+    return _get_table()[int(digits.zfill(5)[:3])]
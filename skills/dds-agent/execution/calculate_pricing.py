@@ -2,9 +2,27 @@
 """
 DDS Door Pricing Calculator
 Applies 1.25x markup and rounds to nearest $50 for customer quotes
+
+Base costs come either from --base-cost (looked up by hand) or from
+--model/--height/--type/--options, resolved through the compiled
+references/pricing.md index (see price_index.py). The model path also
+applies the 10% small-order upcharge (1-2 pieces) before markup.
 """
 
 import argparse
+import json
+import sys
+
+from price_index import PriceIndex, PriceLookupError
+
+# Height tier used when --height is not given (skill default: 79")
+DEFAULT_HEIGHT = 79
+
+# 10% upcharge when the whole DDS order is 1-2 pieces (references/pricing.md)
+SMALL_ORDER_MAX_PIECES = 2
+SMALL_ORDER_UPCHARGE = 0.10
+
+_price_index = None
 
 
 def round_to_nearest_50(amount):
@@ -12,7 +30,73 @@ def round_to_nearest_50(amount):
     return round(amount / 50) * 50
 
 
-def calculate_door_pricing(base_door_cost, quantity, base_freight_cost):
+def get_price_index():
+    """Shared PriceIndex, reloaded only when pricing.md changes"""
+    global _price_index
+    if _price_index is None:
+        _price_index = PriceIndex()
+    return _price_index.load()
+
+
+def small_order_upcharge_rate(total_pieces):
+    """Upcharge rate for an order of total_pieces DDS items (10% for 1-2, else 0)"""
+    return SMALL_ORDER_UPCHARGE if 1 <= total_pieces <= SMALL_ORDER_MAX_PIECES else 0.0
+
+
+def resolve_door_cost(model, height, door_type, quantity, options=(), with_lights=False):
+    """
+    Resolve base door and option costs from the compiled pricing index
+
+    Args:
+        model: "1200E", "1300E", "1300CP" (or full model, e.g. "1200E LT")
+        height: Door height in inches (None = 79" tier, or the model's only height)
+        door_type: "cooler" or "freezer"
+        quantity: Number of doors
+        options: Option codes; "code" applies once per door, "code:N" N times in total
+        with_lights: Price 1300E pass-thru doors with DDS lights
+
+    Returns:
+        dict with the resolved door entry, unit cost and itemized options
+
+    Raises:
+        PriceLookupError: Unknown model, height tier or option code
+    """
+    index = get_price_index()
+    door = index.door(model, height, door_type, default_height=DEFAULT_HEIGHT)
+    unit_cost = door['price']
+    if with_lights:
+        if door.get('price_with_lights') is None:
+            raise PriceLookupError(f"{door['model']} has no with-lights price")
+        unit_cost = door['price_with_lights']
+
+    itemized = []
+    for spec in options:
+        code, _, count = spec.strip().partition(':')
+        try:
+            count = int(count) if count else quantity
+        except ValueError:
+            raise PriceLookupError(f"Invalid option count in '{spec}' (use code:N)")
+        code, option = index.option(code)
+        itemized.append({
+            'code': code,
+            'name': option['name'],
+            'price': option['price'],
+            'count': count,
+            'total': option['price'] * count,
+        })
+
+    return {
+        'model': door['model'],
+        'height': door['height'],
+        'type': door['type'],
+        'unit_cost': unit_cost,
+        'options': itemized,
+        'options_cost': sum(o['total'] for o in itemized),
+    }
+
+
+def calculate_door_pricing(base_door_cost, quantity, base_freight_cost,
+                           options_cost=0.0, upcharge_rate=0.0):
     """
     Calculate DDS door pricing with markup and rounding
 
@@ -20,15 +104,18 @@ def calculate_door_pricing(base_door_cost, quantity, base_freight_cost):
         base_door_cost: Base cost per door/window before markup
         quantity: Total number of doors/windows
         base_freight_cost: Base freight cost (exact or estimated)
+        options_cost: Total option/upcharge adders for the order
+        upcharge_rate: Small-order upcharge applied to the door cost before markup
 
     Returns:
         dict with itemized pricing
     """
     # Calculate base totals
-    total_door_cost_base = base_door_cost * quantity
+    total_door_cost_base = base_door_cost * quantity + options_cost
+    upcharge = total_door_cost_base * upcharge_rate
 
     # Apply 1.25x markup
-    door_cost_with_markup = total_door_cost_base * 1.25
+    door_cost_with_markup = (total_door_cost_base + upcharge) * 1.25
     freight_with_markup = base_freight_cost * 1.25
 
     # Round to nearest $50
@@ -41,7 +128,9 @@ def calculate_door_pricing(base_door_cost, quantity, base_freight_cost):
     return {
         'base_door_cost': base_door_cost,
         'quantity': quantity,
+        'options_cost': options_cost,
         'total_door_cost_base': total_door_cost_base,
+        'upcharge': upcharge,
         'door_cost_with_markup': door_cost_with_markup,
         'door_cost_rounded': door_cost_rounded,
         'base_freight_cost': base_freight_cost,
@@ -64,6 +153,8 @@ def print_quote(pricing):
 
     print(f"\nVENDOR COST:")
     print(f"  Doors:    {format_currency(pricing['total_door_cost_base'])}")
+    if pricing.get('upcharge'):
+        print(f"  Upcharge: {format_currency(pricing['upcharge'])} (1-2 piece order, 10%)")
     print(f"  Freight:  {format_currency(pricing['base_freight_cost'])}")
 
     print(f"\nCUSTOMER PRICE (1.25x):")
@@ -75,9 +166,15 @@ def print_quote(pricing):
 
     # Calculation details
     print("\nCalculation Details:")
+    if pricing.get('model'):
+        print(f"  Model: {pricing['model']} {pricing['height']}\" {pricing['type']}")
     print(f"  Vendor Cost per Unit: {format_currency(pricing['base_door_cost'])}")
     print(f"  Quantity: {pricing['quantity']}")
+    for opt in pricing.get('options', []):
+        print(f"  Option {opt['name']} x{opt['count']}: {format_currency(opt['total'])}")
     print(f"  Door Vendor Cost: {format_currency(pricing['total_door_cost_base'])}")
+    if pricing.get('upcharge'):
+        print(f"  Small-Order Upcharge (10%): {format_currency(pricing['upcharge'])}")
     print(f"  Door x1.25: {format_currency(pricing['door_cost_with_markup'])}")
     print(f"  Door Rounded ($50): {format_currency(pricing['door_cost_rounded'])}")
     print(f"  Freight Vendor Cost: {format_currency(pricing['base_freight_cost'])}")
@@ -88,8 +185,23 @@ def print_quote(pricing):
 
 def main():
     parser = argparse.ArgumentParser(description='Calculate DDS door pricing with markup')
-    parser.add_argument('--base-cost', type=float, required=True,
-                        help='Base cost per door/window before markup')
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--base-cost', type=float,
+                        help='Base cost per door/window before markup (looked up by hand)')
+    source.add_argument('--model',
+                        help='Door model from references/pricing.md: 1200E, 1300E or 1300CP')
+    parser.add_argument('--height', type=int,
+                        help=f'Door height tier in inches (default: {DEFAULT_HEIGHT}, with --model)')
+    parser.add_argument('--type', choices=['cooler', 'freezer'], default='cooler',
+                        help='Door type: cooler (HH) or freezer (LT) (default: cooler)')
+    parser.add_argument('--options', default='',
+                        help='Comma-separated option codes (see price_index.py); '
+                             '"code" = once per door, "code:N" = N in total')
+    parser.add_argument('--with-lights', action='store_true',
+                        help='Price 1300E pass-thru doors with DDS lights (default: no lights)')
+    parser.add_argument('--total-pieces', type=int,
+                        help='All DDS pieces on the order (doors + windows + pass-thru), '
+                             'for the 1-2 piece upcharge (default: --quantity)')
     parser.add_argument('--quantity', type=int, required=True,
                         help='Total number of doors/windows')
     parser.add_argument('--freight', type=float, required=True,
@@ -99,10 +211,26 @@ def main():
 
     args = parser.parse_args()
 
-    pricing = calculate_door_pricing(args.base_cost, args.quantity, args.freight)
+    if args.base_cost is not None:
+        pricing = calculate_door_pricing(args.base_cost, args.quantity, args.freight)
+    else:
+        options = [o for o in args.options.split(',') if o.strip()]
+        try:
+            resolved = resolve_door_cost(args.model, args.height, args.type, args.quantity,
+                                         options, args.with_lights)
+        except PriceLookupError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        except OSError as e:
+            print(f"Error: Cannot read pricing reference: {e}", file=sys.stderr)
+            sys.exit(1)
+        total_pieces = args.total_pieces if args.total_pieces is not None else args.quantity
+        pricing = calculate_door_pricing(resolved['unit_cost'], args.quantity, args.freight,
+                                         resolved['options_cost'],
+                                         small_order_upcharge_rate(total_pieces))
+        pricing.update({k: resolved[k] for k in ('model', 'height', 'type', 'options')})
 
     if args.json:
-        import json
         print(json.dumps(pricing, indent=2))
     else:
         print_quote(pricing)
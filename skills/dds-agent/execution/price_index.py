@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+DDS Price Index
+Compiles the markdown tables in references/pricing.md into a lookup index:
+door base costs by model and height (1200E HH/LT height tiers, 1300E
+pass-thru with and without lights, 1300CP center pull) and option prices
+by code. The compiled index is cached as JSON and rebuilt whenever
+pricing.md changes (size or mtime), so edits to the reference take effect
+on the next lookup and nothing is transcribed by hand.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+
+DEFAULT_PRICING_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "references", "pricing.md"
+)
+DEFAULT_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".dds_price_index.json")
+
+# Bump when the index layout or the table parsing changes
+INDEX_VERSION = 2
+
+# Door type -> model suffix ("cooler" doors are HH, "freezer" doors are LT)
+TYPE_SUFFIXES = {"cooler": "HH", "freezer": "LT", "hh": "HH", "lt": "LT"}
+
+
+class PriceLookupError(ValueError):
+    """Raised when a model/height/option is not in the price index."""
+
+
+def parse_money(cell):
+    """Parse a table price cell ("$1,001.08", "**$1,324.74**", "-$16.80"). Returns float or None."""
+    text = cell.replace("*", "").replace("$", "").replace(",", "").strip()
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def option_code(name):
+    """Option code from its table name ("Cylinder locks per opening" -> "cylinder-locks-per-opening")."""
+    return re.sub(r"[^0-9a-z]+", "-", name.lower()).strip("-")
+
+
+def door_key(model, height):
+    """Index key for a door model and height ("1200E HH", 79 -> "1200E HH|79")."""
+    return f"{model}|{height}"
+
+
+def iter_tables(text):
+    """
+    Yield (heading, headers, rows) for each markdown table in `text`.
+    heading is the nearest preceding ## / ### heading.
+    """
+    heading = ""
+    table = None
+    for line in text.splitlines() + [""]:
+        stripped = line.strip()
+        if stripped.startswith("|"):
+            cells = [c.strip() for c in stripped.strip("|").split("|")]
+            if table is None:
+                table = [cells]
+            elif not all(re.fullmatch(r":?-+:?", c) for c in cells):
+                table.append(cells)
+            continue
+        if table is not None:
+            yield heading, table[0], table[1:]
+            table = None
+        if stripped.startswith("#"):
+            heading = stripped.lstrip("#").strip()
+
+
+def _cell(row, column):
+    """Table cell by column index ("" for a short row)."""
+    return row[column] if column < len(row) else ""
+
+
+def _heading_height(heading):
+    match = re.search(r'(\d+)"H', heading)
+    return int(match.group(1)) if match else None
+
+
+def compile_index(text):
+    """
+    Build the price index from pricing.md text.
+
+    Rows without a usable height or price (blank cell, "TBD", short row)
+    are left out of the lookups and listed under "skipped", so a bad edit to
+    pricing.md cannot price a door at None.
+
+    Returns:
+        dict with "doors" (door_key -> {model, height, type, price, ...}),
+        "options" (code -> {name, price, group}) and "skipped"
+        (list of {table, row, reason})
+    """
+    doors = {}
+    options = {}
+    skipped = []
+
+    def skip(heading, row, reason):
+        skipped.append({"table": heading, "row": " | ".join(row), "reason": reason})
+
+    for heading, headers, rows in iter_tables(text):
+        columns = {h.lower(): i for i, h in enumerate(headers)}
+
+        if "height" in columns and "model" in columns and "type" in columns:
+            # 1200E height tiers
+            price_col = next(i for h, i in columns.items() if h.endswith("price"))
+            for row in rows:
+                digits = re.sub(r"\D", "", _cell(row, columns["height"]))
+                if not digits:
+                    skip(heading, row, "no height")
+                    continue
+                entry = {
+                    "model": _cell(row, columns["model"]),
+                    "height": int(digits),
+                    "type": _cell(row, columns["type"]),
+                    "price": parse_money(_cell(row, price_col)),
+                }
+                if entry["price"] is None:
+                    skip(heading, row, "no price")
+                    continue
+                doors[door_key(entry["model"], entry["height"])] = entry
+
+        elif "model" in columns and "type" in columns:
+            # 1300E single entry (with/without lights) and 1300CP center pull
+            height = _heading_height(heading)
+            for row in rows:
+                entry = {
+                    "model": _cell(row, columns["model"]),
+                    "height": height,
+                    "type": _cell(row, columns["type"]),
+                }
+                if "no lights (default)" in columns:
+                    entry["price"] = parse_money(_cell(row, columns["no lights (default)"]))
+                    entry["price_with_lights"] = parse_money(_cell(row, columns["with lights"]))
+                else:
+                    entry["price"] = parse_money(_cell(row, columns["price"]))
+                if height is None:
+                    skip(heading, row, "no height in the table heading")
+                elif entry["price"] is None:
+                    skip(heading, row, "no price")
+                else:
+                    doors[door_key(entry["model"], height)] = entry
+
+        elif list(columns) == ["option", "price"]:
+            for row in rows:
+                price = parse_money(_cell(row, 1))
+                if price is None:
+                    skip(heading, row, "no price")
+                    continue
+                options[option_code(row[0])] = {
+                    "name": row[0],
+                    "price": price,
+                    "group": heading,
+                }
+    return {"doors": doors, "options": options, "skipped": skipped}
+
+
+class PriceIndex:
+    """
+    Compiled pricing.md lookups, cached on disk.
+
+    Args:
+        pricing_path: Path to references/pricing.md
+        cache_path: Where the compiled index is cached
+    """
+
+    def __init__(self, pricing_path=DEFAULT_PRICING_PATH, cache_path=DEFAULT_CACHE_PATH):
+        self.pricing_path = os.path.abspath(pricing_path)
+        self.cache_path = cache_path
+        self.doors = {}
+        self.options = {}
+        self.skipped = []
+        self._state = None
+
+    def _source_state(self):
+        st = os.stat(self.pricing_path)
+        return {
+            "version": INDEX_VERSION,
+            "source": self.pricing_path,
+            "size": st.st_size,
+            "mtime_ns": st.st_mtime_ns,
+        }
+
+    def load(self):
+        """
+        Load the cached index, compiling pricing.md if the cache is missing
+        or older than the file. Returns self.
+        """
+        state = self._source_state()
+        if state == self._state:
+            return self
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+        except (OSError, ValueError):
+            cached = {}
+        if cached.get("state") == state:
+            index = cached["index"]
+        else:
+            with open(self.pricing_path, "r", encoding="utf-8") as f:
+                index = compile_index(f.read())
+            self._save(state, index)
+        self.doors = index["doors"]
+        self.options = index["options"]
+        self.skipped = index["skipped"]
+        self._state = state
+        return self
+
+    def _save(self, state, index):
+        directory = os.path.dirname(os.path.abspath(self.cache_path))
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        except OSError:
+            return  # Cache is optional; the index was compiled in memory
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"state": state, "index": index}, f, indent=1)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def door(self, model, height=None, door_type=None, default_height=None):
+        """
+        Look up a door's base cost entry.
+
+        Args:
+            model: "1200E", "1300E", "1300CP", or a full model ("1200E LT")
+            height: Door height in inches (optional if the model has one height)
+            door_type: "cooler"/"freezer" (or "HH"/"LT") when model has no suffix
+            default_height: Tier used when height is None and the model has several
+
+        Returns:
+            dict {model, height, type, price, [price_with_lights]}
+
+        Raises:
+            PriceLookupError: No matching entry
+        """
+        model = " ".join(model.upper().split())
+        if " " not in model:
+            suffix = TYPE_SUFFIXES.get((door_type or "cooler").lower())
+            if suffix is None:
+                raise PriceLookupError(f"Unknown door type '{door_type}' (cooler or freezer)")
+            model = f"{model} {suffix}"
+        candidates = [e for e in self.doors.values() if e["model"] == model]
+        if height is None and len(candidates) > 1:
+            height = default_height
+        if height is not None:
+            candidates = [e for e in candidates if e["height"] == int(height)]
+        if len(candidates) == 1:
+            return candidates[0]
+
+        heights = sorted(e["height"] for e in self.doors.values() if e["model"] == model)
+        if not heights:
+            models = sorted({e["model"] for e in self.doors.values()})
+            raise PriceLookupError(f"Unknown model '{model}' (available: {', '.join(models)})")
+        if height is None:
+            raise PriceLookupError(f"{model} needs --height ({', '.join(map(str, heights))})")
+        raise PriceLookupError(
+            f'{model} has no {height}" tier (available: {", ".join(map(str, heights))})'
+        )
+
+    def option(self, code):
+        """
+        Look up an option by code or unique code prefix ("cylinder-locks").
+        Returns (code, {name, price, group}). Raises PriceLookupError.
+        """
+        code = option_code(code)
+        if code in self.options:
+            return code, self.options[code]
+        matches = [c for c in self.options if c.startswith(code)]
+        if len(matches) == 1:
+            return matches[0], self.options[matches[0]]
+        if matches:
+            raise PriceLookupError(f"Option '{code}' is ambiguous: {', '.join(sorted(matches))}")
+        raise PriceLookupError(f"Unknown option '{code}' (run price_index.py to list codes)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile and list the DDS price index")
+    parser.add_argument(
+        "--pricing-path",
+        default=DEFAULT_PRICING_PATH,
+        help="Path to references/pricing.md",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output the compiled index as JSON",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        index = PriceIndex(args.pricing_path).load()
+    except OSError as e:
+        print(f"Error: Cannot read pricing reference: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    for row in index.skipped:
+        print(f"Warning: Skipped pricing.md row ({row['reason']}): {row['table']}: {row['row']}",
+              file=sys.stderr)
+
+    if args.json:
+        print(json.dumps(
+            {"doors": index.doors, "options": index.options, "skipped": index.skipped}, indent=2
+        ))
+        return
+
+    print("DOOR BASE COSTS:")
+    for entry in sorted(index.doors.values(), key=lambda e: (e["model"], e["height"])):
+        lights = ""
+        if entry.get("price_with_lights") is not None:
+            lights = f"  (with lights ${entry['price_with_lights']:,.2f})"
+        print(f'  {entry["model"]:<10} {entry["height"]}"  {entry["type"]:<8} ${entry["price"]:>9,.2f}{lights}')
+    print()
+    print("OPTION CODES:")
+    for code, opt in index.options.items():
+        print(f"  {code:<42} ${opt['price']:>8,.2f}  {opt['group']}")
+
+
+if __name__ == "__main__":
+    main()
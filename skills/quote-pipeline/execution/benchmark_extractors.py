@@ -0,0 +1,694 @@
+#!/usr/bin/env python3
+"""
+Extractor Benchmark & Accuracy Harness
+
+Generates a synthetic corpus of AmeriKooler and CCI/LEER quotes with known
+ground truth, runs each vendor's extract_quote_data.py over it, and reports:
+
+  - per-field latency (microseconds per document, best of --rounds)
+  - per-document throughput (docs/sec), on page text and on real PDFs
+  - field-level accuracy against the ground truth
+
+Results can be saved as a baseline (references/extractor_baseline.json) and
+later runs are compared against it, so a pattern change logged in a vendor's
+UPDATES.md can be checked for both speed and correctness. Any accuracy drop
+is a regression (exit code 1); slowdowns past --tolerance are reported and
+only fail the run with --fail-on-slowdown.
+
+The corpus is deterministic for a given --seed/--count/--pad-lines. PDFs are
+written with a minimal built-in PDF writer (no extra dependencies) into a
+temporary directory and parsed with pypdf like real quotes.
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from skill_loader import SKILLS_DIR, load_skill_module
+
+DEFAULT_BASELINE = os.path.join(
+    SKILLS_DIR, "quote-pipeline", "references", "extractor_baseline.json"
+)
+
+# Per-field timings below this difference are treated as timer noise
+MIN_SLOWDOWN_US = 10.0
+
+VENDOR_SKILLS = {
+    "AK": "ak-agent",
+    "CCI": "cci-leer-quote-agent",
+}
+
+STATES = [
+    ("AL", "36067"),
+    ("GA", "30339"),
+    ("MS", "39740"),
+    ("TX", "75001"),
+    ("FL", "32801"),
+    ("TN", "37201"),
+    ("NC", "27601"),
+    ("LA", "70112"),
+]
+
+CITIES = ["Columbus", "Prattville", "Atlanta", "Dallas", "Orlando", "Nashville"]
+
+PROJECT_NAMES = [
+    "Big Star AB172969",
+    "Main Street Market",
+    "Riverside Grill",
+    "County Schools Kitchen",
+    "Harbor Seafood",
+    "Sunrise Bakery",
+]
+
+AK_FLOORS = [
+    "NSF vinyl screed",
+    "Aluminum treadplate",
+    "Galvanized steel",
+]
+
+AK_ACCESSORIES = [
+    "Rain roof membrane sq ft",
+    "DRAIN HOOD for evaporator",
+    "Vent port heated",
+    "Strip curtain on entry",
+    "Kick plate on entry",
+    "Ramp aluminum",
+]
+
+CCI_FLOORS = [
+    ".050 Smooth Aluminium 4 5/8\" STD Floor",
+    "Galvanized 4\" Floor with 1/8\" treadplate",
+]
+
+CCI_OPTIONS = [
+    "Strip curtain",
+    "Vent port",
+    "Thermometer digital",
+    "Kick plate",
+    "Aluminum ramp",
+]
+
+# Neutral spec lines used to pad quotes to realistic lengths. They carry no
+# vendor keywords, headings, prices or dates.
+FILLER_LINES = [
+    "Panel {n} urethane foamed in place insulation, stucco embossed aluminum skin",
+    "Cam lock joints on {n} inch centers with continuous gasket",
+    "Interior and exterior trim, white painted galvanized steel, {n} pieces",
+    "Seams sealed with NSF silicone, {n} tubes supplied",
+    "Hardware kit {n}: anchors, screws and sealant",
+]
+
+
+def _money(value):
+    return f"{value:,.2f}"
+
+
+def _feet_inches(rng):
+    feet = rng.randint(6, 24)
+    inches = rng.choice([0, 0, 4, 6, 8])
+    return feet, inches, f"{feet}'-{inches}\""
+
+
+def _date(rng):
+    start = datetime(2025, 1, 1)
+    return start + timedelta(days=rng.randint(0, 600))
+
+
+def _filler(rng, count):
+    return [rng.choice(FILLER_LINES).format(n=rng.randint(2, 99)) for _ in range(count)]
+
+
+def make_ak_quote(rng, pad_lines=0):
+    """
+    Build one synthetic AK quote.
+
+    Returns:
+        tuple (pages: list of line lists, truth: dict of expected output values)
+    """
+    quote_number = f"{rng.randint(24, 27)}-{rng.randint(0, 99999):05d}"
+    quote_date = _date(rng)
+    box_type = rng.choice(["Cooler", "Freezer"])
+    location = rng.choice(["Indoor", "Outdoor"])
+    project = rng.choice(PROJECT_NAMES)
+    combo = rng.random() < 0.1
+
+    w_ft, w_in, width = _feet_inches(rng)
+    d_ft, d_in, depth = _feet_inches(rng)
+    _, _, height = rng.choice([(7, 6, "7'-6\""), (8, 6, "8'-6\""), (9, 0, "9'-0\"")])
+    shape = "Square" if (w_ft, w_in) == (d_ft, d_in) else "Rectangular"
+    overall = f"{width} x {depth} x {height} ({shape})"
+    interior = f"{w_ft - 1}'-4\" x {d_ft - 1}'-4\" x 6'-10\""
+
+    floorless = rng.random() < 0.25
+    floor = "Floorless" if floorless else rng.choice(AK_FLOORS)
+    floor_note = "Floorless" if floorless else "with floor"
+    description = f"{location} {box_type}{' Combo' if combo else ''}, {floor_note}"
+
+    door_qty = rng.randint(1, 3)
+    door_w = rng.choice([30, 34, 36, 42])
+    hinge = rng.choice(["Left", "Right"])
+    door = f"({door_qty}) Standard {door_w}\" x 76\" {hinge} hinged flush door"
+    lead_time = f"{rng.randint(2, 8)} weeks"
+    revision = str(rng.randint(1, 4)) if rng.random() < 0.5 else None
+
+    page1 = [
+        "AmeriKooler Quote",
+        f"Quote #: {quote_number}",
+        f"Date: {quote_date:%m/%d/%Y}",
+        "Buyer: Bush Refrigeration",
+        f"Project Name: {project}",
+        f"Actual Overall Dimension: {overall}",
+        f"Description: {description}",
+        f"Interior Dim: {interior}",
+        f"Temperature: {'35F' if box_type == 'Cooler' else '-10F'}",
+    ]
+    if not floorless:
+        page1.append(f"Floor: {floor}")
+    page1 += [f"Door: {door}", f"Lead Time: {lead_time}"]
+    if revision:
+        page1.append(f"Revision: {revision}")
+
+    state, zip_code = rng.choice(STATES)
+    destination = f"{state}-{zip_code}"
+    price = rng.randint(4000, 60000) + rng.choice([0.0, 0.5])
+    accessories = [
+        f"({rng.randint(1, 150)}) {name}"
+        for name in rng.sample(AK_ACCESSORIES, rng.randint(0, 4))
+    ]
+    glass_doors = rng.random() < 0.3
+
+    page2 = ["Equipment: Refrigeration Supplied By Others", "Accessories:"]
+    page2 += accessories
+    page2 += [
+        f"Freight: Delivered to {destination}",
+        f"Price: ${_money(price)} Net",
+    ]
+    if glass_doors:
+        page2.append("Glass Doors By Others")
+    page2 += _filler(rng, pad_lines)
+
+    page3 = ["Top view", "Panel layout"]
+    net_opening = None
+    cutouts = []
+    if glass_doors:
+        opening_w = f"{rng.randint(60, 180)}.125"
+        opening_h = str(rng.choice([75, 79, 80]))
+        net_opening = {
+            "width": opening_w,
+            "height": opening_h,
+            "description": f'{opening_w}" x {opening_h}"',
+        }
+        page3.append(f'Net Opening {opening_w}" x {opening_h}"')
+        qty = rng.randint(2, 8)
+        cutouts.append(
+            {
+                "quantity": qty,
+                "width": "30",
+                "height": "79",
+                "description": f"({qty}) 30x79 display doors",
+            }
+        )
+        page3.append(f"({qty}) 30x79 display doors")
+    pass_thru = rng.randint(0, 2)
+    page3 += ["pass thru"] * pass_thru
+
+    truth = {
+        "Quote_Number": quote_number,
+        "Quote_Date": f"{quote_date:%m/%d/%Y}",
+        "Good_Thru": f"{quote_date + timedelta(days=30):%m/%d/%Y}",
+        "Customer_Job": project,
+        "Revision": revision,
+        "Lead_Time": lead_time,
+        "Overall_Dimensions": overall,
+        "Interior_Dimensions": interior,
+        "Description": description,
+        "Type": box_type,
+        "Location": location,
+        "Floors": floor,
+        "Doors": door,
+        "Door_Count": door_qty,
+        "Net_Price": f"{price:.2f}",
+        "Freight_Destination": destination,
+        "Ship_To_Zip": zip_code,
+        "State": state,
+        "Display_Doors_By_Others": glass_doors,
+        "Net_Opening": net_opening,
+        "Door_Cutouts": cutouts,
+        "Accessories": "; ".join(accessories) if accessories else "None",
+        "Shape": shape,
+        "Pass_Thru_Doors": str(pass_thru),
+        "Combo": "Y" if combo else "N",
+    }
+    return [page1, page2, page3], truth
+
+
+def make_cci_quote(rng, pad_lines=0):
+    """
+    Build one synthetic CCI/LEER quote.
+
+    Returns:
+        tuple (pages: list of line lists, truth: dict of expected output values)
+    """
+    tag = f"CC{rng.randint(100000, 999999)}"
+    quote_date = _date(rng)
+    good_thru = quote_date + timedelta(days=30)
+    box_type = rng.choice(["Cooler", "Freezer"])
+    location = rng.choice(["Indoor", "Outdoor"])
+    width = rng.randint(6, 24)
+    depth = rng.choice([width, rng.randint(6, 24)])
+    height = rng.choice([7, 8, 9])
+    temp = "35 F" if box_type == "Cooler" else "-10 F"
+    state, zip_code = rng.choice(STATES)
+    city = rng.choice(CITIES)
+    floor = rng.choice(CCI_FLOORS)
+    combo = rng.random() < 0.1
+    reach_in = rng.random() < 0.1
+
+    doors = []
+    door_lines = []
+    pass_thru = 0
+    for number in range(1, rng.randint(1, 3) + 1):
+        door_w = rng.choice([30, 34, 36])
+        if rng.random() < 0.15:
+            mount = "Pass-Thru"
+            pass_thru += 1
+        else:
+            mount = "Overlap Mount"
+        doors.append(f"(HD{number}) {door_w}\" x 76 1/4\" {mount}")
+        door_lines.append(f"(HD{number}) {door_w}\" x 76 1/4\" {mount}, {rng.choice(['LH', 'RH'])}")
+
+    display_doors = []
+    display_lines = []
+    if rng.random() < 0.3:
+        qty = rng.randint(2, 8)
+        display_doors.append(
+            {"callout": "GD1", "quantity": qty, "size": '30"x79"', "model": "DDS 1200"}
+        )
+        display_lines.append(f'(GD1) ({qty}) 30"x79" DDS 1200')
+
+    sq_ft = str(rng.randint(200, 1500))
+    weight = rng.randint(1500, 9000)
+
+    page1 = [
+        "Carroll Coolers / LEER",
+        f"Tag #: {tag}",
+        f"Quote Date: {quote_date:%m/%d/%Y}",
+        f"Good Thru: {good_thru:%m/%d/%Y}",
+        f"Ship To: {city} {state} {zip_code}",
+        f"{width}' x {depth}' x {height}' {location} {box_type} ({temp})",
+        f"Floor: {floor}",
+    ]
+    page1 += door_lines + display_lines
+    if combo:
+        page1.append("Combo box with shared partition wall")
+    if reach_in:
+        page1.append("Reach-In section on front wall")
+    page1 += [f"Approx Sq Ft: {sq_ft}", f"Est. Box Weight: {weight:,} lbs"]
+
+    walk_in = rng.randint(4000, 60000) + rng.choice([0.0, 0.5])
+    freight = rng.randint(500, 4000) + 0.0
+    options = [
+        {"name": name, "price": f"{rng.randint(50, 900)}.00"}
+        for name in rng.sample(CCI_OPTIONS, rng.randint(0, 3))
+    ]
+    page2 = [
+        f"Walk-In Price: ${_money(walk_in)}",
+        f"Freight Estimate: ${_money(freight)}",
+        f"Subtotal: ${_money(walk_in + freight)}",
+    ]
+    page2 += [f"Option: {o['name']} ${o['price']}" for o in options]
+    page2.append("LT evaporator" if box_type == "Freezer" else "HH evaporator")
+    page2 += _filler(rng, pad_lines)
+
+    truth = {
+        "Tag_Number": tag,
+        "Ship_To_Zip": zip_code,
+        "State": state,
+        "Width": str(width),
+        "Depth": str(depth),
+        "Height": str(height),
+        "Shape": "Square" if width == depth else "Rectangular",
+        "Floors": floor,
+        "Doors": "; ".join(doors),
+        "Door_Count": len(doors),
+        "Walk_In_Price": f"{walk_in:.2f}",
+        "Freight_Estimate": f"{freight:.2f}",
+        "Subtotal": f"{walk_in + freight:.2f}",
+        "Approx_Sq_Ft": sq_ft,
+        "Est_Box_Weight": str(weight),
+        "Quote_Date": f"{quote_date:%m/%d/%Y}",
+        "Good_Thru": f"{good_thru:%m/%d/%Y}",
+        "Type": box_type,
+        "Location": location,
+        "Display_Doors_Detail": display_doors,
+        "Pass_Thru_Doors": str(pass_thru),
+        "Combo": "Y" if combo else "N",
+        "Reach_In": "Y" if reach_in else "N",
+        "Options": options,
+    }
+    return [page1, page2], truth
+
+
+QUOTE_MAKERS = {
+    "AK": make_ak_quote,
+    "CCI": make_cci_quote,
+}
+
+
+def make_corpus(vendor, count, seed, pad_lines=0):
+    """Deterministic list of (pages, truth) quotes for a vendor."""
+    rng = random.Random(f"{vendor}-{seed}")
+    return [QUOTE_MAKERS[vendor](rng, pad_lines) for _ in range(count)]
+
+
+def page_texts(pages):
+    """Page texts as the extractors see them (one line per text line)."""
+    return ["\n".join(lines) + "\n" for lines in pages]
+
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_pdf(pages, path):
+    """
+    Write a minimal text-only PDF, one Helvetica text line per entry.
+    WinAnsiEncoding keeps ' and " as plain ASCII quotes when pypdf reads
+    the text back.
+    """
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # Page tree, filled in once page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+        b"/Encoding /WinAnsiEncoding >>",
+    ]
+    kids = []
+    for lines in pages:
+        ops = ["BT", "/F1 10 Tf", "14 TL", "40 760 Td"]
+        ops += [f"({_pdf_escape(line)}) Tj T*" for line in lines]
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1")
+        page_number = len(objects) + 1
+        kids.append(f"{page_number} 0 R")
+        objects.append(
+            (
+                "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+                "/Resources << /Font << /F1 3 0 R >> >> "
+                f"/Contents {page_number + 1} 0 R >>"
+            ).encode("latin-1")
+        )
+        objects.append(
+            b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream"
+        )
+    objects[1] = (
+        f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>"
+    ).encode("latin-1")
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode("latin-1") + body + b"\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode("latin-1")
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode("latin-1")
+    with open(path, "wb") as f:
+        f.write(out)
+
+
+def _extract_text(module, vendor, texts, filename):
+    if vendor == "AK":
+        return module.extract_from_pages(module.TextPages(texts), filename)
+    return module.extract_from_text("".join(texts), filename)
+
+
+def _field_timers(module, vendor):
+    """
+    (field name, callable(texts)) pairs timing each field extractor alone.
+    AK fields run through a fresh QuoteContext, so page routing and section
+    slicing are included; CCI fields call the extract_* function directly.
+    """
+    if vendor == "AK":
+
+        def timer(attr):
+            return lambda texts: getattr(module.QuoteContext(module.TextPages(texts)), attr)
+
+        return [
+            (key, timer(attr)) for key, attr in module.RECORD_FIELDS if key != "Raw_Text"
+        ]
+
+    def joined(func):
+        return lambda texts: func("".join(texts))
+
+    return [
+        ("Tag_Number", joined(module.extract_tag_number)),
+        ("Dimensions", joined(module.extract_dimensions)),
+        ("Type", joined(module.extract_type)),
+        ("Location", joined(module.extract_location)),
+        ("Doors", joined(module.extract_doors)),
+        ("Display_Doors", joined(module.extract_display_doors)),
+        ("Prices", joined(module.extract_prices)),
+        ("Dates", joined(module.extract_dates)),
+        ("Floors", joined(module.extract_floor)),
+        ("Ship_To_Zip", joined(module.extract_ship_to_zip)),
+        ("Approx_Sq_Ft", joined(module.extract_sq_ft)),
+        ("Est_Box_Weight", joined(module.extract_weight)),
+        ("Options", joined(module.extract_options)),
+    ]
+
+
+def _accuracy(records, truths):
+    """Fraction of documents where each ground-truth field matched exactly."""
+    fields = list(truths[0]) if truths else []
+    return {
+        field: round(
+            sum(1 for r, t in zip(records, truths) if r.get(field) == t[field])
+            / len(truths),
+            4,
+        )
+        for field in fields
+    }
+
+
+def benchmark_vendor(vendor, corpus, rounds=3, pdf=True):
+    """
+    Run one vendor's extractors over its corpus.
+
+    Returns:
+        dict with docs_per_sec, field_us and accuracy (text and pdf modes)
+    """
+    module = load_skill_module(VENDOR_SKILLS[vendor], "extract_quote_data")
+    truths = [truth for _, truth in corpus]
+    texts = [page_texts(pages) for pages, _ in corpus]
+
+    # Text-mode throughput: best of several rounds to smooth out noise
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        records = [
+            _extract_text(module, vendor, t, f"synthetic-{i}.pdf")
+            for i, t in enumerate(texts)
+        ]
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    result = {
+        "docs_per_sec": {"text": round(len(texts) / best, 1) if best else 0.0},
+        "field_us": {},
+        "accuracy": {"text": _accuracy(records, truths)},
+    }
+
+    for field, func in _field_timers(module, vendor):
+        best = None
+        for _ in range(rounds):
+            started = time.perf_counter()
+            for t in texts:
+                func(t)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        result["field_us"][field] = round(best / len(texts) * 1e6, 1)
+
+    if pdf:
+        with tempfile.TemporaryDirectory(prefix=f"bench_{vendor.lower()}_") as tmp:
+            paths = []
+            for i, (pages, _) in enumerate(corpus):
+                path = os.path.join(tmp, f"synthetic-{i}.pdf")
+                write_pdf(pages, path)
+                paths.append(path)
+            started = time.perf_counter()
+            records = [module.extract_all(p) for p in paths]
+            elapsed = time.perf_counter() - started
+        result["docs_per_sec"]["pdf"] = round(len(paths) / elapsed, 1) if elapsed else 0.0
+        result["accuracy"]["pdf"] = _accuracy(records, truths)
+
+    return result
+
+
+def compare_to_baseline(results, baseline, tolerance):
+    """
+    Compare a run against a stored baseline.
+
+    Returns:
+        tuple (regressions: list[str], slowdowns: list[str], improvements: list[str])
+    """
+    regressions, slowdowns, improvements = [], [], []
+    for vendor, current in results["vendors"].items():
+        base = baseline.get("vendors", {}).get(vendor)
+        if not base:
+            continue
+        for mode, fields in base.get("accuracy", {}).items():
+            for field, old in fields.items():
+                new = current["accuracy"].get(mode, {}).get(field)
+                if new is None:
+                    continue
+                if new < old:
+                    regressions.append(f"{vendor} {mode} {field}: accuracy {old:.1%} -> {new:.1%}")
+                elif new > old:
+                    improvements.append(f"{vendor} {mode} {field}: accuracy {old:.1%} -> {new:.1%}")
+        for mode, old in base.get("docs_per_sec", {}).items():
+            new = current["docs_per_sec"].get(mode)
+            if new is not None and new < old * (1 - tolerance):
+                slowdowns.append(f"{vendor} {mode}: {old:.1f} -> {new:.1f} docs/sec")
+        for field, old in base.get("field_us", {}).items():
+            new = current["field_us"].get(field)
+            if new is not None and new > old * (1 + tolerance) and new - old > MIN_SLOWDOWN_US:
+                slowdowns.append(f"{vendor} {field}: {old:.1f} -> {new:.1f} us/doc")
+    return regressions, slowdowns, improvements
+
+
+def print_report(results, out=None):
+    out = out or sys.stdout
+    for vendor, result in results["vendors"].items():
+        rates = ", ".join(f"{mode} {rate:.1f}" for mode, rate in result["docs_per_sec"].items())
+        print(f"\n=== {vendor} ({results['count']} docs) ===", file=out)
+        print(f"Throughput (docs/sec): {rates}", file=out)
+        print(f"\n{'Field':<26}{'us/doc':>10}", file=out)
+        for field, micros in sorted(result["field_us"].items(), key=lambda kv: -kv[1]):
+            print(f"{field:<26}{micros:>10.1f}", file=out)
+        modes = list(result["accuracy"])
+        print(f"\n{'Field':<26}" + "".join(f"{m + ' acc':>12}" for m in modes), file=out)
+        for field in result["accuracy"][modes[0]]:
+            row = "".join(f"{result['accuracy'][m].get(field, 0):>12.1%}" for m in modes)
+            print(f"{field:<26}{row}", file=out)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Benchmark AK and CCI extractors on a synthetic quote corpus"
+    )
+    parser.add_argument(
+        "--vendor",
+        type=str,
+        choices=["AK", "CCI", "all"],
+        default="all",
+        help="Vendor extractors to benchmark (default: all)",
+    )
+    parser.add_argument("--count", type=int, default=50, help="Quotes per vendor (default: 50)")
+    parser.add_argument("--seed", type=int, default=1, help="Corpus random seed (default: 1)")
+    parser.add_argument(
+        "--pad-lines",
+        type=int,
+        default=40,
+        help="Neutral spec lines added per quote to mimic long quotes (default: 40)",
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=3, help="Timing rounds per measurement (default: 3)"
+    )
+    parser.add_argument("--no-pdf", action="store_true", help="Skip the PDF (pypdf) pass")
+    parser.add_argument(
+        "--baseline",
+        type=str,
+        default=DEFAULT_BASELINE,
+        help=f"Baseline results file (default: {DEFAULT_BASELINE})",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write this run's results as the new baseline",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.3,
+        help="Allowed slowdown vs baseline before reporting, as a fraction (default: 0.3)",
+    )
+    parser.add_argument(
+        "--fail-on-slowdown",
+        action="store_true",
+        help="Exit 1 on slowdowns as well as accuracy regressions",
+    )
+    parser.add_argument("--json", action="store_true", help="Output results as JSON")
+
+    args = parser.parse_args()
+
+    vendors = ["AK", "CCI"] if args.vendor == "all" else [args.vendor]
+    results = {
+        "generated": datetime.now().strftime("%Y-%m-%d %H:%M"),
+        "count": args.count,
+        "seed": args.seed,
+        "pad_lines": args.pad_lines,
+        "vendors": {},
+    }
+    for vendor in vendors:
+        corpus = make_corpus(vendor, args.count, args.seed, args.pad_lines)
+        results["vendors"][vendor] = benchmark_vendor(
+            vendor, corpus, rounds=args.rounds, pdf=not args.no_pdf
+        )
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_report(results)
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(os.path.abspath(args.baseline)), exist_ok=True)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline saved: {args.baseline}", file=sys.stderr)
+        return
+
+    if not os.path.exists(args.baseline):
+        print("\nNo baseline found. Run with --save-baseline to create one.", file=sys.stderr)
+        return
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f)
+    if (baseline.get("count"), baseline.get("seed"), baseline.get("pad_lines")) != (
+        args.count,
+        args.seed,
+        args.pad_lines,
+    ):
+        print(
+            "\nWARNING: Baseline was generated with different --count/--seed/--pad-lines; "
+            "comparison may not be meaningful.",
+            file=sys.stderr,
+        )
+
+    regressions, slowdowns, improvements = compare_to_baseline(
+        results, baseline, args.tolerance
+    )
+    print(f"\nCompared to baseline from {baseline.get('generated', '?')}:", file=sys.stderr)
+    for line in improvements:
+        print(f"  IMPROVED  {line}", file=sys.stderr)
+    for line in slowdowns:
+        print(f"  SLOWER    {line}", file=sys.stderr)
+    for line in regressions:
+        print(f"  REGRESSED {line}", file=sys.stderr)
+    if not (regressions or slowdowns or improvements):
+        print("  No changes beyond tolerance.", file=sys.stderr)
+
+    if regressions or (args.fail_on_slowdown and slowdowns):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Pricing Service Client
+
+Prices an AK, CCI or DDS quote through the local pricing service
+(pricing_service.py) when it is running, and in-process with the same
+calculator functions when it cannot be reached. Either way the result is
+the calculator's --json output. A service that answers with a server
+error (HTTP 5xx) is reported, not retried in-process.
+
+Only http.client is imported up front; the calculators are loaded on the
+fallback path alone, so a call answered by the service stays cheap.
+"""
+
+import argparse
+import http.client
+import json
+import sys
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Seconds to wait for the service before pricing in-process instead
+DEFAULT_TIMEOUT = 2.0
+
+
+class ServiceUnavailable(Exception):
+    """The pricing service did not answer (not running, or timed out)."""
+
+
+class ServiceError(Exception):
+    """The pricing service answered, but with a server error or an unreadable body."""
+
+
+def request(vendor, params, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=DEFAULT_TIMEOUT):
+    """
+    Price a quote through the running service.
+
+    Raises:
+        ServiceUnavailable: The service did not answer
+        ServiceError: The service failed (status 5xx) or sent an unreadable body
+        PricingError: The service rejected the input (status 400)
+    """
+    conn = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        conn.request(
+            "POST",
+            f"/price/{vendor}",
+            body=json.dumps(params),
+            headers={"Content-Type": "application/json"},
+        )
+        response = conn.getresponse()
+        data = response.read()
+    except (OSError, http.client.HTTPException) as e:
+        raise ServiceUnavailable(f"Pricing service at {host}:{port} unavailable: {e}")
+    finally:
+        conn.close()
+    try:
+        body = json.loads(data or b"{}")
+    except ValueError:
+        raise ServiceError(f"Pricing service returned HTTP {response.status} with a non-JSON body")
+    if response.status == 200:
+        return body
+    if response.status in (400, 404):
+        from pricing_service import PricingError
+
+        raise PricingError(body.get("error", f"HTTP {response.status}"))
+    raise ServiceError(body.get("error", f"Pricing service returned HTTP {response.status}"))
+
+
+def price(vendor, params, host=DEFAULT_HOST, port=DEFAULT_PORT, timeout=DEFAULT_TIMEOUT,
+          use_service=True):
+    """
+    Price a quote, through the service if it is up, else in-process.
+    Only a failed connection falls back; a service error is raised, since
+    the same input would most likely fail in-process too.
+
+    Args:
+        vendor: "ak", "cci" or "dds"
+        params: Dict of calculator inputs (see pricing_service.py)
+        use_service: False to skip the service and price in-process
+
+    Returns:
+        tuple (result: dict, source: "service" or "local")
+
+    Raises:
+        PricingError: Unknown vendor or bad input
+        ServiceError: The service answered with a server error
+    """
+    if use_service:
+        try:
+            return request(vendor, params, host, port, timeout), "service"
+        except ServiceUnavailable:
+            pass
+    from pricing_service import price as price_local
+
+    return price_local(vendor, params), "local"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Price an AK, CCI or DDS quote via the local pricing service"
+    )
+    parser.add_argument(
+        "--vendor",
+        required=True,
+        choices=["ak", "cci", "dds"],
+        help="Pricing rules to apply",
+    )
+    parser.add_argument(
+        "--data",
+        required=True,
+        help='Calculator inputs as JSON, e.g. \'{"net_price": 12345}\' (see pricing_service.py)',
+    )
+    parser.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help=f"Service host (default: {DEFAULT_HOST})",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Service port (default: {DEFAULT_PORT})",
+    )
+    parser.add_argument(
+        "--local",
+        action="store_true",
+        help="Skip the service and price in-process",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Report on stderr whether the service or the in-process fallback answered",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        params = json.loads(args.data)
+    except json.JSONDecodeError:
+        print(f"Error: Invalid JSON for --data: {args.data}", file=sys.stderr)
+        sys.exit(1)
+
+    try:
+        result, source = price(
+            args.vendor, params, args.host, args.port, use_service=not args.local
+        )
+    except ValueError as e:  # PricingError
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    except ServiceError as e:
+        print(f"Error: Pricing service failed: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    print(json.dumps(result, indent=2))
+    if args.verbose:
+        print(f"Priced by: {source}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
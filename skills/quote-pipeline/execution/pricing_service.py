@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+Local Pricing Service
+
+Resident HTTP server on localhost that answers AK, CCI and DDS pricing
+requests with the vendor skills' own calculate_pricing.py functions, so a
+quote is priced without starting a new Python process each time.
+
+Endpoints (JSON in, JSON out):
+
+  POST /price/ak    {"net_price": 12345}
+  POST /price/cci   {"walkin_price": 18000, "freight": 1200,
+                     "options": [{"name": "Ramp", "price": 550}]}
+  POST /price/dds   {"base_cost": 1200, "quantity": 3, "freight": 400}
+                    or {"model": "1200E", "height": 79, "type": "cooler",
+                        "options": ["cylinder-locks"], "quantity": 2,
+                        "freight": 500}
+  GET  /health
+
+Responses match each calculator's --json output. Invalid input returns 400
+with {"error": "..."}; any other failure returns 500 in the same shape and
+logs the traceback to stderr. The calculators are loaded once at startup; restart
+the service after editing one (DDS pricing.md edits are picked up on the
+next request). pricing_client.py calls the service and
+falls back to price() in-process when it cannot connect.
+"""
+
+import argparse
+import json
+import math
+import os
+import sys
+import traceback
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from skill_loader import load_skill_module
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Vendor endpoint -> skill whose calculate_pricing.py prices it
+PRICING_SKILLS = {
+    "ak": "ak-agent",
+    "cci": "cci-leer-quote-agent",
+    "dds": "dds-agent",
+}
+
+
+class PricingError(ValueError):
+    """Raised for an unknown vendor or missing/invalid pricing input."""
+
+
+def _calculator(vendor):
+    if vendor not in PRICING_SKILLS:
+        raise PricingError(
+            f"Unknown vendor '{vendor}' (expected one of: {', '.join(sorted(PRICING_SKILLS))})"
+        )
+    return load_skill_module(PRICING_SKILLS[vendor], "calculate_pricing")
+
+
+def _number(params, key, kind=float):
+    if key not in params:
+        raise PricingError(f"Missing '{key}'")
+    value = params[key]
+    if isinstance(value, bool):
+        raise PricingError(f"Invalid '{key}': {value!r}")
+    try:
+        number = kind(value)
+    except (TypeError, ValueError, OverflowError):
+        raise PricingError(f"Invalid '{key}': {value!r}")
+    if not math.isfinite(number):
+        raise PricingError(f"Invalid '{key}': {value!r} (must be a finite number)")
+    return number
+
+
+def _text(params, key, default):
+    value = params.get(key)
+    if value is None:
+        return default
+    if not isinstance(value, str):
+        raise PricingError(f"Invalid '{key}': {value!r} (must be a string)")
+    return value
+
+
+def price(vendor, params):
+    """
+    Price one quote in-process with the vendor's calculator.
+
+    Args:
+        vendor: "ak", "cci" or "dds"
+        params: Dict of calculator inputs (see the module docstring)
+
+    Returns:
+        dict, the same as the calculator's --json output
+
+    Raises:
+        PricingError: Unknown vendor or bad input
+    """
+    calc = _calculator(vendor)
+    if not isinstance(params, dict):
+        raise PricingError("Request body must be a JSON object")
+
+    if vendor == "ak":
+        return calc.calculate_pricing(_number(params, "net_price"))
+
+    if vendor == "cci":
+        base = calc.calculate_base_pricing(
+            _number(params, "walkin_price"), _number(params, "freight")
+        )
+        options = params.get("options") or []
+        if not isinstance(options, list):
+            raise PricingError("'options' must be a list")
+        priced = []
+        for opt in options:
+            if not isinstance(opt, dict) or "name" not in opt or "price" not in opt:
+                raise PricingError(f"Each option must have 'name' and 'price' keys: {opt}")
+            priced.append(calc.calculate_option_pricing(opt["name"], _number(opt, "price")))
+        return {"base": base, "options": priced}
+
+    quantity = _number(params, "quantity", int)
+    freight = _number(params, "freight")
+    if "model" not in params:
+        return calc.calculate_door_pricing(_number(params, "base_cost"), quantity, freight)
+
+    # Model path: costs and the 1-2 piece upcharge come from the pricing.md index
+    options = params.get("options") or []
+    if not isinstance(options, list):
+        raise PricingError("'options' must be a list of option codes")
+    for opt in options:
+        if not isinstance(opt, str):
+            raise PricingError(f"Each option must be an option code string: {opt!r}")
+    door_type = _text(params, "type", "cooler")
+    height = _number(params, "height", int) if params.get("height") is not None else None
+    try:
+        resolved = calc.resolve_door_cost(
+            str(params["model"]), height, door_type, quantity, options,
+            bool(params.get("with_lights")),
+        )
+    except (calc.PriceLookupError, OSError) as e:
+        raise PricingError(str(e))
+    total_pieces = _number(params, "total_pieces", int) if "total_pieces" in params else quantity
+    pricing = calc.calculate_door_pricing(
+        resolved["unit_cost"], quantity, freight, resolved["options_cost"],
+        calc.small_order_upcharge_rate(total_pieces),
+    )
+    pricing.update({k: resolved[k] for k in ("model", "height", "type", "options")})
+    return pricing
+
+
+class PricingHandler(BaseHTTPRequestHandler):
+    """Routes /price/<vendor> and /health."""
+
+    protocol_version = "HTTP/1.1"  # Keep-alive, so a client can reuse its connection
+    quiet = True
+
+    def _send(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send(200, {"status": "ok", "pid": os.getpid(), "vendors": sorted(PRICING_SKILLS)})
+        else:
+            self._send(404, {"error": f"Not found: {self.path}"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length)
+        prefix = "/price/"
+        if not self.path.startswith(prefix):
+            self._send(404, {"error": f"Not found: {self.path}"})
+            return
+        try:
+            params = json.loads(body or b"{}")
+            result = price(self.path[len(prefix):], params)
+        except json.JSONDecodeError:
+            self._send(400, {"error": "Request body is not valid JSON"})
+        except PricingError as e:
+            self._send(400, {"error": str(e)})
+        except Exception as e:
+            traceback.print_exc()
+            self._send(500, {"error": f"Internal error: {type(e).__name__}: {e}"})
+        else:
+            self._send(200, result)
+
+    def log_message(self, format, *args):
+        if not self.quiet:
+            super().log_message(format, *args)
+
+
+def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, verbose=False):
+    """Load every calculator, then serve requests until interrupted."""
+    for vendor in PRICING_SKILLS:
+        _calculator(vendor)
+    PricingHandler.quiet = not verbose
+    server = ThreadingHTTPServer((host, port), PricingHandler)
+    print(f"Pricing service listening on http://{host}:{port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Resident local HTTP service for AK, CCI and DDS pricing"
+    )
+    parser.add_argument(
+        "--host",
+        default=DEFAULT_HOST,
+        help=f"Interface to bind (default: {DEFAULT_HOST}, local only)",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=DEFAULT_PORT,
+        help=f"Port to listen on (default: {DEFAULT_PORT})",
+    )
+    parser.add_argument(
+        "--verbose",
+        action="store_true",
+        help="Log every request to stderr",
+    )
+
+    args = parser.parse_args()
+
+    try:
+        serve(args.host, args.port, args.verbose)
+    except OSError as e:
+        print(f"Error: Cannot listen on {args.host}:{args.port}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
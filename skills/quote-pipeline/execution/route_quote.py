@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Vendor Quote Router
+
+Single ingestion entry point for walk-in quote PDFs. Parses each PDF
+exactly once, classifies the vendor from first-page signals, and hands the
+already-extracted text to that vendor's field extractors:
+
+  AmeriKooler (ak-agent):            XX-XXXXX quote number, "AmeriKooler"
+  CCI/LEER (cci-leer-quote-agent):   CC###### tag, "LEER", "Carroll Coolers"
+
+Output is the vendor's normal extraction JSON with a leading "Vendor" key,
+ready for that skill's csv_handler.py.
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+
+from skill_loader import load_skill_module
+
+VENDOR_SKILLS = {
+    "AK": "ak-agent",
+    "CCI": "cci-leer-quote-agent",
+}
+
+VENDOR_NAMES = {
+    "AK": "AmeriKooler",
+    "CCI": "CCI/LEER",
+}
+
+# First-page signals per vendor; the vendor matching the most signals wins
+VENDOR_SIGNALS = {
+    "AK": [
+        r"\bAmeri\s*Kooler\b",
+        r"Quote\s*(?:#|Number)\s*:\s*\d{2}-\d{5}\b",
+        r"\b\d{2}-\d{5}\b",
+    ],
+    "CCI": [
+        r"\bCC\d{5,7}\b",
+        r"\bLEER\b",
+        r"\bCarroll\s+Coolers?\b",
+        r"\bTag[\s#:]*[A-Z]{2}\d{5,7}\b",
+    ],
+}
+
+
+class VendorDetectionError(Exception):
+    """Raised when a PDF cannot be attributed to a single vendor."""
+
+
+def classify_vendor(text):
+    """
+    Classify quote text as "AK" or "CCI".
+    Returns None when no signal matches or both vendors tie.
+    """
+    scores = {
+        vendor: sum(1 for p in patterns if re.search(p, text, re.IGNORECASE))
+        for vendor, patterns in VENDOR_SIGNALS.items()
+    }
+    best = max(scores.values())
+    leaders = [vendor for vendor, score in scores.items() if score == best]
+    if best == 0 or len(leaders) > 1:
+        return None
+    return leaders[0]
+
+
+def route_pdf(pdf_path, vendor=None):
+    """
+    Parse a quote PDF once and extract it with the matching vendor's fields.
+
+    Args:
+        pdf_path: Path to the quote PDF
+        vendor: Optional "AK"/"CCI" override that skips detection
+
+    Returns:
+        tuple (vendor: str, record: dict)
+    """
+    ak = load_skill_module(VENDOR_SKILLS["AK"], "extract_quote_data")
+
+    # One pypdf parse; pages are decoded lazily and shared by both steps
+    pages = ak.PdfPages(pdf_path)
+    if vendor is None:
+        # Page 1 first; only look further if the header is inconclusive
+        vendor = classify_vendor(pages.text((1,))) or classify_vendor(pages.text())
+    if vendor is None:
+        raise VendorDetectionError(
+            f"Could not determine vendor for {os.path.basename(pdf_path)}"
+        )
+
+    filename = os.path.basename(pdf_path)
+    if vendor == "AK":
+        record = ak.extract_from_pages(pages, filename)
+    else:
+        cci = load_skill_module(VENDOR_SKILLS["CCI"], "extract_quote_data")
+        record = cci.extract_from_text(pages.text(), filename)
+    return vendor, record
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Detect the vendor of a quote PDF and extract it in one pass"
+    )
+    parser.add_argument(
+        "--pdf-path",
+        type=str,
+        required=True,
+        help="Path to the vendor quote PDF file",
+    )
+    parser.add_argument(
+        "--vendor",
+        type=str,
+        choices=sorted(VENDOR_SKILLS),
+        default=None,
+        help="Skip detection and use this vendor's extractors",
+    )
+    parser.add_argument(
+        "--raw-text",
+        action="store_true",
+        help="Also output raw extracted text for debugging",
+    )
+
+    args = parser.parse_args()
+
+    ak = load_skill_module(VENDOR_SKILLS["AK"], "extract_quote_data")
+    try:
+        vendor, record = route_pdf(args.pdf_path, args.vendor)
+    except VendorDetectionError as e:
+        print(f"Error: {e}. Re-run with --vendor AK or --vendor CCI.", file=sys.stderr)
+        sys.exit(1)
+    except ak.PdfReadError as e:
+        print(e, file=sys.stderr)
+        sys.exit(1)
+
+    if not args.raw_text:
+        record.pop("Raw_Text", None)
+
+    print(json.dumps({"Vendor": vendor, **record}, indent=2))
+
+    skill = VENDOR_SKILLS[vendor]
+    print(
+        f"\nDetected vendor: {VENDOR_NAMES[vendor]}. "
+        f"Continue with the {skill} skill (csv_handler.py, calculate_pricing.py).",
+        file=sys.stderr,
+    )
+    if record.get("Display_Doors_By_Others") or record.get("Display_Doors_Detail"):
+        print("Display doors detected. Invoke dds-agent skill for door pricing.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
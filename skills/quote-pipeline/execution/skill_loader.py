@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Skill Module Loader
+
+Loads execution scripts from sibling skills by file path. Vendor skills
+reuse the same script names (every quote agent has an
+`extract_quote_data.py` and a `calculate_pricing.py`), so each one is
+loaded under a unique module name instead of through a plain import.
+"""
+
+import importlib.util
+import os
+import sys
+
+# skills/ directory (this file lives in skills/quote-pipeline/execution/)
+SKILLS_DIR = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+
+def load_skill_module(skill, script, subdir="execution"):
+    """
+    Import skills/<skill>/<subdir>/<script>.py and return the module.
+
+    The script's directory is put on sys.path first so its own sibling
+    imports resolve. Modules are cached under "<skill>.<script>".
+    """
+    name = f"{skill}.{script}"
+    if name in sys.modules:
+        return sys.modules[name]
+
+    script_dir = os.path.join(SKILLS_DIR, skill, subdir)
+    path = os.path.join(script_dir, f"{script}.py")
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Skill script not found: {path}")
+
+    if script_dir not in sys.path:
+        sys.path.insert(0, script_dir)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Quote CSV Key Index
+
+Persistent index kept next to a quote CSV, in a small SQLite sidecar file
+(<csv>.idx). For every data row it holds the row's composite key (e.g.
+Quote # + Quote Date) and the byte offset where the row starts, so:
+
+- a duplicate check is one indexed lookup instead of a full DictReader scan
+- the record count is read from the index instead of counting rows
+- the last N rows are read by seeking straight to their offset
+
+The sidecar records the CSV's size and mtime when it was last brought up to
+date. If the CSV was changed by anything else (edited in Excel, copied over,
+truncated), the recorded state no longer matches and the index is rebuilt
+from the CSV on open. The CSV stays the source of truth; deleting the
+sidecar is always safe.
+"""
+
+import csv
+import io
+import os
+import sqlite3
+
+KEY_SEPARATOR = "\x1f"
+
+# Bump when the sidecar tables change; older sidecars are dropped and rebuilt
+SCHEMA_VERSION = 2
+
+
+def index_path_for(csv_path):
+    """Sidecar path for a CSV file."""
+    return csv_path + ".idx"
+
+
+def iter_raw_records(f, offset=0):
+    """
+    Split a CSV opened in binary mode into raw records.
+
+    A record ends at a newline outside double quotes, so quoted fields
+    holding line breaks stay in one record.
+    Yields (offset, raw_bytes) pairs.
+    """
+    parts = []
+    quotes = 0
+    start = offset
+    for line in f:
+        if not parts:
+            start = offset
+        parts.append(line)
+        quotes += line.count(b'"')
+        offset += len(line)
+        if quotes % 2 == 0:
+            yield start, b"".join(parts)
+            parts = []
+            quotes = 0
+    if parts:
+        yield start, b"".join(parts)
+
+
+def encode_rows(rows, fieldnames, encoding="utf-8"):
+    """
+    Format dict rows the way csv.DictWriter writes them.
+    Returns (data: str, sizes: list of encoded byte length per row).
+    """
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fieldnames)
+    sizes = []
+    for row in rows:
+        before = buffer.tell()
+        writer.writerow(row)
+        buffer.seek(before)
+        sizes.append(len(buffer.read().encode(encoding)))
+    return buffer.getvalue(), sizes
+
+
+class CsvIndex:
+    """
+    Composite-key and row-offset index for one CSV file.
+
+    Args:
+        csv_path: Path to the quote CSV
+        key_columns: CSV headers that make up the duplicate key
+        encoding: Encoding used to read the CSV during a rebuild
+        errors: Decode error handling used during a rebuild
+    """
+
+    def __init__(self, csv_path, key_columns, encoding="utf-8", errors="strict"):
+        self.csv_path = csv_path
+        self.key_columns = tuple(key_columns)
+        self.encoding = encoding
+        self.errors = errors
+        self.index_path = index_path_for(csv_path)
+        self._conn = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def open(self):
+        """Open the sidecar, rebuilding it if it does not match the CSV."""
+        self._conn = sqlite3.connect(self.index_path)
+        if self._conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            self._conn.executescript(
+                f"""
+                DROP TABLE IF EXISTS meta;
+                DROP TABLE IF EXISTS keys;
+                DROP TABLE IF EXISTS rows;
+                CREATE TABLE meta (name TEXT PRIMARY KEY, value TEXT);
+                CREATE TABLE rows (rownum INTEGER PRIMARY KEY, offset INTEGER, key TEXT);
+                CREATE INDEX rows_key ON rows (key);
+                PRAGMA user_version = {SCHEMA_VERSION};
+                """
+            )
+        if self._stored_state() != self._file_state():
+            self.rebuild()
+        return self
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def make_key(self, values):
+        """Join key values (in key_columns order) into one index key."""
+        return KEY_SEPARATOR.join(str(v) for v in values)
+
+    def _file_state(self):
+        try:
+            st = os.stat(self.csv_path)
+        except OSError:
+            return None
+        return f"{st.st_size}:{st.st_mtime_ns}"
+
+    def _stored_state(self):
+        row = self._conn.execute("SELECT value FROM meta WHERE name = 'csv_state'").fetchone()
+        return row[0] if row else None
+
+    def _save_state(self):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO meta (name, value) VALUES ('csv_state', ?)",
+            (self._file_state(),),
+        )
+
+    def _scan(self):
+        """Yield (offset, key) for every data row of the CSV."""
+        with open(self.csv_path, "rb") as f:
+            records = iter_raw_records(f)
+            header = None
+            for offset, raw in records:
+                text = raw.decode(self.encoding, errors=self.errors)
+                values = next(csv.reader([text]), [])
+                if header is None:
+                    header = values
+                    positions = [
+                        header.index(col) if col in header else None for col in self.key_columns
+                    ]
+                    continue
+                if not values:
+                    continue  # Blank line
+                key = [
+                    values[p] if p is not None and p < len(values) else ""
+                    for p in positions
+                ]
+                yield offset, self.make_key(key)
+
+    def rebuild(self):
+        """Re-read every row's key and offset from the CSV."""
+        with self._conn:
+            self._conn.execute("DELETE FROM rows")
+            if os.path.exists(self.csv_path):
+                self._conn.executemany(
+                    "INSERT INTO rows (offset, key) VALUES (?, ?)", self._scan()
+                )
+            self._save_state()
+
+    def contains(self, values):
+        """True if a row with these key values is already in the CSV."""
+        row = self._conn.execute(
+            "SELECT 1 FROM rows WHERE key = ? LIMIT 1", (self.make_key(values),)
+        ).fetchone()
+        return row is not None
+
+    def count(self):
+        """Number of data rows in the CSV."""
+        return self._conn.execute("SELECT COALESCE(MAX(rownum), 0) FROM rows").fetchone()[0]
+
+    def tail_offset(self, last_n):
+        """Byte offset where the last `last_n` rows start (None if there are no rows)."""
+        start = max(self.count() - last_n + 1, 1)
+        row = self._conn.execute("SELECT offset FROM rows WHERE rownum = ?", (start,)).fetchone()
+        return row[0] if row else None
+
+    def add(self, values, offset):
+        """
+        Record a row just appended to the CSV by the caller.
+        Call after the write so the stored size/mtime match the new file.
+
+        Args:
+            values: Key values in key_columns order
+            offset: Byte offset where the row starts
+        """
+        self.add_many([(values, offset)])
+
+    def add_many(self, entries):
+        """Record several (values, offset) rows just appended, in one transaction."""
+        with self._conn:
+            self._conn.executemany(
+                "INSERT INTO rows (offset, key) VALUES (?, ?)",
+                ((offset, self.make_key(values)) for values, offset in entries),
+            )
+            self._save_state()
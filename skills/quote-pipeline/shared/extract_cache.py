@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Extraction Result Cache
+
+Content-addressed on-disk cache for extract_all() results.
+Entries are keyed by the PDF's SHA-256 plus a version stamp of the
+extractor's pattern set (a hash of the extractor source and the helper
+modules that shape its output), so editing any regex pattern or helper
+automatically invalidates older entries. Extractors add a suffix to the
+stamp for options that change the output (AK --layout, --adaptive-patterns).
+
+The cache is size-bounded: least recently used entries are evicted once
+the total size passes max_bytes. Writes go through a temp file and
+os.replace, so parallel batch workers can share one cache directory.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024  # 64 MB
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """Return the hex SHA-256 of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_version(*module_paths):
+    """Version stamp for an extractor: short hash of its source files, in order."""
+    digest = hashlib.sha256()
+    for path in module_paths:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class ExtractCache:
+    """
+    Size-bounded LRU cache of extraction records on disk.
+
+    Args:
+        cache_dir: Directory holding one JSON file per entry
+        version: Extractor version stamp (see source_version)
+        max_bytes: Total size budget before LRU eviction
+    """
+
+    def __init__(self, cache_dir, version, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.version = version
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, pdf_sha):
+        return os.path.join(self.cache_dir, f"{pdf_sha}-{self.version}.json")
+
+    def get(self, pdf_sha):
+        """Return the cached record for a PDF hash, or None on a miss."""
+        path = self._entry_path(pdf_sha)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        return record
+
+    def put(self, pdf_sha, record):
+        """Store a record for a PDF hash, then evict down to the size budget."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(record, f)
+            os.replace(tmp_path, self._entry_path(pdf_sha))
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        self.evict()
+
+    def evict(self):
+        """Remove least recently used entries until under max_bytes."""
+        entries = []
+        total = 0
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+            total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
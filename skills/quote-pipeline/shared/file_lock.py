@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Advisory File Locking and Atomic Writes
+
+Cross-process lock for the quote CSVs, so several agent sessions can append
+to the same file safely. The lock is held on a separate <csv>.lock file
+(fcntl.flock on POSIX, msvcrt.locking on Windows), never on the CSV itself,
+so Excel and other readers are not blocked. Waiting is bounded: a lock that
+is not acquired within the timeout raises LockTimeout. The lock is
+re-entrant within a process, so a locked operation may call another one.
+
+atomic_write() writes a whole file through a temp file in the same
+directory, fsyncs it and renames it over the target, so a crash never
+leaves a half-written file behind. The new file keeps the target's
+permissions (see replace_mode()).
+"""
+
+import os
+import stat
+import tempfile
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_TIMEOUT = 10.0  # Seconds
+
+
+class LockTimeout(Exception):
+    """The lock was not acquired within the timeout."""
+
+
+def lock_path_for(path):
+    """Lock file path for a data file."""
+    return path + ".lock"
+
+
+class FileLock:
+    """
+    Exclusive advisory lock on a lock file.
+
+    Args:
+        path: Lock file path (created if missing)
+        timeout: Seconds to wait for the lock (0 = try once)
+        poll_interval: Seconds between attempts while waiting
+    """
+
+    # Lock files held by this process: absolute path -> (file, depth)
+    _held = {}
+
+    def __init__(self, path, timeout=DEFAULT_TIMEOUT, poll_interval=0.05):
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._key = os.path.abspath(path)
+        self._file = None
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def _try_lock(self):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def acquire(self):
+        """Wait for the lock; raise LockTimeout if it stays held by another process."""
+        held = FileLock._held.get(self._key)
+        if held is not None:
+            FileLock._held[self._key] = (held[0], held[1] + 1)
+            return
+        self._file = open(self.path, "a+b")
+        deadline = time.monotonic() + self.timeout
+        while not self._try_lock():
+            if time.monotonic() >= deadline:
+                self._file.close()
+                self._file = None
+                raise LockTimeout(
+                    f"Timed out after {self.timeout:g}s waiting for lock {self.path}"
+                )
+            time.sleep(self.poll_interval)
+        FileLock._held[self._key] = (self._file, 1)
+
+    def release(self):
+        held = FileLock._held.get(self._key)
+        if held is None:
+            return
+        if held[1] > 1:
+            FileLock._held[self._key] = (held[0], held[1] - 1)
+            return
+        del FileLock._held[self._key]
+        self._file = held[0]
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+
+
+def replace_mode(path):
+    """
+    Permission bits for a file about to replace `path`: the current file's
+    mode, or the umask default (0666 less the umask) for a new file.
+    mkstemp() creates temp files 0600, which os.replace() would otherwise keep.
+    """
+    try:
+        return stat.S_IMODE(os.stat(path).st_mode)
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+def atomic_write(path, text, encoding="utf-8", errors="strict"):
+    """
+    Replace `path` with `text` in one step.
+    Writes a temp file next to it, fsyncs it, then renames it into place.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", newline="", encoding=encoding, errors=errors) as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, replace_mode(path))
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
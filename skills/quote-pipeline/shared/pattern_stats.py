@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Regex Pattern Statistics
+
+Hit/miss/time counters for the ordered fallback regexes in the field
+extractors, persisted as one JSON file per vendor so they accumulate across
+runs. The exported report shows which fallbacks actually match and which
+are dead weight.
+
+Extractors pass their patterns as tiers (a list of lists). Tiers always run
+in order, so broad catch-all fallbacks stay last. In adaptive mode the
+patterns within a tier are tried in order of observed hit rate. Without it
+the declared order is kept, so results match the plain pattern lists.
+"""
+
+import json
+import os
+import re
+import tempfile
+import time
+
+
+class PatternStats:
+    """
+    Per-pattern counters for fallback regex searches.
+
+    Args:
+        path: JSON stats file (None keeps counters in memory only)
+        adaptive: Try patterns within a tier by descending hit rate
+    """
+
+    def __init__(self, path=None, adaptive=False):
+        self.path = path
+        self.adaptive = adaptive
+        self._saved = {}  # Counters already on disk
+        self._delta = {}  # Counters recorded since the last load/save
+        self._declared = set()  # Keys whose full pattern list is registered
+
+    def load(self):
+        """Read the persisted counters (missing or unreadable file = empty)."""
+        self._saved = self._read()
+        return self
+
+    def _read(self):
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f).get("patterns", {})
+        except (OSError, ValueError):
+            return {}
+
+    def _counter(self, counters, key, pattern):
+        return counters.setdefault(key, {}).setdefault(
+            pattern, {"hits": 0, "misses": 0, "seconds": 0.0}
+        )
+
+    def hit_rate(self, key, pattern):
+        """Observed hit rate of a pattern, or None if it has never run."""
+        hits = misses = 0
+        for counters in (self._saved, self._delta):
+            counter = counters.get(key, {}).get(pattern)
+            if counter:
+                hits += counter["hits"]
+                misses += counter["misses"]
+        if hits + misses == 0:
+            return None
+        return hits / (hits + misses)
+
+    def ordered(self, key, tier):
+        """Patterns of one tier in the order they should be tried."""
+        if not self.adaptive or len(tier) < 2:
+            return tier
+        # Stable sort: unseen patterns keep their declared position
+        rates = [self.hit_rate(key, p) for p in tier]
+        if all(rate is None for rate in rates):
+            return tier
+        return [
+            p
+            for _, p in sorted(
+                zip(rates, tier), key=lambda item: -(item[0] or 0.0)
+            )
+        ]
+
+    def search(self, key, tiers, text, flags=0):
+        """
+        Return the first match from tiered fallback patterns, or None.
+
+        Args:
+            key: Extractor name the counters are filed under
+            tiers: List of pattern lists, tried tier by tier
+            text: Text to search
+            flags: re flags for every pattern
+        """
+        if key not in self._declared:
+            # Register every pattern, so fallbacks never reached still show up
+            self._declared.add(key)
+            for tier in tiers:
+                for pattern in tier:
+                    self._counter(self._delta, key, pattern)
+        for tier in tiers:
+            for pattern in self.ordered(key, tier):
+                started = time.perf_counter()
+                match = re.search(pattern, text, flags)
+                counter = self._counter(self._delta, key, pattern)
+                counter["seconds"] += time.perf_counter() - started
+                if match:
+                    counter["hits"] += 1
+                    return match
+                counter["misses"] += 1
+        return None
+
+    def take_delta(self):
+        """Return and clear the counters recorded since the last call."""
+        delta, self._delta = self._delta, {}
+        for key, patterns in delta.items():
+            for pattern, counter in patterns.items():
+                saved = self._counter(self._saved, key, pattern)
+                for name in ("hits", "misses", "seconds"):
+                    saved[name] += counter[name]
+        return delta
+
+    def merge(self, delta):
+        """Add counters recorded elsewhere (e.g. a batch worker process)."""
+        for key, patterns in delta.items():
+            for pattern, counter in patterns.items():
+                mine = self._counter(self._delta, key, pattern)
+                for name in ("hits", "misses", "seconds"):
+                    mine[name] += counter[name]
+
+    def save(self):
+        """Add new counters to the stats file (atomic replace)."""
+        if not self.path or not self._delta:
+            return
+        on_disk = self._read()
+        for key, patterns in self._delta.items():
+            for pattern, counter in patterns.items():
+                total = self._counter(on_disk, key, pattern)
+                for name in ("hits", "misses", "seconds"):
+                    total[name] += counter[name]
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"patterns": on_disk}, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        self._saved = on_disk
+        self._delta = {}
+
+    def report(self):
+        """
+        Rows for every recorded pattern, grouped by extractor.
+        Returns list of dicts: key, pattern, hits, misses, hit_rate, avg_us.
+        """
+        merged = {}
+        for counters in (self._saved, self._delta):
+            for key, patterns in counters.items():
+                for pattern, counter in patterns.items():
+                    total = self._counter(merged, key, pattern)
+                    for name in ("hits", "misses", "seconds"):
+                        total[name] += counter[name]
+        rows = []
+        for key in sorted(merged):
+            for pattern, counter in merged[key].items():
+                calls = counter["hits"] + counter["misses"]
+                rows.append(
+                    {
+                        "key": key,
+                        "pattern": pattern,
+                        "hits": counter["hits"],
+                        "misses": counter["misses"],
+                        "hit_rate": round(counter["hits"] / calls, 4) if calls else 0.0,
+                        "avg_us": round(counter["seconds"] / calls * 1e6, 2) if calls else 0.0,
+                    }
+                )
+        return rows
+
+
+def print_report(rows, out=None):
+    """Print report() rows as a table; dead-weight patterns are flagged."""
+    if not rows:
+        print("No pattern statistics recorded yet.", file=out)
+        return
+    print(f"{'Extractor':<22}{'Hits':>8}{'Misses':>8}{'Hit %':>8}{'Avg us':>9}  Pattern", file=out)
+    for row in rows:
+        if row["hits"] + row["misses"] == 0:
+            flag = "  (never reached)"
+        elif row["hits"] == 0:
+            flag = "  (never matched)"
+        else:
+            flag = ""
+        print(
+            f"{row['key']:<22}{row['hits']:>8}{row['misses']:>8}"
+            f"{row['hit_rate']:>8.1%}{row['avg_us']:>9.2f}  {row['pattern']}{flag}",
+            file=out,
+        )
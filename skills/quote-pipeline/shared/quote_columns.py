@@ -0,0 +1,371 @@
+#!/usr/bin/env python3
+"""
+Typed Column Cache
+
+Column-oriented index of a quote CSV for the query action, kept next to it
+as <csv>.columns.json. Only the columns queries look at are stored: the
+typed columns parsed (money as integer cents, dates as day ordinals, Y/N
+flags as booleans) and a few text columns used for filters and sorting
+(State, Type, ...), lower-cased. Every other value stays in the CSV; each
+row's byte offset is stored, so matching rows are read straight from the
+file. Queries filter and sort on numbers without re-parsing "$12,345.00" or
+"01/23/2026" on every row of every query. iter_typed_rows() hands the same
+parsed values to analytics and re-pricing code (cents as int, dates as
+datetime.date, flags as bool).
+
+Typed columns named in sorted_columns (e.g. Good Thru) also keep a sorted
+index of (value, row) pairs, so a range such as "expires in the next 7
+days" is two binary searches instead of a scan. The index is sorted once
+per refresh, not row by row.
+
+The cache remembers how many bytes of the CSV it has read, plus a hash of
+the first and last bytes before that point. When the CSV has only grown
+(the handler appends), just the new rows are parsed. Any other change
+(edited rows, rewrite, truncation) rebuilds the cache from scratch.
+"""
+
+import csv
+import hashlib
+import json
+import os
+import tempfile
+from bisect import bisect_left, bisect_right
+from datetime import date
+
+from csv_index import iter_raw_records
+from file_lock import replace_mode
+from quote_values import parse_bool, parse_date, parse_money_cents
+
+# Bump when the cache layout or a parser changes; older caches are rebuilt
+CACHE_VERSION = 3
+
+# Bytes hashed at each end of the already-read part of the CSV
+FINGERPRINT_BYTES = 256
+
+
+def _date_ordinal(value):
+    parsed = parse_date(value)
+    return parsed.toordinal() if parsed else None
+
+
+# Column kind -> parser from display string to typed value (None if unparseable)
+PARSERS = {
+    "money": parse_money_cents,
+    "date": _date_ordinal,
+    "bool": parse_bool,
+}
+
+
+def cache_path_for(csv_path):
+    """Column cache path for a CSV file."""
+    return csv_path + ".columns.json"
+
+
+class ColumnCache:
+    """
+    Columnar, typed index of one quote CSV.
+
+    Args:
+        csv_path: Path to the quote CSV
+        typed_columns: Dict of CSV header -> kind ("money", "date" or "bool")
+        encoding: Encoding used to read the CSV
+        errors: Decode error handling used to read the CSV
+        sorted_columns: Typed headers that also keep a sorted range index
+        text_columns: Untyped headers that queries filter or sort on
+    """
+
+    def __init__(
+        self, csv_path, typed_columns, encoding="utf-8", errors="strict", sorted_columns=(),
+        text_columns=(),
+    ):
+        self.csv_path = csv_path
+        self.typed_columns = dict(typed_columns)
+        self.sorted_columns = [h for h in sorted_columns if h in self.typed_columns]
+        self.text_columns = [h for h in text_columns if h not in self.typed_columns]
+        self.encoding = encoding
+        self.errors = errors
+        self.cache_path = cache_path_for(csv_path)
+        self._reset()
+
+    def _reset(self):
+        self.headers = []
+        self.offsets = []  # Byte offset of each row in the CSV
+        self.text = {}  # text header -> list of stripped, lower-cased values
+        self.typed = {}  # typed header -> list of parsed values
+        self.sorted = {}  # header -> [values ascending, matching row indices]
+        self._offset = 0
+        self._mtime_ns = None
+        self._fingerprint = None
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def _load(self):
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return
+        if (
+            state.get("version") != CACHE_VERSION
+            or state.get("typed_columns") != self.typed_columns
+            or state.get("sorted_columns") != self.sorted_columns
+            or state.get("text_columns") != self.text_columns
+        ):
+            return
+        self.headers = state["headers"]
+        self.offsets = state["offsets"]
+        self.text = state["text"]
+        self.typed = state["typed"]
+        self.sorted = state["sorted"]
+        self._offset = state["offset"]
+        self._mtime_ns = state["mtime_ns"]
+        self._fingerprint = state["fingerprint"]
+
+    def _save(self):
+        state = {
+            "version": CACHE_VERSION,
+            "typed_columns": self.typed_columns,
+            "sorted_columns": self.sorted_columns,
+            "text_columns": self.text_columns,
+            "offset": self._offset,
+            "mtime_ns": self._mtime_ns,
+            "fingerprint": self._fingerprint,
+            "headers": self.headers,
+            "offsets": self.offsets,
+            "text": self.text,
+            "typed": self.typed,
+            "sorted": self.sorted,
+        }
+        directory = os.path.dirname(os.path.abspath(self.cache_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(json.dumps(state, separators=(",", ":")))  # json.dumps uses the C encoder, json.dump does not
+            os.chmod(tmp_path, replace_mode(self.cache_path))
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _prefix_fingerprint(self, f, length):
+        """Hash of the first and last FINGERPRINT_BYTES of the CSV's first `length` bytes."""
+        digest = hashlib.sha1()
+        f.seek(0)
+        digest.update(f.read(min(FINGERPRINT_BYTES, length)))
+        f.seek(max(length - FINGERPRINT_BYTES, 0))
+        digest.update(f.read(min(FINGERPRINT_BYTES, length)))
+        return digest.hexdigest()
+
+    def refresh(self):
+        """
+        Bring the cache up to date with the CSV.
+        Returns the number of rows parsed (0 when the cache was current).
+        """
+        if not self.headers:
+            self._load()
+        try:
+            st = os.stat(self.csv_path)
+        except OSError:
+            self._reset()
+            return 0
+        if st.st_size == self._offset and st.st_mtime_ns == self._mtime_ns:
+            return 0
+
+        parsed = 0
+        with open(self.csv_path, "rb") as f:
+            appended = (
+                self.headers
+                and st.st_size > self._offset
+                and self._prefix_fingerprint(f, self._offset) == self._fingerprint
+            )
+            if not appended:
+                self._reset()
+            f.seek(self._offset)
+            columns = self._stored_columns()
+            added = {h: [] for h in self.sorted}  # New (value, row) pairs per sorted header
+            for offset, raw in iter_raw_records(f, self._offset):
+                values = next(csv.reader([raw.decode(self.encoding, errors=self.errors)]), [])
+                if not self.headers:
+                    self.headers = values
+                    self.text = {h: [] for h in self.text_columns if h in self.headers}
+                    self.typed = {h: [] for h in self.headers if h in self.typed_columns}
+                    self.sorted = {h: [[], []] for h in self.sorted_columns if h in self.typed}
+                    columns = self._stored_columns()
+                    added = {h: [] for h in self.sorted}
+                    continue
+                if not values:
+                    continue  # Blank line
+                self._add_row(offset, values, columns, added)
+                parsed += 1
+            self._offset = f.tell()
+            self._fingerprint = self._prefix_fingerprint(f, self._offset)
+        self._mtime_ns = st.st_mtime_ns
+        for header, pairs in added.items():
+            self._extend_sorted(header, pairs)
+        self._save()
+        return parsed
+
+    def _stored_columns(self):
+        """
+        (position, header, parse) for each header kept in the cache; parse is
+        None for text columns. Parsers are memoized per refresh, since dates
+        and flags repeat across rows.
+        """
+        columns = []
+        for position, header in enumerate(self.headers):
+            if header in self.text:
+                columns.append((position, header, None))
+            elif header in self.typed:
+                parser = PARSERS[self.typed_columns[header]]
+                memo = {}
+
+                def parse(value, parser=parser, memo=memo):
+                    if value not in memo:
+                        memo[value] = parser(value)
+                    return memo[value]
+
+                columns.append((position, header, parse))
+        return columns
+
+    def _add_row(self, offset, values, columns, added):
+        index = len(self)
+        self.offsets.append(offset)
+        for position, header, parse in columns:
+            value = values[position] if position < len(values) else ""
+            if parse is None:
+                self.text[header].append(value.strip().lower())
+                continue
+            parsed = parse(value)
+            self.typed[header].append(parsed)
+            if parsed is not None and header in added:
+                added[header].append((parsed, index))
+
+    def _extend_sorted(self, header, pairs):
+        """Add (value, row) pairs to a sorted index with one sort, not one insert per row."""
+        if not pairs:
+            return
+        keys, rows = self.sorted[header]
+        pairs.sort()
+        if keys and pairs[0][0] < keys[-1]:
+            # Appended rows sort inside the index (e.g. an older date); merge and re-sort
+            pairs = sorted(list(zip(keys, rows)) + pairs)
+            keys.clear()
+            rows.clear()
+        keys.extend(value for value, _ in pairs)
+        rows.extend(index for _, index in pairs)
+
+    def range(self, header, low, high):
+        """
+        Row indices whose typed `header` value lies in [low, high], ascending
+        by that value. Uses the sorted index if the header has one.
+        """
+        if header in self.sorted:
+            keys, rows = self.sorted[header]
+            return rows[bisect_left(keys, low):bisect_right(keys, high)]
+        return self.query(ranges={header: (low, high)}, sort=header)
+
+    def _iter_values(self, rows):
+        """
+        Yield the CSV values of each row index in `rows`, read from the file
+        at the stored offsets. Consecutive rows are read without seeking.
+        """
+        with open(self.csv_path, "rb") as f:
+            records = None
+            next_offset = None
+            for index in rows:
+                offset = self.offsets[index]
+                if offset != next_offset:
+                    f.seek(offset)
+                    records = iter_raw_records(f, offset)
+                _, raw = next(records)
+                next_offset = offset + len(raw)
+                yield next(csv.reader([raw.decode(self.encoding, errors=self.errors)]), [])
+
+    def _display_row(self, values):
+        return {h: values[i] if i < len(values) else "" for i, h in enumerate(self.headers)}
+
+    def _typed_row(self, index, values):
+        row = self._display_row(values)
+        for header, column in self.typed.items():
+            value = column[index]
+            if value is not None and self.typed_columns[header] == "date":
+                value = date.fromordinal(value)
+            row[header] = value
+        return row
+
+    def rows(self, indices, typed=False):
+        """
+        Rows at `indices` as dicts (CSV header keys), read from the CSV.
+        With typed=True, typed headers hold machine values (see typed_row).
+        """
+        indices = list(indices)
+        values = self._iter_values(indices)
+        if typed:
+            return [self._typed_row(i, v) for i, v in zip(indices, values)]
+        return [self._display_row(v) for v in values]
+
+    def row(self, index):
+        """Row `index` as a dict of display strings (CSV header keys)."""
+        return self.rows([index])[0]
+
+    def typed_row(self, index):
+        """
+        Row `index` with typed headers as machine values: money as integer
+        cents, dates as datetime.date, flags as bool (None if blank or
+        unparseable). Other headers keep their display strings.
+        """
+        return self.rows([index], typed=True)[0]
+
+    def iter_typed_rows(self, rows=None):
+        """Yield typed rows for each index in `rows` (default: every row, in CSV order)."""
+        rows = range(len(self)) if rows is None else rows
+        for index, values in zip(rows, self._iter_values(rows)):
+            yield self._typed_row(index, values)
+
+    def query(self, equals=None, ranges=None, sort=None, descending=False, limit=None):
+        """
+        Row indices matching every filter, in CSV order unless sorted.
+
+        Args:
+            equals: Dict of text header -> set of accepted values
+                (lower-cased, compared case-insensitively)
+            ranges: Dict of typed header -> (low, high) inclusive bounds in
+                typed units; either bound may be None
+            sort: Header to sort by (typed value if the column is typed).
+                Rows with no value sort last either way
+            descending: Reverse the sort
+            limit: Maximum number of rows to return
+        """
+        rows = range(len(self))
+        for header, accepted in (equals or {}).items():
+            column = self.text.get(header)
+            if column is None:
+                return []
+            rows = [i for i in rows if column[i] in accepted]
+        for header, (low, high) in (ranges or {}).items():
+            column = self.typed.get(header)
+            if column is None:
+                return []
+            rows = [
+                i
+                for i in rows
+                if column[i] is not None
+                and (low is None or column[i] >= low)
+                and (high is None or column[i] <= high)
+            ]
+        rows = list(rows)
+        if sort:
+            if sort in self.typed:
+                values = self.typed[sort]
+            elif sort in self.text:
+                values = [v or None for v in self.text[sort]]
+            else:
+                return rows[:limit] if limit else rows
+            present = [i for i in rows if values[i] is not None]
+            missing = [i for i in rows if values[i] is None]
+            present.sort(key=values.__getitem__, reverse=descending)
+            rows = present + missing
+        return rows[:limit] if limit else rows
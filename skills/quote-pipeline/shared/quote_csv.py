@@ -0,0 +1,1032 @@
+#!/usr/bin/env python3
+"""
+Quote CSV Handler Core
+
+The storage logic behind the AK and CCI csv_handler.py scripts. Each vendor
+script describes its CSV (headers, JSON field map, duplicate key, typed
+columns, sort choices) in a QuoteCsvHandler; this module does the rest, so a
+fix to appending, duplicate checks, queries or the SQLite backend lands in
+both vendors at once.
+
+CSV backend: duplicates are checked on the composite key through a key index
+kept next to the CSV (see csv_index.py), which also answers count and
+read --last-n without scanning. Writes hold an advisory lock on <csv>.lock
+(see file_lock.py), so concurrent sessions never interleave a duplicate check
+with another append. query and expiring read a typed column cache (see
+quote_columns.py).
+
+SQLite backend: the same actions against one table per vendor in a shared
+database (see quote_store.py), plus import from and export to a CSV.
+
+run_cli() is the command line shared by both csv_handler.py scripts.
+"""
+
+import argparse
+import codecs
+import csv
+import io
+import json
+import os
+import sqlite3
+import sys
+from datetime import date, timedelta
+
+from csv_index import CsvIndex, encode_rows
+from file_lock import DEFAULT_TIMEOUT, FileLock, LockTimeout, atomic_write, lock_path_for
+from quote_columns import ColumnCache
+from quote_store import SqliteQuoteStore
+from quote_values import parse_date
+
+# Text columns the query action filters on (--state, --type, --location)
+EQUALS_COLUMNS = ("State", "Type", "Location")
+
+
+def csv_lock(csv_path, timeout=DEFAULT_TIMEOUT):
+    """Advisory lock guarding a CSV and its sidecar index."""
+    return FileLock(lock_path_for(csv_path), timeout)
+
+
+def iter_ndjson(f):
+    """
+    Yield one dict per non-blank NDJSON line.
+    A line that is not a JSON object yields an {"Error": ...} record.
+    """
+    for line_number, line in enumerate(f, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield {"Error": f"Invalid JSON on line {line_number}: {e}"}
+            continue
+        if not isinstance(data, dict):
+            yield {"Error": f"Line {line_number} is not a JSON object"}
+            continue
+        yield data
+
+
+def expiry_window(within_days, as_of=None):
+    """(first, last) day ordinals of the window [as_of, as_of + within_days]."""
+    start = as_of or date.today()
+    return start.toordinal(), (start + timedelta(days=within_days)).toordinal()
+
+
+def add_days_left(records, as_of=None):
+    """Add a "Days Left" value (days until Good Thru) to each record."""
+    today = (as_of or date.today()).toordinal()
+    for record in records:
+        good_thru = record.get("Good Thru")
+        if not isinstance(good_thru, date):
+            good_thru = parse_date(good_thru)
+        record["Days Left"] = good_thru.toordinal() - today if good_thru else None
+    return records
+
+
+class QuoteCsvHandler:
+    """
+    One vendor's quote storage: a CSV (with its key index and column cache)
+    or a table in the shared SQLite database.
+
+    Args:
+        headers: CSV headers, in column order
+        field_map: JSON key (from extract_quote_data.py) -> CSV header
+        key_columns: Composite duplicate key, e.g. ("Quote #", "Quote Date").
+            The first header also labels records ("Quote #26-02170").
+        typed_columns: CSV header -> "money", "date" or "bool", parsed by the
+            column cache and the SQLite store. Money columns are written as
+            "$12,345.00".
+        sort_columns: --sort choice -> CSV header; "price" is the vendor's
+            main price column
+        db_table: Table name in the SQLite database
+        default_csv_path: CSV used when --csv-path is not given
+        default_db_path: Database used when --db-path is not given
+        encoding: Encoding the CSV is read with
+        errors: Decode error handling for reads ("strict", "replace")
+        sorted_columns: Typed columns that keep a sorted range index
+        backfills: Optional action name -> (target header, source header,
+            lookup) for run_cli(); each fills empty target values from
+            lookup(source value)
+    """
+
+    def __init__(
+        self, headers, field_map, key_columns, typed_columns, sort_columns,
+        db_table, default_csv_path, default_db_path, encoding="utf-8", errors="strict",
+        sorted_columns=("Good Thru",), backfills=None,
+    ):
+        self.headers = list(headers)
+        self.field_map = dict(field_map)
+        self.key_columns = tuple(key_columns)
+        self.typed_columns = dict(typed_columns)
+        self.sort_columns = dict(sort_columns)
+        self.db_table = db_table
+        self.default_csv_path = default_csv_path
+        self.default_db_path = default_db_path
+        self.encoding = encoding
+        self.errors = errors
+        self.sorted_columns = tuple(sorted_columns)
+        self.backfills = dict(backfills or {})
+
+        self.key_label = self.key_columns[0]
+        self.price_column = self.sort_columns["price"]
+        self.money_columns = {h for h, kind in self.typed_columns.items() if kind == "money"}
+        # Untyped columns the column cache keeps for filters and text sorts
+        self.text_columns = tuple(dict.fromkeys(
+            h for h in (*EQUALS_COLUMNS, *self.sort_columns.values()) if h not in self.typed_columns
+        ))
+        # CSV header -> JSON key, to read the key columns from extracted records
+        json_keys = {header: key for key, header in self.field_map.items()}
+        self.key_fields = [(json_keys.get(col), col) for col in self.key_columns]
+
+    # -- Records -----------------------------------------------------------
+
+    def record_key(self, data):
+        """Duplicate key of an extracted record (JSON or CSV header keys)."""
+        return tuple(
+            (data.get(json_key) if json_key else None) or data.get(header, "")
+            for json_key, header in self.key_fields
+        )
+
+    def map_data_to_csv_row(self, data):
+        """Map JSON data keys to CSV header format."""
+        row = {}
+        for json_key, csv_header in self.field_map.items():
+            value = data.get(json_key, "")
+            if value is None:
+                value = ""
+            # Format currency fields
+            if csv_header in self.money_columns:
+                if value and not str(value).startswith("$"):
+                    try:
+                        value = f"${float(value):,.2f}"
+                    except (ValueError, TypeError):
+                        pass
+            row[csv_header] = str(value)
+        return row
+
+    def _duplicate_message(self, key):
+        number, quote_date = key
+        return f"Duplicate record: {self.key_label}{number} / Date {quote_date} already exists"
+
+    def plan_appends(self, records, is_stored):
+        """
+        Sort records into rows to write and per-record results.
+
+        Args:
+            records: Iterable of dicts (JSON keys from extract_quote_data.py)
+            is_stored: Callable taking a key tuple, True if already stored
+
+        Returns:
+            tuple (results: list of dicts, rows: list of CSV row dicts)
+        """
+        results = []
+        rows = []
+        seen = set()
+        for position, data in enumerate(records, 1):
+            key = self.record_key(data)
+            number, quote_date = key
+            if number or quote_date:
+                label = f"{self.key_label}{number} / {quote_date}"
+            else:
+                label = data.get("PDF_Filename") or "-"
+            result = {"record": position, "key": label}
+            results.append(result)
+
+            if data.get("Error"):
+                result.update(status="error", message=str(data["Error"]))
+                continue
+
+            if all(key):
+                if key in seen:
+                    result.update(status="skipped", message="Duplicate of an earlier record in this batch")
+                    continue
+                if is_stored(key):
+                    result.update(status="skipped", message="Duplicate record already exists")
+                    continue
+                seen.add(key)
+
+            rows.append(self.map_data_to_csv_row(data))
+            result.update(status="accepted", message="Record appended")
+
+        return results, rows
+
+    # -- CSV backend -------------------------------------------------------
+
+    def ensure_csv_exists(self, csv_path, lock_timeout=DEFAULT_TIMEOUT):
+        """Create CSV file with headers if it doesn't exist (atomic, under the CSV lock)."""
+        if os.path.exists(csv_path):
+            return
+        with csv_lock(csv_path, lock_timeout):
+            if not os.path.exists(csv_path):
+                buffer = io.StringIO()
+                csv.writer(buffer).writerow(self.headers)
+                atomic_write(csv_path, buffer.getvalue())
+                print(f"Created new CSV file: {csv_path}", file=sys.stderr)
+
+    def open_index(self, csv_path):
+        """Open the CSV's key index, or return None if the sidecar can't be used."""
+        try:
+            return CsvIndex(
+                csv_path, self.key_columns, encoding=self.encoding, errors=self.errors
+            ).open()
+        except sqlite3.Error as e:
+            print(f"Warning: key index unavailable ({e}), scanning CSV", file=sys.stderr)
+            return None
+
+    def check_duplicate(self, csv_path, number, quote_date, lock_timeout=DEFAULT_TIMEOUT):
+        """Check if a record with the same key + Quote Date already exists."""
+        if not os.path.exists(csv_path):
+            return False
+
+        with csv_lock(csv_path, lock_timeout):
+            index = self.open_index(csv_path)
+            if index is None:
+                return (number, quote_date) in self.scan_keys(csv_path)
+            try:
+                return index.contains((number, quote_date))
+            finally:
+                index.close()
+
+    def scan_keys(self, csv_path):
+        """Set of all key tuples in the CSV (fallback without the key index)."""
+        with open(csv_path, "r", newline="", encoding=self.encoding, errors=self.errors) as f:
+            reader = csv.DictReader(f)
+            return {tuple(row.get(col) or "" for col in self.key_columns) for row in reader}
+
+    def append_record(self, csv_path, data, lock_timeout=DEFAULT_TIMEOUT):
+        """
+        Append a quote record to the CSV file.
+
+        Args:
+            csv_path: Path to CSV file
+            data: Dict with quote data (JSON keys from extract_quote_data.py)
+            lock_timeout: Seconds to wait for the CSV lock (raises LockTimeout)
+
+        Returns:
+            tuple (success: bool, message: str)
+        """
+        with csv_lock(csv_path, lock_timeout):
+            self.ensure_csv_exists(csv_path)
+
+            key = self.record_key(data)
+            count = None
+            index = self.open_index(csv_path)
+            try:
+                # Check for duplicates
+                if all(key):
+                    if index is not None:
+                        duplicate = index.contains(key)
+                    else:
+                        duplicate = key in self.scan_keys(csv_path)
+                    if duplicate:
+                        return False, self._duplicate_message(key)
+
+                row = self.map_data_to_csv_row(data)
+                offset = os.path.getsize(csv_path)
+
+                with open(csv_path, "a", newline="", encoding="utf-8") as f:
+                    writer = csv.DictWriter(f, fieldnames=self.headers)
+                    writer.writerow(row)
+
+                if index is not None:
+                    try:
+                        index.add(tuple(row[col] for col in self.key_columns), offset)
+                        count = index.count()
+                    except sqlite3.Error:
+                        pass  # Sidecar no longer matches the CSV and is rebuilt on next open
+            finally:
+                if index is not None:
+                    index.close()
+
+            if count is None:
+                count = self.count_records(csv_path)
+            return True, f"Record appended. Total records: {count}"
+
+    def append_records(self, csv_path, records, lock_timeout=DEFAULT_TIMEOUT):
+        """
+        Append many quote records with one duplicate pass and one write.
+
+        Duplicates are checked against the CSV and against earlier records of
+        the same batch. Records carrying an "Error" key (failed batch extraction
+        or unparseable input) are reported and not written.
+
+        Args:
+            csv_path: Path to CSV file
+            records: Iterable of dicts (JSON keys from extract_quote_data.py)
+            lock_timeout: Seconds to wait for the CSV lock (raises LockTimeout)
+
+        Returns:
+            tuple (results: list of dicts, total: int). Each result has
+            record (1-based position), key, status (accepted/skipped/error)
+            and message.
+        """
+        with csv_lock(csv_path, lock_timeout):
+            self.ensure_csv_exists(csv_path)
+
+            index = self.open_index(csv_path)
+            try:
+                if index is not None:
+                    is_stored = index.contains
+                else:
+                    is_stored = self.scan_keys(csv_path).__contains__
+
+                results, rows = self.plan_appends(records, is_stored)
+
+                if rows:
+                    data, sizes = encode_rows(rows, self.headers)
+                    offset = os.path.getsize(csv_path)
+                    with open(csv_path, "a", newline="", encoding="utf-8") as f:
+                        f.write(data)
+
+                    if index is not None:
+                        entries = []
+                        for row, size in zip(rows, sizes):
+                            entries.append((tuple(row[col] for col in self.key_columns), offset))
+                            offset += size
+                        try:
+                            index.add_many(entries)
+                        except sqlite3.Error:
+                            pass  # Sidecar no longer matches the CSV and is rebuilt on next open
+            finally:
+                if index is not None:
+                    index.close()
+
+            return results, self.count_records(csv_path)
+
+    def read_records(self, csv_path, last_n=10, lock_timeout=DEFAULT_TIMEOUT):
+        """
+        Read recent records from CSV.
+
+        Args:
+            csv_path: Path to CSV file
+            last_n: Number of most recent records to return
+
+        Returns:
+            list of dicts
+        """
+        if not os.path.exists(csv_path):
+            return []
+
+        with csv_lock(csv_path, lock_timeout):
+            if last_n:
+                index = self.open_index(csv_path)
+                if index is not None:
+                    try:
+                        offset = index.tail_offset(last_n)
+                    finally:
+                        index.close()
+                    return self.read_from_offset(csv_path, offset) if offset is not None else []
+
+            with open(csv_path, "r", newline="", encoding=self.encoding, errors=self.errors) as f:
+                records = [dict(row) for row in csv.DictReader(f)]
+
+            return records[-last_n:] if last_n else records
+
+    def read_from_offset(self, csv_path, offset):
+        """Read the rows that start at byte `offset` through the end of the CSV."""
+        with open(csv_path, "r", newline="", encoding=self.encoding, errors=self.errors) as f:
+            header = next(csv.reader(f), [])
+        with open(csv_path, "rb") as raw:
+            raw.seek(offset)
+            f = io.TextIOWrapper(raw, encoding=self.encoding, errors=self.errors, newline="")
+            return [dict(row) for row in csv.DictReader(f, fieldnames=header)]
+
+    def count_records(self, csv_path, lock_timeout=DEFAULT_TIMEOUT):
+        """Count total records in CSV (excluding header)."""
+        if not os.path.exists(csv_path):
+            return 0
+
+        with csv_lock(csv_path, lock_timeout):
+            index = self.open_index(csv_path)
+            if index is not None:
+                try:
+                    return index.count()
+                finally:
+                    index.close()
+
+            with open(csv_path, "r", newline="", encoding=self.encoding, errors=self.errors) as f:
+                reader = csv.reader(f)
+                next(reader, None)  # Skip header
+                return sum(1 for _ in reader)
+
+    def open_column_cache(self, csv_path, lock_timeout=DEFAULT_TIMEOUT):
+        """
+        Load the CSV's typed column cache and bring it up to date. Hold the
+        CSV lock while reading rows through it, so the offsets stay valid.
+        """
+        with csv_lock(csv_path, lock_timeout):
+            cache = ColumnCache(
+                csv_path,
+                self.typed_columns,
+                encoding=self.encoding,
+                errors=self.errors,
+                sorted_columns=self.sorted_columns,
+                text_columns=self.text_columns,
+            )
+            cache.refresh()
+        return cache
+
+    def query_records(
+        self, csv_path, equals=None, ranges=None, sort=None, descending=False, limit=None,
+        lock_timeout=DEFAULT_TIMEOUT, typed=False,
+    ):
+        """
+        Filter and sort stored records through the typed column cache.
+
+        Args:
+            csv_path: Path to CSV file
+            equals: Dict of CSV header -> set of lower-cased accepted values
+            ranges: Dict of typed CSV header -> (low, high), in cents or day ordinals
+            sort: CSV header to sort by
+            descending: Reverse the sort
+            limit: Maximum number of records
+            typed: Return typed values (see iter_typed_records)
+
+        Returns:
+            list of dicts
+        """
+        if not os.path.exists(csv_path):
+            return []
+
+        with csv_lock(csv_path, lock_timeout):
+            cache = self.open_column_cache(csv_path, lock_timeout)
+            return cache.rows(cache.query(equals, ranges, sort, descending, limit), typed)
+
+    def iter_typed_records(self, csv_path, last_n=None, lock_timeout=DEFAULT_TIMEOUT):
+        """
+        Yield stored records with machine-typed values, in CSV order.
+
+        Typed columns come from the column cache already parsed: money as
+        integer cents, dates as datetime.date, Y/N flags as bool, None when
+        blank or unparseable. Other columns keep their display strings.
+
+        Args:
+            csv_path: Path to CSV file
+            last_n: Only the most recent N records
+        """
+        if not os.path.exists(csv_path):
+            return
+        with csv_lock(csv_path, lock_timeout):
+            cache = self.open_column_cache(csv_path, lock_timeout)
+            total = len(cache)
+            first = max(total - last_n, 0) if last_n else 0
+            records = list(cache.iter_typed_rows(range(first, total)))
+        yield from records
+
+    def expiring_records(
+        self, csv_path, within_days, as_of=None, lock_timeout=DEFAULT_TIMEOUT, typed=False
+    ):
+        """
+        Records whose Good Thru falls within `within_days` days of `as_of`.
+
+        Args:
+            csv_path: Path to CSV file
+            within_days: Window length in days (0 = expiring on as_of itself)
+            as_of: datetime.date the window starts on (default: today)
+            typed: Return typed values (see iter_typed_records)
+
+        Returns:
+            list of dicts, soonest expiry first, each with a "Days Left" value
+        """
+        if not os.path.exists(csv_path):
+            return []
+
+        first, last = expiry_window(within_days, as_of)
+        with csv_lock(csv_path, lock_timeout):
+            cache = self.open_column_cache(csv_path, lock_timeout)
+            records = cache.rows(cache.range("Good Thru", first, last), typed)
+        return add_days_left(records, as_of)
+
+    @staticmethod
+    def _open_for_rewrite(csv_path):
+        """
+        Open the CSV for a rewrite. Bytes that are not UTF-8 (e.g. cp1252 from
+        an old Excel save) decode as surrogate escapes, which _rewrite_csv()
+        writes back as the same bytes instead of U+FFFD.
+        """
+        return open(csv_path, "r", newline="", encoding="utf-8-sig", errors="surrogateescape")
+
+    def _rewrite_csv(self, csv_path, fieldnames, rows):
+        """
+        Replace the CSV with `rows`, encoded the way appends write it (UTF-8),
+        with a BOM only if the file already starts with one.
+        """
+        with open(csv_path, "rb") as f:
+            bom = f.read(len(codecs.BOM_UTF8)) == codecs.BOM_UTF8
+        buffer = io.StringIO()
+        if bom:
+            buffer.write("\ufeff")
+        writer = csv.DictWriter(buffer, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+        atomic_write(csv_path, buffer.getvalue(), errors="surrogateescape")
+
+    def compact_csv(self, csv_path, lock_timeout=DEFAULT_TIMEOUT):
+        """
+        Rewrite the CSV without repeated-key rows and blank lines.
+
+        The first row of each key is kept. The new file goes through a temp file,
+        fsync and rename under the CSV lock, so a crash leaves either the old or
+        the new CSV, never a mix. The key index rebuilds on its next open.
+        Kept rows are written back byte for byte, non-UTF-8 bytes included.
+
+        Returns:
+            tuple (kept: int, removed: int)
+        """
+        if not os.path.exists(csv_path):
+            return 0, 0
+
+        with csv_lock(csv_path, lock_timeout):
+            rows = []
+            seen = set()
+            removed = 0
+            with self._open_for_rewrite(csv_path) as f:
+                reader = csv.DictReader(f)
+                fieldnames = reader.fieldnames or self.headers
+                for row in reader:
+                    key = tuple(row.get(col) or "" for col in self.key_columns)
+                    if all(key):
+                        if key in seen:
+                            removed += 1
+                            continue
+                        seen.add(key)
+                    rows.append(row)
+
+            self._rewrite_csv(csv_path, fieldnames, rows)
+        return len(rows), removed
+
+    def backfill(self, csv_path, target, source, lookup, lock_timeout=DEFAULT_TIMEOUT):
+        """
+        Fill empty `target` values from lookup(row[source]).
+
+        The CSV is rewritten the same way as compact_csv() (temp file, fsync,
+        rename under the CSV lock), and only if at least one row changed.
+        Everything but the filled values is written back byte for byte.
+
+        Returns:
+            tuple (filled: int, unresolved: int), unresolved counting rows
+            whose lookup returned nothing
+        """
+        if not os.path.exists(csv_path):
+            return 0, 0
+
+        with csv_lock(csv_path, lock_timeout):
+            rows = []
+            filled = unresolved = 0
+            with self._open_for_rewrite(csv_path) as f:
+                reader = csv.DictReader(f)
+                fieldnames = reader.fieldnames or self.headers
+                for row in reader:
+                    if not (row.get(target) or "").strip():
+                        value = lookup(row.get(source))
+                        if value:
+                            row[target] = value
+                            filled += 1
+                        else:
+                            unresolved += 1
+                    rows.append(row)
+
+            if filled:
+                self._rewrite_csv(csv_path, fieldnames, rows)
+        return filled, unresolved
+
+    # -- SQLite backend ----------------------------------------------------
+
+    def open_store(self, db_path, lock_timeout=DEFAULT_TIMEOUT):
+        """Open this vendor's table in the SQLite database."""
+        return SqliteQuoteStore(
+            db_path, self.db_table, self.headers, self.key_columns, lock_timeout, self.typed_columns
+        ).open()
+
+    def db_append_record(self, db_path, data, lock_timeout=DEFAULT_TIMEOUT):
+        """append_record() for the SQLite backend. Returns (success, message)."""
+        key = self.record_key(data)
+        with self.open_store(db_path, lock_timeout) as store:
+            with store.transaction():
+                if all(key) and store.contains(key):
+                    return False, self._duplicate_message(key)
+                store.insert_rows([self.map_data_to_csv_row(data)])
+            count = store.count()
+        return True, f"Record appended. Total records: {count}"
+
+    def db_append_records(self, db_path, records, lock_timeout=DEFAULT_TIMEOUT):
+        """append_records() for the SQLite backend. Returns (results, total)."""
+        with self.open_store(db_path, lock_timeout) as store:
+            with store.transaction():
+                results, rows = self.plan_appends(records, store.contains)
+                store.insert_rows(rows)
+            return results, store.count()
+
+    def db_read_records(self, db_path, last_n=10, lock_timeout=DEFAULT_TIMEOUT):
+        """read_records() for the SQLite backend."""
+        with self.open_store(db_path, lock_timeout) as store:
+            return list(store.iter_rows(last_n))
+
+    def db_count_records(self, db_path, lock_timeout=DEFAULT_TIMEOUT):
+        """count_records() for the SQLite backend."""
+        with self.open_store(db_path, lock_timeout) as store:
+            return store.count()
+
+    def db_query_records(
+        self, db_path, equals=None, ranges=None, sort=None, descending=False, limit=None,
+        lock_timeout=DEFAULT_TIMEOUT, typed=False,
+    ):
+        """query_records() for the SQLite backend."""
+        with self.open_store(db_path, lock_timeout) as store:
+            return store.query(equals, ranges, sort, descending, limit, typed)
+
+    def db_expiring_records(
+        self, db_path, within_days, as_of=None, lock_timeout=DEFAULT_TIMEOUT, typed=False
+    ):
+        """expiring_records() for the SQLite backend (range scan on the Good Thru index)."""
+        first, last = expiry_window(within_days, as_of)
+        with self.open_store(db_path, lock_timeout) as store:
+            records = store.query(ranges={"Good Thru": (first, last)}, sort="Good Thru", typed=typed)
+        return add_days_left(records, as_of)
+
+    def db_iter_typed_records(self, db_path, last_n=None, lock_timeout=DEFAULT_TIMEOUT):
+        """iter_typed_records() for the SQLite backend (reads the hidden typed columns)."""
+        with self.open_store(db_path, lock_timeout) as store:
+            yield from store.iter_rows(last_n, typed=True)
+
+    def db_backfill(self, db_path, target, source, lookup, lock_timeout=DEFAULT_TIMEOUT):
+        """backfill() for the SQLite backend. Returns (filled, unresolved)."""
+        with self.open_store(db_path, lock_timeout) as store:
+            with store.transaction():
+                return store.backfill(target, source, lookup)
+
+    def db_import_csv(self, db_path, csv_path, lock_timeout=DEFAULT_TIMEOUT):
+        """
+        Copy CSV rows into the database, skipping keys it already holds.
+        Returns (imported, skipped).
+        """
+        rows = []
+        seen = set()
+        skipped = 0
+        with self.open_store(db_path, lock_timeout) as store:
+            with store.transaction():
+                with open(csv_path, "r", newline="", encoding=self.encoding, errors=self.errors) as f:
+                    for row in csv.DictReader(f):
+                        row = {h: row.get(h) or "" for h in self.headers}
+                        key = tuple(row[col] for col in self.key_columns)
+                        if all(key) and (key in seen or store.contains(key)):
+                            skipped += 1
+                            continue
+                        seen.add(key)
+                        rows.append(row)
+                store.insert_rows(rows)
+        return len(rows), skipped
+
+    def db_export_csv(self, db_path, output_path, lock_timeout=DEFAULT_TIMEOUT):
+        """Write the database table to a CSV file. Returns the row count."""
+        with self.open_store(db_path, lock_timeout) as store:
+            return store.export_csv(output_path)
+
+    # -- Output ------------------------------------------------------------
+
+    def print_records(self, records, as_json, title="Last"):
+        """Print records as JSON or as a one-line-per-record table."""
+        if as_json:
+            print(json.dumps(records, indent=2, default=str))  # Typed dates -> YYYY-MM-DD
+        else:
+            if not records:
+                print("No records found.")
+            else:
+                print(f"{title} {len(records)} record(s):")
+                print("-" * 80)
+                for i, rec in enumerate(records, 1):
+                    number = rec.get(self.key_label, "N/A")
+                    quote_date = rec.get("Quote Date", "N/A")
+                    desc = rec.get("Dimensions and Basic Description", "N/A")
+                    price = rec.get(self.price_column, "N/A")
+                    print(f"  {i}. {self.key_label}{number} | {quote_date} | {desc} | {price}")
+                print("-" * 80)
+
+    def query_filters(self, args):
+        """
+        Build (equals, ranges) query filters from the command line.
+        Raises ValueError for an unparseable date.
+        """
+        equals = {}
+        for header, value in zip(EQUALS_COLUMNS, (args.state, args.type, args.location)):
+            if value:
+                equals[header] = {v.strip().lower() for v in value.split(",") if v.strip()}
+
+        ranges = {}
+        bounds = []
+        for flag, value in (("--date-from", args.date_from), ("--date-to", args.date_to)):
+            parsed = parse_date(value) if value else None
+            if value and parsed is None:
+                raise ValueError(f"Invalid {flag} date: {value} (use MM/DD/YYYY or YYYY-MM-DD)")
+            bounds.append(parsed.toordinal() if parsed else None)
+        if any(b is not None for b in bounds):
+            ranges["Quote Date"] = tuple(bounds)
+
+        prices = [
+            round(value * 100) if value is not None else None
+            for value in (args.min_price, args.max_price)
+        ]
+        if any(p is not None for p in prices):
+            ranges[self.price_column] = tuple(prices)
+        return equals, ranges
+
+
+def build_parser(handler, description):
+    """The csv_handler.py command line for one vendor."""
+    backfill_help = "".join(
+        f"{action} (fill empty {target} from {source}), "
+        for action, (target, source, _) in handler.backfills.items()
+    )
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument(
+        "--action",
+        type=str,
+        required=True,
+        choices=[
+            "append", "append-bulk", "read", "count", "query", "expiring",
+            "compact", *handler.backfills, "import", "export",
+        ],
+        help="Action to perform: append, append-bulk, read, count, query, expiring "
+        "(Good Thru within --within days), compact (drop "
+        f"repeated rows from the CSV), {backfill_help}import (CSV into the database) or export "
+        "(database to CSV)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["csv", "sqlite"],
+        default="csv",
+        help="Storage backend (default: csv)",
+    )
+    parser.add_argument(
+        "--db-path",
+        type=str,
+        default=handler.default_db_path,
+        help=f"SQLite database for --backend sqlite (default: {handler.default_db_path})",
+    )
+    parser.add_argument(
+        "--output",
+        type=str,
+        help="Destination CSV for the export action",
+    )
+    parser.add_argument(
+        "--data",
+        type=str,
+        default="{}",
+        help="JSON data for append action",
+    )
+    parser.add_argument(
+        "--input",
+        type=str,
+        default="-",
+        help="NDJSON file for append-bulk, one record per line (default: stdin)",
+    )
+    parser.add_argument(
+        "--csv-path",
+        type=str,
+        default=handler.default_csv_path,
+        help=f"Path to CSV file (default: {handler.default_csv_path})",
+    )
+    parser.add_argument(
+        "--last-n",
+        type=int,
+        default=10,
+        help="Number of recent records to read (default: 10)",
+    )
+    query_group = parser.add_argument_group("query filters")
+    query_group.add_argument("--state", help="State(s), comma-separated (e.g. NJ,NY)")
+    query_group.add_argument("--type", help="Type(s), comma-separated (Cooler, Freezer)")
+    query_group.add_argument("--location", help="Location(s), comma-separated (Indoor, Outdoor)")
+    query_group.add_argument("--date-from", help="Earliest Quote Date, inclusive")
+    query_group.add_argument("--date-to", help="Latest Quote Date, inclusive")
+    query_group.add_argument(
+        "--min-price", type=float, help=f"Minimum {handler.price_column} in dollars"
+    )
+    query_group.add_argument(
+        "--max-price", type=float, help=f"Maximum {handler.price_column} in dollars"
+    )
+    query_group.add_argument("--sort", choices=sorted(handler.sort_columns), help="Sort results by")
+    query_group.add_argument("--desc", action="store_true", help="Sort descending")
+    query_group.add_argument("--limit", type=int, help="Maximum number of results")
+    expiry_group = parser.add_argument_group("expiring")
+    expiry_group.add_argument(
+        "--within", type=int, default=7, help="Days ahead to look for expiring quotes (default: 7)"
+    )
+    expiry_group.add_argument("--as-of", help="Start the window on this date instead of today")
+    parser.add_argument(
+        "--lock-timeout",
+        type=float,
+        default=DEFAULT_TIMEOUT,
+        help=f"Seconds to wait for another session's write lock (default: {DEFAULT_TIMEOUT:g})",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Output as JSON",
+    )
+    parser.add_argument(
+        "--typed",
+        action="store_true",
+        help="With --json for read, query and expiring: prices as integer cents, dates as "
+        "YYYY-MM-DD and Y/N flags as true/false",
+    )
+    return parser
+
+
+def run_cli(handler, description, argv=None):
+    """Parse the command line and run one csv_handler.py action for `handler`."""
+    parser = build_parser(handler, description)
+    args = parser.parse_args(argv)
+    sqlite_backend = args.backend == "sqlite"
+
+    if args.action == "compact" and sqlite_backend:
+        parser.error("--action compact applies to the CSV backend only")
+    if args.action in ("import", "export") and not sqlite_backend:
+        parser.error(f"--action {args.action} requires --backend sqlite")
+    if args.action == "export" and not args.output:
+        parser.error("--action export requires --output")
+    if args.typed and (not args.json or args.action not in ("read", "query", "expiring")):
+        parser.error("--typed applies to --json output of read, query and expiring")
+
+    try:
+        if args.action == "append":
+            try:
+                data = json.loads(args.data)
+            except json.JSONDecodeError:
+                print(f"Error: Invalid JSON for --data: {args.data}", file=sys.stderr)
+                sys.exit(1)
+
+            if sqlite_backend:
+                success, message = handler.db_append_record(args.db_path, data, lock_timeout=args.lock_timeout)
+            else:
+                success, message = handler.append_record(args.csv_path, data, lock_timeout=args.lock_timeout)
+            if args.json:
+                print(json.dumps({"success": success, "message": message}))
+            else:
+                status = "OK" if success else "SKIPPED"
+                print(f"[{status}] {message}")
+
+            if not success:
+                sys.exit(1)
+
+        elif args.action == "append-bulk":
+            def append_many(records):
+                if sqlite_backend:
+                    return handler.db_append_records(args.db_path, records, lock_timeout=args.lock_timeout)
+                return handler.append_records(args.csv_path, records, lock_timeout=args.lock_timeout)
+
+            if args.input == "-":
+                results, total = append_many(iter_ndjson(sys.stdin))
+            else:
+                try:
+                    with open(args.input, "r", encoding="utf-8-sig") as f:
+                        results, total = append_many(iter_ndjson(f))
+                except OSError as e:
+                    print(f"Error: Cannot read --input: {e}", file=sys.stderr)
+                    sys.exit(1)
+
+            summary = {
+                status: sum(1 for r in results if r["status"] == status)
+                for status in ("accepted", "skipped", "error")
+            }
+            if args.json:
+                print(json.dumps({**summary, "total_records": total, "results": results}, indent=2))
+            else:
+                labels = {"accepted": "OK", "skipped": "SKIPPED", "error": "ERROR"}
+                for r in results:
+                    print(f"[{labels[r['status']]}] {r['record']}. {r['key']}: {r['message']}")
+                print(
+                    f"Accepted: {summary['accepted']} | Skipped: {summary['skipped']} | "
+                    f"Errors: {summary['error']} | Total records: {total}"
+                )
+
+            if summary["error"]:
+                sys.exit(1)
+
+        elif args.action == "read" and args.typed:
+            if sqlite_backend:
+                records = list(handler.db_iter_typed_records(args.db_path, args.last_n, lock_timeout=args.lock_timeout))
+            else:
+                records = list(handler.iter_typed_records(args.csv_path, args.last_n, lock_timeout=args.lock_timeout))
+            handler.print_records(records, args.json)
+
+        elif args.action == "read":
+            if sqlite_backend:
+                records = handler.db_read_records(args.db_path, args.last_n, lock_timeout=args.lock_timeout)
+            else:
+                records = handler.read_records(args.csv_path, args.last_n, lock_timeout=args.lock_timeout)
+            handler.print_records(records, args.json)
+
+        elif args.action == "count":
+            if sqlite_backend:
+                count = handler.db_count_records(args.db_path, lock_timeout=args.lock_timeout)
+            else:
+                count = handler.count_records(args.csv_path, lock_timeout=args.lock_timeout)
+            if args.json:
+                print(json.dumps({"count": count}))
+            else:
+                print(f"Total records: {count}")
+
+        elif args.action == "query":
+            try:
+                equals, ranges = handler.query_filters(args)
+            except ValueError as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(1)
+            sort = handler.sort_columns.get(args.sort)
+            if sqlite_backend:
+                records = handler.db_query_records(
+                    args.db_path, equals, ranges, sort, args.desc, args.limit,
+                    lock_timeout=args.lock_timeout, typed=args.typed,
+                )
+            else:
+                records = handler.query_records(
+                    args.csv_path, equals, ranges, sort, args.desc, args.limit,
+                    lock_timeout=args.lock_timeout, typed=args.typed,
+                )
+            handler.print_records(records, args.json, title="Matched")
+
+        elif args.action == "expiring":
+            as_of = parse_date(args.as_of) if args.as_of else None
+            if args.as_of and as_of is None:
+                print(f"Error: Invalid --as-of date: {args.as_of}", file=sys.stderr)
+                sys.exit(1)
+            if sqlite_backend:
+                records = handler.db_expiring_records(
+                    args.db_path, args.within, as_of, lock_timeout=args.lock_timeout, typed=args.typed
+                )
+            else:
+                records = handler.expiring_records(
+                    args.csv_path, args.within, as_of, lock_timeout=args.lock_timeout, typed=args.typed
+                )
+            if args.json:
+                print(json.dumps(records, indent=2, default=str))
+            elif not records:
+                print(f"No quotes expire in the next {args.within} day(s).")
+            else:
+                print(f"{len(records)} quote(s) expiring in the next {args.within} day(s):")
+                print("-" * 80)
+                for rec in records:
+                    print(
+                        f"  {handler.key_label}{rec.get(handler.key_label, 'N/A')} | "
+                        f"Good Thru {rec.get('Good Thru')} ({rec['Days Left']}d) | "
+                        f"{rec.get('Customer Job', '')} | {rec.get(handler.price_column, '')}"
+                    )
+                print("-" * 80)
+
+        elif args.action == "compact":
+            try:
+                kept, removed = handler.compact_csv(args.csv_path, lock_timeout=args.lock_timeout)
+            except OSError as e:
+                # e.g. the CSV is open in Excel on Windows, which blocks the rename
+                print(f"Error: Cannot rewrite {args.csv_path}: {e}", file=sys.stderr)
+                sys.exit(1)
+            if args.json:
+                print(json.dumps({"kept": kept, "removed": removed}))
+            else:
+                print(f"Compacted {args.csv_path}: kept {kept} record(s), removed {removed} repeated row(s)")
+
+        elif args.action in handler.backfills:
+            target, source, lookup = handler.backfills[args.action]
+            if sqlite_backend:
+                filled, unresolved = handler.db_backfill(
+                    args.db_path, target, source, lookup, lock_timeout=args.lock_timeout
+                )
+            else:
+                try:
+                    filled, unresolved = handler.backfill(
+                        args.csv_path, target, source, lookup, lock_timeout=args.lock_timeout
+                    )
+                except OSError as e:
+                    print(f"Error: Cannot rewrite {args.csv_path}: {e}", file=sys.stderr)
+                    sys.exit(1)
+            if args.json:
+                print(json.dumps({"filled": filled, "unresolved": unresolved}))
+            else:
+                print(f"Filled {target} on {filled} record(s); {unresolved} without a resolvable {source}")
+
+        elif args.action == "import":
+            try:
+                imported, skipped = handler.db_import_csv(args.db_path, args.csv_path, lock_timeout=args.lock_timeout)
+            except OSError as e:
+                print(f"Error: Cannot read {args.csv_path}: {e}", file=sys.stderr)
+                sys.exit(1)
+            if args.json:
+                print(json.dumps({"imported": imported, "skipped": skipped}))
+            else:
+                print(f"Imported {imported} record(s) into {args.db_path} ({skipped} duplicate(s) skipped)")
+
+        elif args.action == "export":
+            try:
+                count = handler.db_export_csv(args.db_path, args.output, lock_timeout=args.lock_timeout)
+            except OSError as e:
+                print(f"Error: Cannot write {args.output}: {e}", file=sys.stderr)
+                sys.exit(1)
+            if args.json:
+                print(json.dumps({"exported": count, "output": args.output}))
+            else:
+                print(f"Exported {count} record(s) to {args.output}")
+
+    except (LockTimeout, sqlite3.OperationalError) as e:
+        # Another session held the CSV lock / database for longer than --lock-timeout
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+SQLite Quote Store
+
+Embedded database backend for the quote CSV handlers. AK and CCI share one
+database file with one table per vendor. Each table has one TEXT column per
+CSV header, holding exactly what the CSV would hold, plus a hidden typed copy
+of each typed header, filled on insert: ISO dates (quote_date_iso,
+good_thru_iso), integer cents for money (net_price_cents) and 0/1 for Y/N
+flags (combo_flag). Queries and iter_typed_rows() read the typed copies, so
+prices are never re-parsed from "$12,345.00". Typed columns added to an
+existing table are created and filled when it is opened.
+
+Indexed: the duplicate key, State, Type, Quote Date and Good Thru.
+Appends run in an IMMEDIATE transaction, so the duplicate check and the
+insert are atomic across concurrent writers.
+"""
+
+import csv
+import os
+import re
+import sqlite3
+import tempfile
+from contextlib import contextmanager
+from datetime import date
+
+from file_lock import replace_mode
+from quote_values import iso_date, parse_bool, parse_money_cents
+
+# Hidden ISO date columns: (column name, source CSV header)
+ISO_COLUMNS = (("quote_date_iso", "Quote Date"), ("good_thru_iso", "Good Thru"))
+
+
+def _flag(value):
+    parsed = parse_bool(value)
+    return None if parsed is None else int(parsed)
+
+
+# Typed column kind -> (hidden column suffix, SQL type, display string -> stored value)
+TYPED_STORAGE = {
+    "date": ("_iso", "TEXT", iso_date),
+    "money": ("_cents", "INTEGER", parse_money_cents),
+    "bool": ("_flag", "INTEGER", _flag),
+}
+
+# Typed column kind -> stored value -> typed row value (money stays int cents)
+FROM_STORAGE = {"date": date.fromisoformat, "bool": bool}
+
+# Extra indexed CSV headers besides the key
+INDEXED_COLUMNS = ("State", "Type")
+
+# Seconds to wait for another writer's lock before giving up
+BUSY_TIMEOUT = 30.0
+
+
+def quote_ident(name):
+    """Quote a column or table name for SQL ("Quote #" -> "\"Quote #\"")."""
+    return '"' + name.replace('"', '""') + '"'
+
+
+def typed_column_name(header, kind):
+    """Hidden column for a header's typed value ("Net Price", "money" -> "net_price_cents")."""
+    slug = re.sub(r"[^0-9a-z]+", "_", header.lower()).strip("_")
+    return slug + TYPED_STORAGE[kind][0]
+
+
+class SqliteQuoteStore:
+    """
+    One vendor's quote table in a shared SQLite database.
+
+    Args:
+        db_path: Database file (created on first use)
+        table: Table name for this vendor
+        headers: CSV headers, in CSV column order
+        key_columns: Headers that make up the duplicate key
+        timeout: Seconds to wait for another writer's lock
+        typed_columns: Dict of header -> kind ("money", "date" or "bool");
+            each gets a hidden typed column
+    """
+
+    def __init__(
+        self, db_path, table, headers, key_columns, timeout=BUSY_TIMEOUT, typed_columns=None
+    ):
+        self.db_path = db_path
+        self.table = table
+        self.headers = list(headers)
+        self.key_columns = tuple(key_columns)
+        self.timeout = timeout
+        self.typed_columns = dict(typed_columns or {})
+        # Hidden columns: (column name, source header, kind); ISO dates always exist
+        kinds = {source: "date" for _, source in ISO_COLUMNS}
+        kinds.update(typed_columns or {})
+        self.hidden_columns = [
+            (typed_column_name(header, kind), header, kind) for header, kind in kinds.items()
+        ]
+        self._conn = None
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def open(self):
+        """Connect and create the table and indexes if needed."""
+        directory = os.path.dirname(os.path.abspath(self.db_path))
+        os.makedirs(directory, exist_ok=True)
+        # isolation_level=None: transactions are started explicitly below
+        self._conn = sqlite3.connect(self.db_path, timeout=self.timeout, isolation_level=None)
+        table = quote_ident(self.table)
+        columns = ", ".join(f"{quote_ident(h)} TEXT" for h in self.headers)
+        hidden = ", ".join(
+            f"{name} {TYPED_STORAGE[kind][1]}" for name, _, kind in self.hidden_columns
+        )
+        key = ", ".join(quote_ident(c) for c in self.key_columns)
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} (id INTEGER PRIMARY KEY, {columns}, {hidden})"
+        )
+        self._add_missing_columns()
+        statements = [
+            f"CREATE INDEX IF NOT EXISTS {quote_ident(self.table + '_key')} ON {table} ({key})",
+        ]
+        for header in INDEXED_COLUMNS:
+            if header in self.headers:
+                name = quote_ident(f"{self.table}_{header.lower()}")
+                statements.append(
+                    f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({quote_ident(header)})"
+                )
+        for column, _ in ISO_COLUMNS:
+            name = quote_ident(f"{self.table}_{column}")
+            statements.append(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({column})")
+        for statement in statements:
+            self._conn.execute(statement)
+        return self
+
+    def _add_missing_columns(self):
+        """Add hidden typed columns missing from an older table and fill them."""
+        table = quote_ident(self.table)
+        existing = {row[1] for row in self._conn.execute(f"PRAGMA table_info({table})")}
+        missing = [entry for entry in self.hidden_columns if entry[0] not in existing]
+        if not missing:
+            return
+        with self.transaction():
+            for name, header, kind in missing:
+                self._conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {TYPED_STORAGE[kind][1]}")
+                convert = TYPED_STORAGE[kind][2]
+                rows = self._conn.execute(f"SELECT id, {quote_ident(header)} FROM {table}").fetchall()
+                self._conn.executemany(
+                    f"UPDATE {table} SET {name} = ? WHERE id = ?",
+                    ((convert(value), row_id) for row_id, value in rows),
+                )
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    @contextmanager
+    def transaction(self):
+        """Write transaction; the database write lock is taken up front."""
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield self
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def contains(self, values):
+        """True if a row with these key values exists."""
+        where = " AND ".join(f"{quote_ident(c)} = ?" for c in self.key_columns)
+        row = self._conn.execute(
+            f"SELECT 1 FROM {quote_ident(self.table)} WHERE {where} LIMIT 1", tuple(values)
+        ).fetchone()
+        return row is not None
+
+    def insert_rows(self, rows):
+        """Insert CSV-style row dicts (header -> display string)."""
+        columns = [quote_ident(h) for h in self.headers] + [name for name, _, _ in self.hidden_columns]
+        placeholders = ", ".join("?" for _ in columns)
+        self._conn.executemany(
+            f"INSERT INTO {quote_ident(self.table)} ({', '.join(columns)}) VALUES ({placeholders})",
+            (
+                [row.get(h, "") for h in self.headers]
+                + [TYPED_STORAGE[kind][2](row.get(header)) for _, header, kind in self.hidden_columns]
+                for row in rows
+            ),
+        )
+
+    def count(self):
+        """Number of stored rows."""
+        return self._conn.execute(f"SELECT COUNT(*) FROM {quote_ident(self.table)}").fetchone()[0]
+
+    def _columns(self, typed):
+        """SELECT list for rows: the display columns, plus the hidden typed ones."""
+        columns = [quote_ident(h) for h in self.headers]
+        if typed:
+            columns += [name for name, _, _ in self.hidden_columns]
+        return ", ".join(columns)
+
+    def _row(self, values, typed):
+        """
+        Row dict from a SELECT built by _columns(). Typed rows hold machine
+        values for typed headers: cents as int, dates as datetime.date,
+        flags as bool (None if blank or unparseable).
+        """
+        row = dict(zip(self.headers, ("" if v is None else v for v in values)))
+        if typed:
+            for (_, header, kind), value in zip(self.hidden_columns, values[len(self.headers):]):
+                if value is not None and kind in FROM_STORAGE:
+                    value = FROM_STORAGE[kind](value)
+                row[header] = value
+        return row
+
+    def iter_rows(self, last_n=None, typed=False):
+        """
+        Yield rows as dicts in insertion order (CSV header keys).
+        last_n limits the output to the most recent rows; typed=True returns
+        typed values (see _row()).
+        """
+        columns = self._columns(typed)
+        table = quote_ident(self.table)
+        if last_n:
+            sql = (
+                f"SELECT {columns} FROM (SELECT id, {columns} FROM {table} "
+                f"ORDER BY id DESC LIMIT ?) ORDER BY id"
+            )
+            cursor = self._conn.execute(sql, (last_n,))
+        else:
+            cursor = self._conn.execute(f"SELECT {columns} FROM {table} ORDER BY id")
+        for values in cursor:
+            yield self._row(values, typed)
+
+    def backfill(self, header, source, lookup):
+        """
+        Fill empty `header` values from `source` (e.g. State from the ZIP)
+        using lookup(source value) -> value or None. Run inside transaction().
+
+        Returns:
+            tuple (filled: int, unresolved: int)
+        """
+        table = quote_ident(self.table)
+        target = quote_ident(header)
+        rows = self._conn.execute(
+            f"SELECT id, {quote_ident(source)} FROM {table} "
+            f"WHERE {target} IS NULL OR TRIM({target}) = ''"
+        ).fetchall()
+        updates = []
+        for row_id, value in rows:
+            filled = lookup(value)
+            if filled:
+                updates.append((filled, row_id))
+        self._conn.executemany(f"UPDATE {table} SET {target} = ? WHERE id = ?", updates)
+        return len(updates), len(rows) - len(updates)
+
+    def _typed_expression(self, header):
+        """
+        SQL expression for a header's typed value (same units as quote_columns):
+        the hidden typed column (cents, ISO date ordered like the day ordinal,
+        0/1 flag), else the lower-cased display string.
+        """
+        kind = self.typed_columns.get(header)
+        if kind:
+            return typed_column_name(header, kind)
+        return f"NULLIF(LOWER(TRIM({quote_ident(header)})), '')"
+
+    def query(
+        self, equals=None, ranges=None, sort=None, descending=False, limit=None, typed=False
+    ):
+        """
+        Rows matching every filter; same arguments as ColumnCache.query().
+        Date bounds are day ordinals. Returns list of dicts (CSV header keys),
+        with typed values if typed=True (see _row()).
+        """
+        where = []
+        params = []
+        for header, accepted in (equals or {}).items():
+            where.append(
+                f"LOWER(TRIM({quote_ident(header)})) IN ({', '.join('?' for _ in accepted)})"
+            )
+            params.extend(sorted(accepted))
+        for header, bounds in (ranges or {}).items():
+            expression = self._typed_expression(header)
+            if self.typed_columns.get(header) == "date":
+                bounds = [date.fromordinal(b).isoformat() if b is not None else None for b in bounds]
+            where.append(f"{expression} IS NOT NULL")
+            for operator, bound in zip((">=", "<="), bounds):
+                if bound is not None:
+                    where.append(f"{expression} {operator} ?")
+                    params.append(bound)
+
+        sql = f"SELECT {self._columns(typed)} FROM {quote_ident(self.table)}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        if sort:
+            expression = self._typed_expression(sort)
+            direction = "DESC" if descending else "ASC"
+            sql += f" ORDER BY {expression} IS NULL, {expression} {direction}, id"
+        else:
+            sql += " ORDER BY id"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [self._row(values, typed) for values in self._conn.execute(sql, params)]
+
+    def export_csv(self, csv_path, encoding="utf-8"):
+        """Write every row to a CSV file (atomic replace). Returns the row count."""
+        directory = os.path.dirname(os.path.abspath(csv_path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        count = 0
+        try:
+            with os.fdopen(fd, "w", newline="", encoding=encoding) as f:
+                writer = csv.DictWriter(f, fieldnames=self.headers)
+                writer.writeheader()
+                for row in self.iter_rows():
+                    writer.writerow(row)
+                    count += 1
+                f.flush()
+                os.fsync(f.fileno())
+            os.chmod(tmp_path, replace_mode(csv_path))
+            os.replace(tmp_path, csv_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return count
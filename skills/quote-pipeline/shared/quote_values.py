@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Quote Field Value Parsing
+
+Converts the display strings stored in the quote CSVs into machine values
+(dates, integer cents, booleans). Shared by the storage helpers (SQLite backend,
+column cache) so every one of them parses values the same way.
+"""
+
+import math
+from datetime import datetime
+
+# Y/N flag spellings (Combo, Reach-In)
+TRUE_VALUES = ("y", "yes", "true", "1")
+FALSE_VALUES = ("n", "no", "false", "0")
+
+# Quote dates appear as MM/DD/YYYY (AK, normalized by the extractor) or as
+# printed on the PDF (CCI: M/D/YY, M-D-YYYY, ...)
+DATE_FORMATS = ("%m/%d/%Y", "%m/%d/%y", "%m-%d-%Y", "%m-%d-%y", "%Y-%m-%d")
+
+# Largest amount in cents that fits a SQLite INTEGER (signed 64-bit)
+MAX_CENTS = 2**63 - 1
+
+
+def parse_date(value):
+    """Parse a quote date string. Returns datetime.date, or None if unparseable."""
+    if not value:
+        return None
+    value = str(value).strip()
+    for fmt in DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def iso_date(value):
+    """Quote date string as YYYY-MM-DD, or None if unparseable."""
+    parsed = parse_date(value)
+    return parsed.isoformat() if parsed else None
+
+
+def parse_money_cents(value):
+    """
+    Parse a currency string ("$12,345.00", "12345", "-$50") into integer cents.
+    Returns None when blank, unparseable, not finite ("nan", "inf", "1e400")
+    or too large to store (MAX_CENTS).
+    """
+    if value is None:
+        return None
+    text = str(value).strip().replace("$", "").replace(",", "")
+    if not text:
+        return None
+    try:
+        amount = float(text)
+    except ValueError:
+        return None
+    if not math.isfinite(amount):
+        return None
+    cents = int(round(amount * 100))
+    return cents if abs(cents) <= MAX_CENTS else None
+
+
+def parse_bool(value):
+    """Parse a Y/N flag ("Y", "No", "true", ...) into True/False, or None if blank/unknown."""
+    if value is None:
+        return None
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    return None
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Extracted-Text Corpus
+
+Persistent store of raw PDF text so regex refinements can be replayed
+without re-parsing PDFs with pypdf. One gzip-compressed JSON entry per PDF,
+keyed by the PDF's SHA-256, holding the file name and one text entry per
+page (each page's text includes its trailing newline, so joining the pages
+reproduces the full-document text the extractors see).
+"""
+
+import gzip
+import json
+import os
+import tempfile
+
+
+class TextCorpus:
+    """
+    Directory-backed store of per-page PDF text.
+
+    Args:
+        corpus_dir: Directory holding one <sha256>.json.gz file per PDF
+    """
+
+    def __init__(self, corpus_dir):
+        self.corpus_dir = corpus_dir
+
+    def _entry_path(self, pdf_sha):
+        return os.path.join(self.corpus_dir, f"{pdf_sha}.json.gz")
+
+    def has(self, pdf_sha):
+        """Check whether a PDF's text is already stored."""
+        return os.path.exists(self._entry_path(pdf_sha))
+
+    def get(self, pdf_sha):
+        """Return (filename, pages) for a PDF hash, or None if not stored."""
+        try:
+            with gzip.open(self._entry_path(pdf_sha), "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return entry["filename"], entry["pages"]
+
+    def put(self, pdf_sha, filename, pages):
+        """Store the page texts for a PDF (atomic replace)."""
+        os.makedirs(self.corpus_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.corpus_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as raw:
+                with gzip.GzipFile(fileobj=raw, mode="wb") as f:
+                    f.write(
+                        json.dumps({"filename": filename, "pages": list(pages)}).encode(
+                            "utf-8"
+                        )
+                    )
+            os.replace(tmp_path, self._entry_path(pdf_sha))
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def __len__(self):
+        return len(self.hashes())
+
+    def hashes(self):
+        """List stored PDF hashes in a stable (sorted) order."""
+        try:
+            names = os.listdir(self.corpus_dir)
+        except OSError:
+            return []
+        return sorted(n[: -len(".json.gz")] for n in names if n.endswith(".json.gz"))
+
+    def __iter__(self):
+        """Yield (pdf_sha, filename, pages) for every stored PDF."""
+        for pdf_sha in self.hashes():
+            entry = self.get(pdf_sha)
+            if entry is not None:
+                yield (pdf_sha,) + entry
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Tests for shared/csv_index.py (composite-key and row-offset sidecar index).
+
+Run from skills/quote-pipeline: python -m pytest -q tests
+"""
+
+import csv
+import io
+import os
+import sys
+import tempfile
+import unittest
+
+SHARED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared")
+if SHARED_DIR not in sys.path:
+    sys.path.append(SHARED_DIR)
+
+from csv_index import CsvIndex, encode_rows, index_path_for, iter_raw_records
+
+HEADERS = ["Quote #", "Quote Date", "Notes"]
+KEY_COLUMNS = ("Quote #", "Quote Date")
+
+
+def write_csv(path, rows, mode="w"):
+    with open(path, mode, newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=HEADERS)
+        if mode == "w":
+            writer.writeheader()
+        writer.writerows(rows)
+
+
+def row(number, quote_date, notes=""):
+    return {"Quote #": number, "Quote Date": quote_date, "Notes": notes}
+
+
+class IterRawRecordsTest(unittest.TestCase):
+    def test_quoted_line_breaks_stay_in_one_record(self):
+        data = b'a,b\r\n1,"two\r\nlines"\r\n3,"say ""hi"""\r\n4,x'
+        records = list(iter_raw_records(io.BytesIO(data)))
+        self.assertEqual(
+            [raw for _, raw in records],
+            [b"a,b\r\n", b'1,"two\r\nlines"\r\n', b'3,"say ""hi"""\r\n', b"4,x"],
+        )
+        self.assertEqual([offset for offset, _ in records], [0, 5, 21, 37])
+
+    def test_start_offset(self):
+        records = list(iter_raw_records(io.BytesIO(b"x\ny\n"), offset=100))
+        self.assertEqual(records, [(100, b"x\n"), (102, b"y\n")])
+
+
+class EncodeRowsTest(unittest.TestCase):
+    def test_matches_dictwriter_output(self):
+        rows = [row("26-00001", "01/02/2026", "café"), row("26-00002", "01/03/2026", 'a "b"\nc')]
+        data, sizes = encode_rows(rows, HEADERS)
+        buffer = io.StringIO()
+        csv.DictWriter(buffer, fieldnames=HEADERS).writerows(rows)
+        self.assertEqual(data, buffer.getvalue())
+        self.assertEqual(sum(sizes), len(data.encode("utf-8")))
+        self.assertEqual(len(sizes), 2)
+
+
+class CsvIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "quotes.csv")
+        write_csv(
+            self.csv_path,
+            [
+                row("26-00001", "01/02/2026"),
+                row("26-00002", "01/03/2026", "multi\nline"),
+                row("26-00003", "01/04/2026"),
+            ],
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_builds_from_csv(self):
+        with CsvIndex(self.csv_path, KEY_COLUMNS) as index:
+            self.assertEqual(index.count(), 3)
+            self.assertTrue(index.contains(("26-00002", "01/03/2026")))
+            self.assertFalse(index.contains(("26-00002", "01/04/2026")))
+        self.assertTrue(os.path.exists(index_path_for(self.csv_path)))
+
+    def test_tail_offset_reads_last_rows(self):
+        with CsvIndex(self.csv_path, KEY_COLUMNS) as index:
+            offset = index.tail_offset(2)
+        with open(self.csv_path, "rb") as f:
+            f.seek(offset)
+            rest = f.read().decode("utf-8")
+        numbers = [r[0] for r in csv.reader(io.StringIO(rest))]
+        self.assertEqual(numbers, ["26-00002", "26-00003"])
+
+    def test_add_keeps_index_current(self):
+        offset = os.path.getsize(self.csv_path)
+        with CsvIndex(self.csv_path, KEY_COLUMNS) as index:
+            write_csv(self.csv_path, [row("26-00004", "01/05/2026")], mode="a")
+            index.add(("26-00004", "01/05/2026"), offset)
+        with CsvIndex(self.csv_path, KEY_COLUMNS) as index:
+            # Stored size/mtime match, so this is the recorded state, not a rebuild
+            self.assertEqual(index._stored_state(), index._file_state())
+            self.assertEqual(index.count(), 4)
+            self.assertEqual(index.tail_offset(1), offset)
+
+    def test_rebuilds_after_outside_edit(self):
+        with CsvIndex(self.csv_path, KEY_COLUMNS) as index:
+            self.assertEqual(index.count(), 3)
+        write_csv(self.csv_path, [row("26-00009", "02/01/2026")])
+        with CsvIndex(self.csv_path, KEY_COLUMNS) as index:
+            self.assertEqual(index.count(), 1)
+            self.assertTrue(index.contains(("26-00009", "02/01/2026")))
+            self.assertFalse(index.contains(("26-00001", "01/02/2026")))
+
+    def test_missing_csv_is_empty(self):
+        os.remove(self.csv_path)
+        with CsvIndex(self.csv_path, KEY_COLUMNS) as index:
+            self.assertEqual(index.count(), 0)
+            self.assertIsNone(index.tail_offset(5))
+
+
+if __name__ == "__main__":
+    unittest.main()
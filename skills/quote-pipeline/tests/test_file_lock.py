@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Tests for shared/file_lock.py (advisory CSV lock and atomic writes).
+
+Run from skills/quote-pipeline: python -m pytest -q tests
+"""
+
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+SHARED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared")
+if SHARED_DIR not in sys.path:
+    sys.path.append(SHARED_DIR)
+
+from file_lock import FileLock, LockTimeout, atomic_write, lock_path_for, replace_mode
+
+# Holds the lock in another process until its stdin is closed
+HOLDER = """
+import sys
+sys.path.append(sys.argv[1])
+from file_lock import FileLock
+with FileLock(sys.argv[2]):
+    print("locked", flush=True)
+    sys.stdin.read()
+"""
+
+
+class FileLockTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = lock_path_for(os.path.join(self.tmp.name, "quotes.csv"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def hold_in_other_process(self):
+        holder = subprocess.Popen(
+            [sys.executable, "-c", HOLDER, SHARED_DIR, self.path],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        self.addCleanup(holder.wait)
+        self.addCleanup(holder.stdin.close)
+        self.assertEqual(holder.stdout.readline().strip(), "locked")
+        return holder
+
+    def test_lock_path(self):
+        self.assertEqual(lock_path_for("/data/ak.csv"), "/data/ak.csv.lock")
+
+    def test_acquire_and_release(self):
+        with FileLock(self.path, timeout=0):
+            self.assertTrue(os.path.exists(self.path))
+        self.assertNotIn(os.path.abspath(self.path), FileLock._held)
+
+    def test_reentrant_within_process(self):
+        with FileLock(self.path, timeout=0):
+            with FileLock(self.path, timeout=0):
+                self.assertEqual(FileLock._held[os.path.abspath(self.path)][1], 2)
+            self.assertEqual(FileLock._held[os.path.abspath(self.path)][1], 1)
+        self.assertNotIn(os.path.abspath(self.path), FileLock._held)
+
+    def test_timeout_while_held_elsewhere(self):
+        holder = self.hold_in_other_process()
+        started = time.monotonic()
+        with self.assertRaises(LockTimeout):
+            FileLock(self.path, timeout=0.2, poll_interval=0.02).acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 0.2)
+        self.assertNotIn(os.path.abspath(self.path), FileLock._held)
+
+        holder.stdin.close()
+        holder.wait()
+        with FileLock(self.path, timeout=2):
+            pass
+
+
+class AtomicWriteTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "quotes.csv")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_writes_text_and_leaves_no_temp_file(self):
+        atomic_write(self.path, "a,b\r\n1,2\r\n")
+        with open(self.path, "r", newline="", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "a,b\r\n1,2\r\n")
+        self.assertEqual(os.listdir(self.tmp.name), ["quotes.csv"])
+
+    @unittest.skipIf(os.name == "nt", "POSIX permission bits")
+    def test_keeps_existing_mode(self):
+        with open(self.path, "w") as f:
+            f.write("old")
+        os.chmod(self.path, 0o640)
+        atomic_write(self.path, "new")
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o640)
+
+    @unittest.skipIf(os.name == "nt", "POSIX permission bits")
+    def test_new_file_gets_umask_default(self):
+        umask = os.umask(0o022)
+        try:
+            self.assertEqual(replace_mode(self.path), 0o644)
+            atomic_write(self.path, "new")
+        finally:
+            os.umask(umask)
+        self.assertEqual(stat.S_IMODE(os.stat(self.path).st_mode), 0o644)
+
+    def test_failed_write_keeps_old_file(self):
+        with open(self.path, "w", encoding="utf-8") as f:
+            f.write("old")
+        with self.assertRaises(UnicodeEncodeError):
+            atomic_write(self.path, "café", encoding="ascii")
+        with open(self.path, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "old")
+        self.assertEqual(os.listdir(self.tmp.name), ["quotes.csv"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Tests for execution/pricing_service.py input checks and the
+execution/pricing_client.py fallback rules.
+
+Run from skills/quote-pipeline: python -m pytest -q tests
+"""
+
+import http.server
+import json
+import os
+import socket
+import sys
+import threading
+import unittest
+
+EXECUTION_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "execution"
+)
+if EXECUTION_DIR not in sys.path:
+    sys.path.append(EXECUTION_DIR)
+
+import pricing_client
+from pricing_service import PricingError, price
+
+DDS_MODEL = {"model": "1200E", "height": 79, "quantity": 2, "freight": 500}
+
+
+class PriceInputTest(unittest.TestCase):
+    def test_non_string_type(self):
+        with self.assertRaisesRegex(PricingError, "'type'"):
+            price("dds", dict(DDS_MODEL, type=5))
+
+    def test_non_string_options(self):
+        for option in (5, {"code": "cylinder-locks"}, None):
+            with self.assertRaisesRegex(PricingError, "option code string"):
+                price("dds", dict(DDS_MODEL, options=[option]))
+
+
+class FailingHandler(http.server.BaseHTTPRequestHandler):
+    """Answers every request with HTTP 500, like a service whose calculator crashed."""
+
+    def do_POST(self):
+        body = json.dumps({"error": "Internal error: boom"}).encode()
+        self.send_response(500)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ClientFallbackTest(unittest.TestCase):
+    def test_server_error_is_not_priced_locally(self):
+        server = http.server.HTTPServer(("127.0.0.1", 0), FailingHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            with self.assertRaisesRegex(pricing_client.ServiceError, "boom"):
+                pricing_client.price("ak", {"net_price": 12345}, port=server.server_port)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_no_service_prices_locally(self):
+        with socket.socket() as sock:  # A port nothing listens on
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        result, source = pricing_client.price("ak", {"net_price": 12345}, port=port)
+        self.assertEqual(source, "local")
+        self.assertEqual(result, price("ak", {"net_price": 12345}))
+
+
+if __name__ == "__main__":
+    unittest.main()
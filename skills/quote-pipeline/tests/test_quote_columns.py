@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Tests for shared/quote_columns.py (typed column cache for queries).
+
+Run from skills/quote-pipeline: python -m pytest -q tests
+"""
+
+import csv
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+
+SHARED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared")
+if SHARED_DIR not in sys.path:
+    sys.path.append(SHARED_DIR)
+
+from quote_columns import ColumnCache, cache_path_for
+
+HEADERS = ["Quote #", "State", "Net Price", "Good Thru", "Combo", "Notes"]
+TYPED_COLUMNS = {"Net Price": "money", "Good Thru": "date", "Combo": "bool"}
+TEXT_COLUMNS = ("State", "Quote #")
+
+ROWS = [
+    ["26-00001", "TX", "$12,345.00", "03/01/2026", "N", "first"],
+    ["26-00002", "Ga", "$4,000.50", "02/01/2026", "Y", "two\nlines"],
+    ["26-00003", "TX", "", "04/15/2026", "", "no price"],
+    ["26-00004", "AL", "nan", "not a date", "N", ""],
+]
+
+
+def write_csv(path, rows, mode="w"):
+    with open(path, mode, newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if mode == "w":
+            writer.writerow(HEADERS)
+        writer.writerows(rows)
+
+
+class ColumnCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "quotes.csv")
+        write_csv(self.csv_path, ROWS)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open_cache(self):
+        cache = ColumnCache(
+            self.csv_path, TYPED_COLUMNS, sorted_columns=("Good Thru",), text_columns=TEXT_COLUMNS
+        )
+        cache.refresh()
+        return cache
+
+    def numbers(self, cache, indices):
+        return [row["Quote #"] for row in cache.rows(indices)]
+
+    def test_build_and_typed_values(self):
+        cache = self.open_cache()
+        self.assertEqual(len(cache), 4)
+        self.assertEqual(cache.typed["Net Price"], [1234500, 400050, None, None])
+        self.assertEqual(cache.typed["Combo"], [False, True, None, False])
+        self.assertEqual(cache.text["State"], ["tx", "ga", "tx", "al"])
+        self.assertNotIn("Notes", cache.text)  # Other columns stay in the CSV only
+
+        row = cache.typed_row(0)
+        self.assertEqual(row["Net Price"], 1234500)
+        self.assertEqual(row["Good Thru"], date(2026, 3, 1))
+        self.assertEqual(row["Notes"], "first")
+
+    def test_rows_read_from_csv_offsets(self):
+        cache = self.open_cache()
+        self.assertEqual(cache.row(1)["Notes"], "two\nlines")
+        self.assertEqual(cache.row(1)["State"], "Ga")  # Display value, not the lower-cased one
+        self.assertEqual(self.numbers(cache, [3, 0, 1]), ["26-00004", "26-00001", "26-00002"])
+        typed = list(cache.iter_typed_rows())
+        self.assertEqual([r["Combo"] for r in typed], [False, True, None, False])
+
+    def test_query_filters_and_sort(self):
+        cache = self.open_cache()
+        self.assertEqual(cache.query(equals={"State": {"tx"}}), [0, 2])
+        self.assertEqual(cache.query(equals={"State": {"ga"}}), [1])  # Stored as "Ga"
+        self.assertEqual(cache.query(ranges={"Net Price": (300000, None)}), [0, 1])
+        self.assertEqual(cache.query(ranges={"Net Price": (None, 500000)}), [1])
+        # Rows with no value sort last in either direction
+        self.assertEqual(cache.query(sort="Net Price"), [1, 0, 2, 3])
+        self.assertEqual(cache.query(sort="Net Price", descending=True), [0, 1, 2, 3])
+        self.assertEqual(cache.query(sort="State", limit=2), [3, 1])
+        self.assertEqual(cache.query(equals={"Notes": {"first"}}), [])  # Not a cached column
+
+    def test_sorted_range_index(self):
+        cache = self.open_cache()
+        low = date(2026, 2, 1).toordinal()
+        high = date(2026, 3, 31).toordinal()
+        self.assertEqual(cache.range("Good Thru", low, high), [1, 0])
+        self.assertEqual(cache.range("Net Price", 0, 500000), [1])  # No sorted index: query
+
+    def test_append_parses_only_new_rows(self):
+        self.open_cache()
+        write_csv(self.csv_path, [["26-00005", "TX", "$100.00", "01/15/2026", "Y", "new"]], mode="a")
+
+        cache = ColumnCache(
+            self.csv_path, TYPED_COLUMNS, sorted_columns=("Good Thru",), text_columns=TEXT_COLUMNS
+        )
+        self.assertEqual(cache.refresh(), 1)
+        self.assertEqual(len(cache), 5)
+        self.assertEqual(cache.row(4)["Notes"], "new")
+        # The new date sorts before the stored ones, so the index is merged
+        keys, rows = cache.sorted["Good Thru"]
+        self.assertEqual(keys, sorted(keys))
+        self.assertEqual(rows[0], 4)
+        self.assertEqual(cache.refresh(), 0)
+
+    def test_rewrite_rebuilds(self):
+        self.open_cache()
+        write_csv(self.csv_path, list(reversed(ROWS[:2])))
+        cache = ColumnCache(
+            self.csv_path, TYPED_COLUMNS, sorted_columns=("Good Thru",), text_columns=TEXT_COLUMNS
+        )
+        self.assertEqual(cache.refresh(), 2)
+        self.assertEqual(self.numbers(cache, range(len(cache))), ["26-00002", "26-00001"])
+
+    def test_changed_columns_rebuild(self):
+        self.open_cache()
+        cache = ColumnCache(self.csv_path, {"Net Price": "money"}, text_columns=TEXT_COLUMNS)
+        self.assertEqual(cache.refresh(), 4)
+        self.assertEqual(list(cache.typed), ["Net Price"])
+        with open(cache_path_for(self.csv_path), "r", encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["typed_columns"], {"Net Price": "money"})
+
+    def test_missing_csv(self):
+        os.remove(self.csv_path)
+        cache = ColumnCache(self.csv_path, TYPED_COLUMNS)
+        self.assertEqual(cache.refresh(), 0)
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.query(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
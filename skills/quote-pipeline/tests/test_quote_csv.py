@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Tests for shared/quote_csv.py (vendor CSV storage: appends, duplicates,
+reads and queries through the key index and column cache).
+
+Run from skills/quote-pipeline: python -m pytest -q tests
+"""
+
+import codecs
+import csv
+import os
+import sys
+import tempfile
+import unittest
+from datetime import date
+
+SHARED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared")
+if SHARED_DIR not in sys.path:
+    sys.path.append(SHARED_DIR)
+
+from quote_csv import QuoteCsvHandler
+
+# A cut-down AK layout
+HEADERS = ["PDF_Filename", "Quote #", "State", "Net Price", "Quote Date", "Good Thru", "Combo"]
+FIELD_MAP = {
+    "PDF_Filename": "PDF_Filename",
+    "Quote_Number": "Quote #",
+    "State": "State",
+    "Net_Price": "Net Price",
+    "Quote_Date": "Quote Date",
+    "Good_Thru": "Good Thru",
+    "Combo": "Combo",
+}
+TYPED_COLUMNS = {"Net Price": "money", "Quote Date": "date", "Good Thru": "date", "Combo": "bool"}
+SORT_COLUMNS = {"date": "Quote Date", "price": "Net Price", "state": "State", "quote": "Quote #"}
+
+
+def record(number, quote_date="01/23/2026", state="TX", price="10498.00", combo="N"):
+    return {
+        "PDF_Filename": f"{number}.pdf",
+        "Quote_Number": number,
+        "State": state,
+        "Net_Price": price,
+        "Quote_Date": quote_date,
+        "Good_Thru": "02/22/2026",
+        "Combo": combo,
+    }
+
+
+class QuoteCsvHandlerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.tmp.name, "quotes.csv")
+        self.handler = QuoteCsvHandler(
+            HEADERS,
+            FIELD_MAP,
+            ("Quote #", "Quote Date"),
+            TYPED_COLUMNS,
+            SORT_COLUMNS,
+            "test_quotes",
+            self.csv_path,
+            os.path.join(self.tmp.name, "quotes.db"),
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read_csv(self):
+        with open(self.csv_path, "r", newline="", encoding="utf-8") as f:
+            return list(csv.DictReader(f))
+
+    def test_append_formats_money_and_rejects_duplicates(self):
+        ok, message = self.handler.append_record(self.csv_path, record("26-02170"))
+        self.assertTrue(ok)
+        self.assertEqual(message, "Record appended. Total records: 1")
+        self.assertEqual(self.read_csv()[0]["Net Price"], "$10,498.00")
+
+        ok, message = self.handler.append_record(self.csv_path, record("26-02170"))
+        self.assertFalse(ok)
+        self.assertIn("Duplicate record", message)
+        # Same quote number, new date: a different quote
+        ok, _ = self.handler.append_record(self.csv_path, record("26-02170", "02/01/2026"))
+        self.assertTrue(ok)
+        self.assertEqual(self.handler.count_records(self.csv_path), 2)
+
+    def test_append_records_batch(self):
+        self.handler.append_record(self.csv_path, record("26-00001"))
+        results, total = self.handler.append_records(
+            self.csv_path,
+            [
+                record("26-00001"),
+                record("26-00002"),
+                record("26-00002"),
+                {"PDF_Filename": "bad.pdf", "Error": "Cannot read PDF"},
+                record("26-00003"),
+            ],
+        )
+        self.assertEqual(
+            [r["status"] for r in results],
+            ["skipped", "accepted", "skipped", "error", "accepted"],
+        )
+        self.assertEqual(total, 3)
+        self.assertEqual([r["Quote #"] for r in self.read_csv()], ["26-00001", "26-00002", "26-00003"])
+
+    def test_read_last_n_after_outside_edit(self):
+        for i in range(1, 6):
+            self.handler.append_record(self.csv_path, record(f"26-0000{i}"))
+        records = self.handler.read_records(self.csv_path, last_n=2)
+        self.assertEqual([r["Quote #"] for r in records], ["26-00004", "26-00005"])
+
+        # Rewritten outside the handler (e.g. saved from Excel): the index is rebuilt
+        rows = self.read_csv()[:3]
+        with open(self.csv_path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=HEADERS)
+            writer.writeheader()
+            writer.writerows(rows)
+        self.assertEqual(self.handler.count_records(self.csv_path), 3)
+        records = self.handler.read_records(self.csv_path, last_n=2)
+        self.assertEqual([r["Quote #"] for r in records], ["26-00002", "26-00003"])
+
+    def test_query_and_typed_records(self):
+        self.handler.append_records(
+            self.csv_path,
+            [
+                record("26-00001", state="TX", price="5000"),
+                record("26-00002", state="AL", price="25000", combo="Y"),
+                record("26-00003", state="tx", price="15000"),
+            ],
+        )
+        records = self.handler.query_records(
+            self.csv_path, equals={"State": {"tx"}}, sort="Net Price", descending=True
+        )
+        self.assertEqual([r["Quote #"] for r in records], ["26-00003", "26-00001"])
+
+        records = self.handler.query_records(
+            self.csv_path, ranges={"Net Price": (1000000, None)}, typed=True
+        )
+        self.assertEqual([r["Net Price"] for r in records], [2500000, 1500000])
+        self.assertEqual(records[0]["Combo"], True)
+        self.assertEqual(records[0]["Quote Date"], date(2026, 1, 23))
+
+        typed = list(self.handler.iter_typed_records(self.csv_path, last_n=1))
+        self.assertEqual([r["Quote #"] for r in typed], ["26-00003"])
+
+    def test_compact_keeps_non_utf8_bytes(self):
+        handler = QuoteCsvHandler(
+            HEADERS, FIELD_MAP, ("Quote #", "Quote Date"), TYPED_COLUMNS, SORT_COLUMNS,
+            "test_quotes", self.csv_path, None, encoding="utf-8-sig", errors="replace",
+        )
+        header = ",".join(HEADERS).encode("ascii") + b"\r\n"
+        legacy = b"1.pdf,26-00001,Caf\xe9,$1.00,01/23/2026,02/22/2026,N\r\n"  # cp1252 e-acute
+        other = b"2.pdf,26-00002,TX,$2.00,01/23/2026,02/22/2026,N\r\n"
+        with open(self.csv_path, "wb") as f:
+            f.write(header + legacy + other + legacy)
+
+        self.assertEqual(handler.compact_csv(self.csv_path), (2, 1))
+        with open(self.csv_path, "rb") as f:
+            self.assertEqual(f.read(), header + legacy + other)  # No U+FFFD, no BOM added
+
+        # A BOM the file already had stays, once
+        with open(self.csv_path, "wb") as f:
+            f.write(codecs.BOM_UTF8 + header + other + other)
+        self.assertEqual(handler.compact_csv(self.csv_path), (1, 1))
+        with open(self.csv_path, "rb") as f:
+            self.assertEqual(f.read(), codecs.BOM_UTF8 + header + other)
+
+    def test_backfill_keeps_non_utf8_bytes(self):
+        handler = QuoteCsvHandler(
+            HEADERS, FIELD_MAP, ("Quote #", "Quote Date"), TYPED_COLUMNS, SORT_COLUMNS,
+            "test_quotes", self.csv_path, None, encoding="utf-8-sig", errors="replace",
+        )
+        header = ",".join(HEADERS).encode("ascii") + b"\r\n"
+        legacy = b"Caf\xe9.pdf,26-00001,TX,$1.00,01/23/2026,02/22/2026,N\r\n"
+        with open(self.csv_path, "wb") as f:
+            f.write(header + legacy + b"2.pdf,26-00002,,$2.00,01/23/2026,02/22/2026,N\r\n")
+
+        lookup = {"26-00002": "GA"}.get
+        self.assertEqual(handler.backfill(self.csv_path, "State", "Quote #", lookup), (1, 0))
+        with open(self.csv_path, "rb") as f:
+            self.assertEqual(
+                f.read(), header + legacy + b"2.pdf,26-00002,GA,$2.00,01/23/2026,02/22/2026,N\r\n"
+            )
+
+    def test_missing_csv(self):
+        self.assertEqual(self.handler.count_records(self.csv_path), 0)
+        self.assertEqual(self.handler.read_records(self.csv_path), [])
+        self.assertEqual(self.handler.query_records(self.csv_path), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Tests for shared/quote_values.py (display string -> machine value parsers).
+
+Run from skills/quote-pipeline: python -m pytest -q tests
+"""
+
+import os
+import sys
+import unittest
+from datetime import date
+
+SHARED_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "shared")
+if SHARED_DIR not in sys.path:
+    sys.path.append(SHARED_DIR)
+
+from quote_values import iso_date, parse_bool, parse_date, parse_money_cents
+
+
+class ParseMoneyCentsTest(unittest.TestCase):
+    def test_currency_strings(self):
+        self.assertEqual(parse_money_cents("$12,345.00"), 1234500)
+        self.assertEqual(parse_money_cents("12345"), 1234500)
+        self.assertEqual(parse_money_cents(" 99.99 "), 9999)
+        self.assertEqual(parse_money_cents("-$50"), -5000)
+        self.assertEqual(parse_money_cents(10498.5), 1049850)
+
+    def test_blank_and_unparseable(self):
+        for value in (None, "", "   ", "$", "N/A", "12.3.4"):
+            self.assertIsNone(parse_money_cents(value), value)
+
+    def test_non_finite(self):
+        for value in ("nan", "NaN", "inf", "-inf", "Infinity", "1e400", float("nan"), float("inf")):
+            self.assertIsNone(parse_money_cents(value), value)
+
+    def test_out_of_sqlite_range(self):
+        self.assertIsNone(parse_money_cents("1e17"))  # 1e19 cents > MAX_CENTS
+        self.assertEqual(parse_money_cents("$1,000,000,000,000.00"), 10**14)
+
+
+class ParseDateTest(unittest.TestCase):
+    def test_formats(self):
+        expected = date(2026, 1, 23)
+        for value in ("01/23/2026", "1/23/26", "01-23-2026", "1-23-26", "2026-01-23", " 01/23/2026 "):
+            self.assertEqual(parse_date(value), expected, value)
+
+    def test_unparseable(self):
+        for value in (None, "", "January 23, 2026", "13/45/2026", "soon"):
+            self.assertIsNone(parse_date(value), value)
+
+    def test_iso_date(self):
+        self.assertEqual(iso_date("1/2/26"), "2026-01-02")
+        self.assertIsNone(iso_date("not a date"))
+
+
+class ParseBoolTest(unittest.TestCase):
+    def test_flags(self):
+        for value in ("Y", "yes", "TRUE", "1", " y "):
+            self.assertIs(parse_bool(value), True, value)
+        for value in ("N", "No", "false", "0"):
+            self.assertIs(parse_bool(value), False, value)
+
+    def test_blank_and_unknown(self):
+        for value in (None, "", "maybe"):
+            self.assertIsNone(parse_bool(value), value)
+
+
+if __name__ == "__main__":
+    unittest.main()